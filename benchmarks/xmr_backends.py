@@ -0,0 +1,123 @@
+# Benchmark for the NumPy and numba backends of xmr_signals
+# Usage (from the repository root): python -m benchmarks.xmr_backends [num_streams] [stream_length]
+
+import sys
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+import process.improvement as pi
+
+def check_against_pbc(num_checks=20, stream_length=100, seed=0):
+    
+    """
+    Confirm that every available backend reproduces the `pbc` parameters and variation labels.
+    """
+    
+    rng = np.random.default_rng(seed)
+    backends = ['numpy'] if pi.numba is None else ['numpy', 'numba']
+    for _ in range(num_checks):
+        values = rng.normal(10, 1, stream_length)
+        values[rng.integers(0, stream_length, 3)] += rng.normal(0, 6, 3)
+        df = pd.DataFrame({'Values': values, 'Observation': range(stream_length)})
+        result = pi.pbc(df, 'Values', 'Observation', round_value=10)
+        plt.close('all')
+        expected = result['PBC Params']['Param Values'].to_numpy()[:6]
+        xmr_df = result['XmR-Chart Dataframe']
+        for backend in backends:
+            xmr = pi.xmr_signals(values, backend=backend)
+            params = np.round([xmr[param][0] for param in ['Mean','UPL','LPL','PLR','AmR','URL']], 10)
+            assert np.allclose(params, expected), backend
+            assert np.array_equal(xmr['X-Chart Signals'], xmr_df['X-Chart Variation'] == 'Assignable Cause'), backend
+            assert np.array_equal(xmr['mR-Chart Signals'], xmr_df['mR-Chart Variation'] == 'Assignable Cause'), backend
+    
+    return backends
+
+def check_missing_parity(num_checks=20, stream_length=200, seed=0):
+    
+    """
+    Confirm that the numba backend matches the NumPy backend for both missing data policies.
+    """
+    
+    if pi.numba is None:
+        return False
+    rng = np.random.default_rng(seed)
+    for _ in range(num_checks):
+        values = rng.normal(10, 1, 4 * stream_length)
+        # Missing runs of 1 to 4 values, including at the start and end of series
+        for start in rng.integers(0, len(values), 12):
+            values[start:start + rng.integers(1, 5)] = np.nan
+        values[[0, stream_length, -1]] = np.nan
+        offsets = np.arange(5, dtype=np.int64) * stream_length
+        for missing, max_gap in [('skip', 1), ('bridge', 1), ('bridge', 3)]:
+            expected = pi.xmr_signals(values, offsets, backend='numpy', missing=missing, max_gap=max_gap)
+            result = pi.xmr_signals(values, offsets, backend='numba', missing=missing, max_gap=max_gap)
+            for key, array in expected.items():
+                assert np.allclose(result[key], array, equal_nan=True), (missing, max_gap, key)
+    
+    return True
+
+def check_parallel_parity(num_series=64, stream_length=200, jobs=2, seed=0):
+    
+    """
+    Confirm that `parallel_xmr_signals` matches `xmr_signals` for both missing data policies.
+    """
+    
+    from process.parallel import parallel_xmr_signals
+    
+    rng = np.random.default_rng(seed)
+    values = rng.normal(10, 1, num_series * stream_length)
+    # Missing runs of 1 to 4 values, including at the start and end of series
+    for start in rng.integers(0, len(values), 50):
+        values[start:start + rng.integers(1, 5)] = np.nan
+    values[[0, stream_length, -1]] = np.nan
+    # Series of uneven length, so the batches are balanced by values
+    offsets = np.unique(np.concatenate(([0, len(values)], rng.integers(1, len(values), num_series - 1))))
+    for missing, max_gap in [('skip', 1), ('bridge', 1), ('bridge', 3)]:
+        expected = pi.xmr_signals(values, offsets, missing=missing, max_gap=max_gap)
+        result = parallel_xmr_signals(values, offsets, jobs=jobs, missing=missing, max_gap=max_gap, min_values=0)
+        for key, array in expected.items():
+            assert np.array_equal(result[key], array, equal_nan=True), (missing, max_gap, key)
+    
+    return True
+
+def time_backend(backend, values, offsets, repeats=5):
+    
+    """
+    Return the best wall-clock time of `repeats` calls to `xmr_signals`.
+    """
+    
+    # Warm up (compiles the numba kernel on first use)
+    pi.xmr_signals(values[:offsets[1]], backend=backend)
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        pi.xmr_signals(values, offsets, backend=backend)
+        times.append(time.perf_counter() - start)
+    
+    return min(times)
+
+if __name__ == '__main__':
+    num_streams = int(sys.argv[1]) if len(sys.argv) > 1 else 40000
+    stream_length = int(sys.argv[2]) if len(sys.argv) > 2 else 250
+    
+    backends = check_against_pbc()
+    print(f"Backends matching pbc: {', '.join(backends)}")
+    if check_missing_parity():
+        print("numba matches numpy for missing='skip' and missing='bridge'")
+    if check_parallel_parity():
+        print("parallel_xmr_signals matches xmr_signals for missing='skip' and missing='bridge'")
+    
+    rng = np.random.default_rng(1)
+    values = rng.normal(10, 1, num_streams * stream_length)
+    offsets = np.arange(num_streams + 1, dtype=np.int64) * stream_length
+    num_points = len(values)
+    
+    for backend in backends:
+        seconds = time_backend(backend, values, offsets)
+        print(f"{backend:>6}: {seconds:.3f} s for {num_streams} streams x {stream_length} values "
+              f"({num_points / seconds / 1e6:.1f} M values/s)")
@@ -0,0 +1,251 @@
+# Improvement Python Library/cli.py
+# Command-line entry point for batch process behavior chart jobs
+
+import argparse
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from process import improvement
+from process.parallel import parallel_xmr_signals
+
+def _read_chunks(path, columns, chunksize):
+
+    """
+    Yield DataFrame chunks of the given columns from a CSV or Parquet file without loading it whole.
+    """
+
+    if path.lower().endswith(('.parquet', '.pq')):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Reading Parquet files requires pyarrow (pip install pyarrow).")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        for chunk in pd.read_csv(path, usecols=columns, chunksize=chunksize):
+            yield chunk
+
+def _collect_streams(paths, value, by, label, chunksize):
+
+    """
+    Read the input files chunk by chunk and group the values (and labels) into one stream per group.
+
+    Each chunk keeps only its values, labels and group codes; the streams are then formed with a
+    single stable sort over all rows, so the values are copied once instead of per chunk and group.
+
+    Returns:
+    --------
+    tuple
+        The list of groups, the values and labels sorted by group (labels is None without `label`),
+        the offsets of each group's stream, the number of rows read and the number of rows without a
+        `by` key (which are left out of the streams).
+    """
+
+    columns = [column for column in [value, by, label] if column is not None]
+    group_index = {}
+    values = []
+    labels = []
+    codes = []
+    num_rows = 0
+    for path in paths:
+        for chunk in _read_chunks(path, list(dict.fromkeys(columns)), chunksize):
+            num_rows += len(chunk)
+            values.append(chunk[value].to_numpy(dtype=float))
+            if label is not None:
+                labels.append(chunk[label].to_numpy())
+            if by is None:
+                continue
+            # Map the chunk's group codes to codes shared by all chunks (the appended -1 keeps missing keys at -1)
+            chunk_codes, groups = pd.factorize(chunk[by])
+            mapping = np.array([group_index.setdefault(group, len(group_index)) for group in groups] + [-1], dtype=np.int64)
+            codes.append(mapping[chunk_codes])
+
+    values = np.concatenate(values) if values else np.empty(0)
+    labels = np.concatenate(labels) if labels else None
+    if by is None:
+        groups = ['All'] if len(values) else []
+        offsets = np.array([0, len(values)] if groups else [0], dtype=np.int64)
+        return groups, values, labels, offsets, num_rows, 0
+
+    # Group the rows with a single stable sort, leaving out the rows without a key
+    codes = np.concatenate(codes) if codes else np.empty(0, dtype=np.int64)
+    keyed = np.flatnonzero(codes >= 0)
+    order = keyed[np.argsort(codes[keyed], kind='stable')]
+    values = values[order]
+    labels = labels[order] if labels is not None else None
+    offsets = np.searchsorted(codes[order], np.arange(len(group_index) + 1))
+
+    return list(group_index), values, labels, offsets, num_rows, len(codes) - len(keyed)
+
+def _chart_filenames(groups):
+
+    """
+    Return a unique file name per group, replacing characters that are not safe in file names and
+    adding a numeric suffix when two groups map to the same name (e.g. 'a b' and 'a/b').
+    """
+
+    filenames = []
+    used = set()
+    for group in groups:
+        stem = re.sub(r'[^A-Za-z0-9._-]+', '_', str(group))
+        filename = stem + '.png'
+        suffix = 1
+        # Compare case-insensitively, as on the default macOS and Windows file systems
+        while filename.lower() in used:
+            suffix += 1
+            filename = f'{stem}_{suffix}.png'
+        used.add(filename.lower())
+        filenames.append(filename)
+
+    return filenames
+
+def _pbc_params(groups, values, offsets, jobs):
+
+    """
+    Calculate the PBC parameters of all streams in a single vectorized pass.
+
+    With more than one job the calculation runs in `parallel_xmr_signals`, which shares the values
+    with the workers through shared memory instead of pickling them.
+    """
+
+    xmr = parallel_xmr_signals(values, offsets, jobs=jobs)
+    x_signals = improvement._segment_reduce(np.add, xmr['X-Chart Signals'], offsets)
+    mr_signals = improvement._segment_reduce(np.add, xmr['mR-Chart Signals'], offsets)
+
+    results_df = pd.DataFrame({
+        'Labels': groups,
+        'Mean': xmr['Mean'],
+        'UPL': xmr['UPL'],
+        'LPL': xmr['LPL'],
+        'PLR': xmr['PLR'],
+        'AmR': xmr['AmR'],
+        'URL': xmr['URL'],
+        '# of Values': np.diff(offsets),
+        'X-Chart Signals': x_signals.astype(np.int64),
+        'mR-Chart Signals': mr_signals.astype(np.int64)
+    })
+    results_df['Characterization'] = np.where(results_df['X-Chart Signals'] == 0, 'Predictable', 'Unpredictable')
+
+    return results_df
+
+def _render_batch(batch, chart_dir, round_value, dpi):
+
+    """
+    Save the charts of a batch of streams. Runs in a worker process.
+    """
+
+    for group, data, labels, filename in batch:
+        df = pd.DataFrame({'Values': data, 'Labels': labels if labels is not None else np.arange(len(data))})
+        tickinterval = max(len(df) // 10, 1)
+        improvement.pbc(df, 'Values', 'Labels', xchart_title=str(group), round_value=round_value,
+                        tickinterval=tickinterval, dpi=dpi)
+        plt.gcf().savefig(os.path.join(chart_dir, filename), bbox_inches='tight')
+        plt.close('all')
+
+    return len(batch)
+
+def _run_pbc(args):
+
+    """
+    Run the `pbc` subcommand and return the throughput report.
+    """
+
+    start_time = time.perf_counter()
+    os.makedirs(args.out, exist_ok=True)
+    chart_dir = os.path.join(args.out, 'charts') if args.charts else None
+    if chart_dir is not None:
+        os.makedirs(chart_dir, exist_ok=True)
+
+    # Read the input files into one stream per group
+    groups, values, labels, offsets, num_rows, num_missing = _collect_streams(args.files, args.value, args.by,
+                                                                              args.label, args.chunksize)
+    read_time = time.perf_counter() - start_time
+
+    # Calculate the params of all streams across the worker pool
+    results_df = _pbc_params(groups, values, offsets, args.jobs) if groups else pd.DataFrame()
+
+    # Split the streams into batches and fan the chart rendering out across the worker pool
+    if chart_dir is not None and groups:
+        # Each stream is a view of the sorted values
+        streams = [(group, values[offsets[idx]:offsets[idx + 1]],
+                    labels[offsets[idx]:offsets[idx + 1]] if labels is not None else None, filename)
+                   for idx, (group, filename) in enumerate(zip(groups, _chart_filenames(groups)))]
+        num_batches = max(min(len(streams), args.jobs * 4), 1)
+        batches = [batch for batch in np.array_split(np.arange(len(streams)), num_batches) if len(batch)]
+        batches = [[streams[idx] for idx in batch] for batch in batches]
+        if args.jobs > 1 and len(batches) > 1:
+            with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+                list(executor.map(_render_batch, batches, [chart_dir] * len(batches),
+                                  [args.round] * len(batches), [args.dpi] * len(batches)))
+        else:
+            for batch in batches:
+                _render_batch(batch, chart_dir, args.round, args.dpi)
+
+    # Write the params table
+    if args.by is not None and len(results_df):
+        results_df = results_df.rename(columns={'Labels': args.by})
+    params_path = os.path.join(args.out, 'pbc_params.csv')
+    results_df.round(args.round).to_csv(params_path, index=False)
+
+    # Report throughput
+    elapsed = time.perf_counter() - start_time
+    report = {
+        'Files': len(args.files),
+        'Rows': num_rows,
+        'Rows Without Group': num_missing,
+        'Streams': len(groups),
+        'Charts': len(groups) if chart_dir is not None else 0,
+        'Read Seconds': round(read_time, 3),
+        'Total Seconds': round(elapsed, 3),
+        'Rows per Second': round(num_rows / elapsed, 1) if elapsed > 0 else float('inf'),
+        'Params Table': params_path
+    }
+
+    return report
+
+def main(argv=None):
+
+    """
+    Entry point of the `improvement` command.
+
+    Example:
+    --------
+    improvement pbc data.parquet --value Diameter --by machine_id --out results/ --jobs 8 --charts
+    """
+
+    parser = argparse.ArgumentParser(prog='improvement', description='Batch process behavior chart jobs.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    pbc_parser = subparsers.add_parser('pbc', help='Calculate XmR limits (and optionally charts) per group.')
+    pbc_parser.add_argument('files', nargs='+', help='Input CSV or Parquet files, read in order.')
+    pbc_parser.add_argument('--value', required=True, help='Column with the individual values.')
+    pbc_parser.add_argument('--by', default=None, help='Column identifying the stream of each row.')
+    pbc_parser.add_argument('--label', default=None, help='Column with the x-axis labels of the charts.')
+    pbc_parser.add_argument('--out', default='.', help='Output directory (default: current directory).')
+    pbc_parser.add_argument('--jobs', type=int, default=1, help='Number of worker processes (default: 1).')
+    pbc_parser.add_argument('--charts', action='store_true', help='Save a PNG chart per stream in OUT/charts.')
+    pbc_parser.add_argument('--round', type=int, default=4, help='Decimal places in the params table (default: 4).')
+    pbc_parser.add_argument('--dpi', type=int, default=100, help='Resolution of the chart images (default: 100).')
+    pbc_parser.add_argument('--chunksize', type=int, default=1_000_000, help='Rows read per chunk (default: 1000000).')
+
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+
+    report = _run_pbc(args)
+    for key, value in report.items():
+        print(f'{key}: {value}')
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,14 +5,580 @@
 
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
+import matplotlib.collections as mcollections
+import matplotlib.lines as mlines
 import seaborn as sns
 import numpy as np
 import pandas as pd
+import heapq
+import json
+import math
+import time
+from time import perf_counter as _perf_counter
 import warnings
 
+from process import metrics as _metrics
+
+# Optional compiled backend for the XmR kernel
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Helper functions for reading columns from pandas, Arrow, Polars and NumPy inputs
+def _table_format(data):
+
+    """
+    Return the format of a table: 'pandas', 'arrow', 'polars' or 'numpy' (a dict of arrays or a structured array).
+    """
+
+    if isinstance(data, pd.DataFrame):
+        return 'pandas'
+    module = type(data).__module__.split('.')[0]
+    if module in ('pyarrow', 'polars'):
+        return 'arrow' if module == 'pyarrow' else 'polars'
+
+    return 'numpy'
+
+def _is_table(data):
+
+    """
+    Return True if `data` is a table with named columns rather than a plain array.
+    """
+
+    if isinstance(data, np.ndarray):
+        return data.dtype.names is not None
+
+    return isinstance(data, dict) or _table_format(data) != 'numpy'
+
+def _column_names(data):
+
+    """
+    Return the column names of a table in any supported format.
+    """
+
+    table_format = _table_format(data)
+    if table_format == 'pandas':
+        return list(data.columns)
+    if table_format == 'arrow':
+        return list(data.column_names)
+    if table_format == 'polars':
+        return list(data.columns)
+    if isinstance(data, np.ndarray):
+        return list(data.dtype.names)
+
+    return list(data)
+
+def _column(data, column, dtype=float):
+
+    """
+    Read a column of a table as a NumPy array.
+
+    Arrow columns with a single chunk and Polars columns without nulls are read from their
+    buffers without copying when their dtype already matches `dtype`. Nulls become NaN.
+    Pass `dtype=None` to keep the native dtype (e.g. for labels).
+    """
+
+    table_format = _table_format(data)
+    if table_format == 'pandas':
+        array = data[column].to_numpy()
+    elif table_format == 'arrow':
+        chunked = data.column(column)
+        array = chunked.chunk(0).to_numpy(zero_copy_only=False) if chunked.num_chunks == 1 else chunked.to_numpy()
+    elif table_format == 'polars':
+        array = data.get_column(column).to_numpy()
+    else:
+        array = np.asarray(data[column])
+    if dtype is not None:
+        array = array.astype(dtype, copy=False)
+
+    return array
+
+def _series(data, column):
+
+    """
+    Return a column of a table as a pandas Series (the column itself for pandas input).
+    """
+
+    if _table_format(data) == 'pandas':
+        return data[column]
+
+    return pd.Series(_column(data, column, dtype=None), name=column, copy=False)
+
+def _with_columns(data, columns):
+
+    """
+    Return a copy of a table with the given columns (a dict of arrays) added, in the table's own format.
+    """
+
+    table_format = _table_format(data)
+    if table_format == 'pandas':
+        data = data.copy()
+        for name, values in columns.items():
+            data[name] = np.asarray(values)
+        return data
+    if table_format == 'arrow':
+        import pyarrow as pa
+        for name, values in columns.items():
+            if name in data.column_names:
+                data = data.set_column(data.column_names.index(name), name, pa.array(np.asarray(values)))
+            else:
+                data = data.append_column(name, pa.array(np.asarray(values)))
+        return data
+    if table_format == 'polars':
+        import polars as pl
+        return data.with_columns([pl.Series(name, np.asarray(values)) for name, values in columns.items()])
+    table = {name: np.asarray(data[name]) for name in _column_names(data)}
+    table.update({name: np.asarray(values) for name, values in columns.items()})
+
+    return table
+
+def _to_format(df, table_format):
+
+    """
+    Convert a pandas DataFrame of results to the given table format.
+    """
+
+    if table_format == 'pandas':
+        return df
+    columns = {str(name): df[name].to_numpy() for name in df.columns}
+    if table_format == 'arrow':
+        import pyarrow as pa
+        return pa.table(columns)
+    if table_format == 'polars':
+        import polars as pl
+        return pl.DataFrame(columns)
+
+    return columns
+
+# Helper functions for chart payloads (data for client-side rendering without matplotlib)
+def _payload_format(payload):
+
+    """
+    Validate the `payload` option of a chart function and return the payload format, or None when it is 'Off'.
+    """
+
+    payload_format = str(payload).lower()
+    if payload_format not in ('off', 'dict', 'json', 'msgpack'):
+        raise ValueError("Payload must be 'Off', 'Dict', 'JSON' or 'msgpack'.")
+
+    return None if payload_format == 'off' else payload_format
+
+def _payload_list(values):
+
+    """
+    Convert an array to a list of Python floats with missing values as None.
+    """
+
+    values = np.asarray(values, dtype=float)
+    result = values.astype(object)
+    result[np.isnan(values)] = None
+
+    return result.tolist()
+
+def _payload_value(value):
+
+    """
+    Convert a number, array or list of labels to JSON-compatible Python values.
+    """
+
+    array = np.asarray(value)
+    if array.dtype.kind in 'biuf':
+        return _payload_list(array.ravel())[0] if array.ndim == 0 else _payload_list(array)
+    if array.ndim == 0:
+        return str(value)
+
+    return [str(item) for item in array.tolist()]
+
+def _decimate(values, max_points=2000):
+
+    """
+    Return the positions of the points to keep when drawing a long series.
+
+    The series is split into max_points / 2 buckets and the minimum and maximum of each bucket are
+    kept (with the first and last point), so peaks and dips remain visible after decimation.
+    """
+
+    values = np.asarray(values, dtype=float)
+    num_values = len(values)
+    if num_values <= max_points:
+        return np.arange(num_values)
+
+    # Arrange the values as a matrix with one row per bucket, padding the last bucket
+    bucket_size = -(-num_values // (max_points // 2))
+    num_buckets = -(-num_values // bucket_size)
+    padding = num_buckets * bucket_size - num_values
+    lows = np.concatenate((np.where(np.isnan(values), np.inf, values), np.full(padding, np.inf))).reshape(num_buckets, bucket_size)
+    highs = np.concatenate((np.where(np.isnan(values), -np.inf, values), np.full(padding, -np.inf))).reshape(num_buckets, bucket_size)
+    starts = np.arange(num_buckets) * bucket_size
+    minimums = starts + np.argmin(lows, axis=1)
+    maximums = starts + np.argmax(highs, axis=1)
+
+    return np.unique(np.concatenate(([0, num_values - 1], minimums, maximums)))
+
+def _payload_series(name, values, positions=None, color='tab:blue'):
+
+    """
+    Return a decimated series of a chart payload.
+    """
+
+    values = np.asarray(values, dtype=float)
+    positions = np.arange(len(values)) if positions is None else np.asarray(positions)
+    keep = _decimate(values)
+
+    return {'name': name, 'type': 'line', 'color': color, 'points': len(values),
+            'x': positions[keep].tolist(), 'y': _payload_list(values[keep])}
+
+def _payload_bars(name, categories, values, color='tab:blue'):
+
+    """
+    Return a bar series of a chart payload (bars are never decimated).
+    """
+
+    return {'name': name, 'type': 'bar', 'color': color, 'points': len(values),
+            'x': [str(category) for category in categories], 'y': _payload_list(values)}
+
+def _payload_panel(title, series, signals=None, lines=(), y_label='', values=None):
+
+    """
+    Return a panel of a chart payload.
+
+    `signals` is a boolean mask over `values` (the first series by default); the position and value of every
+    signal are included without decimation. `lines` are (name, value, color) tuples where the value is a
+    number for a horizontal line or a list of [start, end, value] segments for a stepped line.
+    """
+
+    panel = {'title': title, 'y_label': y_label, 'series': series, 'lines': [], 'signals': {'x': [], 'y': []}}
+    for name, value, color in lines:
+        if np.ndim(value) == 0:
+            panel['lines'].append({'name': name, 'color': color, 'value': _payload_list([value])[0]})
+        else:
+            panel['lines'].append({'name': name, 'color': color, 'segments': np.asarray(value, dtype=float).tolist()})
+    if signals is not None:
+        signal_positions = np.flatnonzero(np.asarray(signals, dtype=bool))
+        panel['signals'] = {'x': signal_positions.tolist(), 'y': _payload_list(np.asarray(values, dtype=float)[signal_positions])}
+
+    return panel
+
+def _payload_ticks(labels, tick_positions):
+
+    """
+    Return the tick positions and tick labels of a chart payload.
+    """
+
+    tick_positions = np.asarray(tick_positions, dtype=np.int64)
+
+    return {'positions': tick_positions.tolist(), 'labels': [str(label) for label in pd.Series(labels).iloc[tick_positions]]}
+
+def _chart_payload(chart, title, panels, params, ticks=None, payload_format='json'):
+
+    """
+    Assemble a chart payload and encode it as a dict, a JSON string or msgpack bytes.
+    """
+
+    params = {str(name): _payload_value(value) for name, value in params.items()}
+    payload = {'chart': chart, 'title': title, 'panels': panels, 'ticks': ticks, 'params': params}
+    if payload_format == 'dict':
+        return payload
+    if payload_format == 'json':
+        return json.dumps(payload, separators=(',', ':'))
+    try:
+        import msgpack
+    except ImportError:
+        raise ImportError("The msgpack payload requires msgpack (pip install msgpack).")
+
+    return msgpack.packb(payload)
+
+# Helper functions for exporting charts to vector formats
+def _artist_points(artist):
+
+    # Return the number of drawn points of a line or collection (masked points are not drawn)
+    if isinstance(artist, mlines.Line2D):
+        ydata = artist.get_ydata()
+        return int(np.ma.count(ydata)) if np.ma.isMaskedArray(ydata) else len(ydata)
+    if isinstance(artist, mcollections.PathCollection):
+        return len(artist.get_offsets())
+    if isinstance(artist, mcollections.LineCollection):
+        return sum(len(segment) for segment in artist.get_segments())
+
+    return 0
+
+def _export_thresholds(num_points):
+
+    """
+    Return the path simplification threshold and the marker spacing for a series with `num_points` points.
+
+    Up to 10,000 points the matplotlib default simplification is kept and every marker is drawn. Beyond
+    that, vertices closer than a larger fraction of a pixel are merged, and markers are thinned to at
+    most about 10,000 per series (markers beyond this overlap at any print resolution).
+    """
+
+    if num_points <= 10_000:
+        return 1/9, 1
+    simplify_threshold = 0.5 if num_points <= 100_000 else 1.0
+
+    return simplify_threshold, int(math.ceil(num_points / 10_000))
+
+def _record_render(function, render_start, fig=None):
+
+    """
+    Draw the figure and record the time since `render_start` in the render latency histogram.
+
+    Called before `plt.show()`, which blocks until the window is closed on interactive backends.
+    The figure is only drawn (rasterized) while metrics are enabled.
+    """
+
+    if not _metrics.enabled:
+        return
+    if fig is None:
+        fig = plt.gcf()
+    fig.canvas.draw()
+    _metrics.observe('improvement_render_seconds', time.perf_counter() - render_start, function=function)
+
+# Export chart function
+def export_chart(path, fig=None, dpi=300, rasterize='Auto', min_points=1000, **savefig_kwargs):
+
+    """
+    Save a chart to a file, rasterizing the dense data layers of vector exports.
+
+    In PDF, SVG and EPS files every marker of a line is a separate vector object, so charts of
+    hundreds of thousands of values produce files of tens of megabytes that are slow to open.
+    Data artists (lines, markers and scatter collections) with at least `min_points` points are
+    rasterized at `dpi`, while limit lines, labels, ticks and text stay vector. The path
+    simplification threshold (from the densest line) and the marker spacing of each dense data line
+    are picked from the point count. Signal overlays (masked or marker-only lines) are never thinned,
+    so every assignable cause marker is kept.
+
+    Parameters:
+    -----------
+    path : str or file-like
+        Output file. The format is taken from the extension (e.g. '.pdf', '.svg', '.png').
+    fig : matplotlib.figure.Figure, optional
+        Figure to save. Default is None (the current figure).
+    dpi : int, optional
+        Resolution of the rasterized layers (and of raster formats), default is 300.
+    rasterize : str, optional
+        'Auto' rasterizes artists with at least `min_points` points, 'On' rasterizes every data
+        artist, and 'Off' keeps everything vector (simplification still applies). Default is 'Auto'.
+    min_points : int, optional
+        Point count from which an artist is considered dense, default is 1000.
+    **savefig_kwargs
+        Passed to `Figure.savefig` (e.g. `bbox_inches='tight'`).
+
+    Returns:
+    --------
+    dict
+        'Rasterized Artists' and 'Vector Artists' (number of data artists of each kind), 'Points'
+        (total number of data points) and 'Simplify Threshold' (the threshold of the densest line).
+
+    Notes:
+    ------
+    - The artists of the figure are modified (rasterized, thinned markers on data lines), so export a
+      figure after it has been displayed.
+
+    Example:
+    --------
+    >>> pbc(df, 'Values', 'Observation')
+    >>> export_chart('pbc.pdf')
+    """
+
+    if fig is None:
+        fig = plt.gcf()
+    if rasterize.lower() not in ('auto', 'on', 'off'):
+        raise ValueError("rasterize must be 'Auto', 'On' or 'Off'.")
+
+    # Find the data artists and their point counts
+    artists = [artist for ax in fig.axes for artist in ax.lines + ax.collections]
+    points = [_artist_points(artist) for artist in artists]
+    data_artists = [(artist, num_points) for artist, num_points in zip(artists, points)
+                    if num_points > 2]
+    simplify_threshold, _ = _export_thresholds(max([num_points for _, num_points in data_artists], default=0))
+
+    # Rasterize dense artists and thin the markers of dense data lines, but never of signal overlays
+    num_rasterized = 0
+    for artist, num_points in data_artists:
+        dense = num_points >= min_points
+        if rasterize.lower() == 'on' or (rasterize.lower() == 'auto' and dense):
+            artist.set_rasterized(True)
+            num_rasterized += 1
+        if (isinstance(artist, mlines.Line2D) and artist.get_marker() not in (None, 'None', '', ' ')
+                and artist.get_linestyle() not in ('None', '', ' ') and not np.ma.is_masked(artist.get_ydata())):
+            _, markevery = _export_thresholds(num_points)
+            if markevery > 1 and artist.get_markevery() is None:
+                artist.set_markevery(markevery)
+
+    # Save with the simplification threshold of the densest line, drawing rasterized paths in chunks
+    with plt.rc_context({'path.simplify': True, 'path.simplify_threshold': simplify_threshold,
+                         'agg.path.chunksize': 10_000 if num_rasterized else 0}):
+        fig.savefig(path, dpi=dpi, **savefig_kwargs)
+
+    return {'Rasterized Artists': num_rasterized,
+            'Vector Artists': len(data_artists) - num_rasterized,
+            'Points': int(sum(num_points for _, num_points in data_artists)),
+            'Simplify Threshold': simplify_threshold}
+
+# Helper functions for vectorized XmR calculations over many series
+def _concatenate_segments(arrays):
+
+    """
+    Concatenate a list of 1D arrays into a single float array with segment offsets.
+
+    Returns:
+    --------
+    tuple of numpy.ndarray
+        The concatenated values and the offsets of each segment (length len(arrays) + 1).
+    """
+
+    arrays = [np.asarray(array, dtype=float).ravel() for array in arrays]
+    lengths = np.array([len(array) for array in arrays], dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    values = np.concatenate(arrays) if arrays else np.empty(0)
+
+    return values, offsets
+
+def _segment_reduce(ufunc, array, offsets, empty_value=0.0):
+
+    """
+    Apply `ufunc.reduceat` to consecutive segments of `array`, filling empty segments with `empty_value`.
+    """
+
+    lengths = np.diff(offsets)
+    result = np.full(len(lengths), empty_value, dtype=float)
+    non_empty = lengths > 0
+    if non_empty.any():
+        result[non_empty] = ufunc.reduceat(array, offsets[:-1][non_empty])
+
+    return result
+
+def _xmr_segment_stats(values, offsets, max_gap=0):
+
+    """
+    Calculate XmR statistics for every segment of a concatenated value array in a single pass.
+
+    Missing values (NaN) are skipped in the same way as pandas' `mean()`. Moving ranges are
+    never calculated across the boundary between two segments. A moving range that spans a gap
+    of up to `max_gap` missing values is bridged between the last value before and the first value
+    after the gap; longer gaps (and every gap when `max_gap` is 0) leave the moving range missing.
+
+    Parameters:
+    -----------
+    values : numpy.ndarray
+        Concatenated individual values of all segments.
+    offsets : numpy.ndarray
+        Start position of each segment in `values` followed by the total length.
+    max_gap : int, optional
+        Longest run of missing values bridged by a moving range, default is 0 (no bridging).
+
+    Returns:
+    --------
+    dict
+        Dictionary of per-segment arrays: 'Count', 'Missing', 'Sum', 'Mean', 'Min', 'Max', 'mR Count',
+        'mR Sum', 'AmR', 'mR Bridged', plus 'Moving Ranges' holding the moving range of every value (NaN
+        at segment starts).
+    """
+
+    values = np.asarray(values, dtype=float)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    lengths = np.diff(offsets)
+
+    # Calculate the moving ranges without crossing segment boundaries
+    moving_ranges = np.empty_like(values)
+    if len(values):
+        moving_ranges[0] = np.nan
+        np.abs(np.diff(values), out=moving_ranges[1:])
+        moving_ranges[offsets[:-1][lengths > 0]] = np.nan
+
+    # Bridge gaps of up to max_gap missing values from the last valid value of the segment
+    missing = np.isnan(values)
+    bridged = np.zeros(len(values), dtype=bool)
+    if max_gap > 0 and missing.any():
+        positions = np.arange(len(values))
+        last_valid = np.maximum.accumulate(np.where(missing, -1, positions))
+        previous = np.empty_like(last_valid)
+        previous[:1] = -1
+        previous[1:] = last_valid[:-1]
+        segment_starts = np.repeat(offsets[:-1], lengths)
+        gap = positions - previous - 1
+        bridged = ~missing & (previous >= segment_starts) & (gap >= 1) & (gap <= max_gap)
+        moving_ranges[bridged] = np.abs(values[bridged] - values[previous[bridged]])
+
+    # Count valid values and moving ranges
+    mr_missing = np.isnan(moving_ranges)
+    count = _segment_reduce(np.add, ~missing, offsets)
+    mr_count = _segment_reduce(np.add, ~mr_missing, offsets)
+
+    # Calculate the mean and average moving range
+    total = _segment_reduce(np.add, np.where(missing, 0.0, values), offsets)
+    mr_total = _segment_reduce(np.add, np.where(mr_missing, 0.0, moving_ranges), offsets)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = total / count
+        AmR = mr_total / mr_count
+
+    stats = {'Count': count.astype(np.int64),
+             'Missing': lengths - count.astype(np.int64),
+             'Sum': total,
+             'Mean': mean,
+             'Min': _segment_reduce(np.fmin, values, offsets, empty_value=np.nan),
+             'Max': _segment_reduce(np.fmax, values, offsets, empty_value=np.nan),
+             'mR Count': mr_count.astype(np.int64),
+             'mR Sum': mr_total,
+             'AmR': AmR,
+             'mR Bridged': _segment_reduce(np.add, bridged, offsets).astype(np.int64),
+             'Moving Ranges': moving_ranges
+            }
+
+    return stats
+
+def _max_gap(missing, max_gap):
+
+    """
+    Validate a missing data policy and return the longest gap to bridge (0 for 'skip').
+    """
+
+    if missing not in ('skip', 'bridge'):
+        raise ValueError("Missing must be 'skip' or 'bridge'.")
+
+    return int(max_gap) if missing == 'bridge' else 0
+
+# Helper functions for drawing pre-aggregated bar charts
+def _top_n_bars(df, y_axis_data, top_n):
+
+    """
+    Keep the `top_n` rows of `df` with the largest absolute values in `y_axis_data`, preserving their order.
+    """
+
+    if top_n is None or top_n >= len(df):
+        return df
+    keep = np.sort(np.argsort(-np.abs(df[y_axis_data].to_numpy(dtype=float)), kind='stable')[:top_n])
+
+    return df.iloc[keep]
+
+def _draw_preaggregated_bars(ax, df, x_axis_data, y_axis_data, color, show_labels, label_suffix, round_value):
+
+    """
+    Draw one bar per row of `df` with a single `ax.bar` call and label all bars in a single batch.
+    """
+
+    heights = df[y_axis_data].to_numpy(dtype=float)
+    positions = np.arange(len(heights))
+    bars = ax.bar(positions, heights, width=0.8, color=color)
+    ax.set_xticks(positions)
+    ax.set_xticklabels(df[x_axis_data].astype(str))
+    ax.set_xlim(-0.5, len(heights) - 0.5)
+    ax.set_xlabel(x_axis_data)
+    ax.set_ylabel(y_axis_data)
+
+    # Add bar labels in one call
+    if show_labels:
+        labels = [f'{height:.{round_value}f}{label_suffix}' for height in heights]
+        ax.bar_label(bars, labels=labels, fontsize=12, color='black',
+                     bbox=dict(facecolor='white', alpha=1, edgecolor='black', boxstyle='round'))
+
+    return bars
+
 def bar_chart(df, x_axis_data, y_axis_data, figsize=(15,5), title='', y_label='Value', x_label='', 
               color='tab:blue', x_tick_rotation=0, show_labels='On', show_percents='Off', 
-              round_value=2, dpi=100, target=0, show_target='Off'):
+              round_value=2, dpi=100, target=0, show_target='Off', preaggregated='Off', top_n=None, payload='Off'):
     
     """
     Generate a bar chart with optional bar labels, percentage labels, and target lines.
@@ -49,26 +615,54 @@ def bar_chart(df, x_axis_data, y_axis_data, figsize=(15,5), title='', y_label='V
         Target value for a horizontal line on the chart. Default is 0.
     show_target : str, optional
         If 'On', display a horizontal target line. Default is 'Off'.
+    preaggregated : str, optional
+        If 'On', draw one bar per row of `df` directly with matplotlib instead of aggregating
+        with seaborn. Much faster for charts with many bars (e.g. Pareto charts). Default is 'Off'.
+    top_n : int, optional
+        If specified, only the `top_n` bars with the largest absolute values are displayed. Default is None.
+    payload : str, optional
+        If 'JSON', 'msgpack' or 'Dict', skip matplotlib and return the data needed to draw the chart on
+        the client (bars, target line and labels) instead of displaying it. Default is 'Off'.
 
     Returns:
     --------
     None
-        This function does not return any value. It displays a bar chart.
+        This function does not return any value. It displays a bar chart. In payload mode the payload is returned.
 
     """
+    # Keep only the largest bars
+    df = _top_n_bars(df, y_axis_data, top_n)
+    
+    # Return the data to draw instead of the figure
+    payload_format = _payload_format(payload)
+    if payload_format is not None:
+        if preaggregated.lower() != 'on':
+            df = df.groupby(x_axis_data, sort=False)[y_axis_data].mean().reset_index()
+        lines = [('Target', target, 'black')] if (show_target == 'On') | (show_target == 'ON') else []
+        panel = _payload_panel(title, [_payload_bars(y_axis_data, df[x_axis_data], df[y_axis_data], color)],
+                               lines=lines, y_label=y_label)
+        return _chart_payload('bar_chart', title, [panel], {}, payload_format=payload_format)
+    
     # Generate the bar chart
+    render_start = time.perf_counter()
     fig,ax = plt.subplots(figsize=figsize, dpi=dpi)
-    bar = sns.barplot(data=df, x=x_axis_data, y=y_axis_data, color=color)
+    labels_on = (show_labels == 'On') | (show_labels == 'ON') | (show_labels == 'on')
+    percents_on = (show_percents == 'On') | (show_percents == 'ON') | (show_percents == 'on')
+    if preaggregated.lower() == 'on':
+        bar = _draw_preaggregated_bars(ax, df, x_axis_data, y_axis_data, color, labels_on,
+                                       '%' if percents_on else '', round_value)
+    else:
+        bar = sns.barplot(data=df, x=x_axis_data, y=y_axis_data, color=color)
 
     for spine in ['top','right']:
         ax.spines[spine].set_visible(False)
     
     # Show bar labels
-    if (show_labels == 'On') | (show_labels == 'ON') | (show_labels == 'on'):
+    if labels_on & (preaggregated.lower() != 'on'):
         for p in ax.patches:
             label = f'{p.get_height():.{round_value}f}'
             # Check condition and append '%' if needed
-            if (show_percents == 'On') | (show_percents == 'ON') | (show_percents == 'on'):  # Replace 'condition' with your actual condition
+            if percents_on:
                 label += '%'
 
             ax.annotate(label, (p.get_x() + p.get_width() / 2., p.get_height()),
@@ -94,11 +688,15 @@ def bar_chart(df, x_axis_data, y_axis_data, figsize=(15,5), title='', y_label='V
     plt.xlabel(x_label)
     plt.ylabel(y_label)
     
+    # Record the render time before the plot is shown (plt.show() blocks on interactive backends)
+    _record_render('bar_chart', render_start)
+
     plt.show()
 
 # Create mean to target function
 def delta_chart(df, x_axis_data, y_axis_data, figsize=(15,3), title='', y_label='Value', x_label='', color='tab:blue',
-              x_tick_rotation=0, round_value=2, show_percents='Off', dpi=300):
+              x_tick_rotation=0, round_value=2, show_percents='Off', dpi=300, preaggregated='Off', top_n=None,
+              payload='Off'):
     """
     Generate a delta bar chart with optional bar labels and percentage labels.
 
@@ -128,16 +726,42 @@ def delta_chart(df, x_axis_data, y_axis_data, figsize=(15,3), title='', y_label=
         If 'On', display percentage labels on bars. Default is 'Off'.
     dpi : int, optional
         Dots per inch for the figure. Default is 300.
+    preaggregated : str, optional
+        If 'On', draw one bar per row of `df` directly with matplotlib instead of aggregating
+        with seaborn. Much faster for charts with many bars. Default is 'Off'.
+    top_n : int, optional
+        If specified, only the `top_n` bars with the largest absolute deltas are displayed. Default is None.
+    payload : str, optional
+        If 'JSON', 'msgpack' or 'Dict', skip matplotlib and return the data needed to draw the chart on
+        the client (bars, zero line and labels) instead of displaying it. Default is 'Off'.
 
     Returns:
     --------
     None
-        This function does not return any value. It displays a delta bar chart.
+        This function does not return any value. It displays a delta bar chart. In payload mode the payload is returned.
 
     """
+    # Keep only the largest deltas
+    df = _top_n_bars(df, y_axis_data, top_n)
+    
+    # Return the data to draw instead of the figure
+    payload_format = _payload_format(payload)
+    if payload_format is not None:
+        if preaggregated.lower() != 'on':
+            df = df.groupby(x_axis_data, sort=False)[y_axis_data].mean().reset_index()
+        panel = _payload_panel(title, [_payload_bars(y_axis_data, df[x_axis_data], df[y_axis_data], color)],
+                               lines=[('Zero', 0, 'black')], y_label=y_label)
+        return _chart_payload('delta_chart', title, [panel], {}, payload_format=payload_format)
+    
     # Generate the bar chart
+    render_start = time.perf_counter()
     fig,ax = plt.subplots(figsize=figsize, dpi=dpi)
-    bar = sns.barplot(data=df, x=x_axis_data, y=y_axis_data, color=color)
+    percents_on = (show_percents == 'On') | (show_percents == 'ON')
+    if preaggregated.lower() == 'on':
+        bar = _draw_preaggregated_bars(ax, df, x_axis_data, y_axis_data, color, True,
+                                       '%' if percents_on else '', round_value)
+    else:
+        bar = sns.barplot(data=df, x=x_axis_data, y=y_axis_data, color=color)
 
     # Plot horizontal line at zero
     ax.axhline(0, color='black', alpha=0.75)
@@ -146,15 +770,16 @@ def delta_chart(df, x_axis_data, y_axis_data, figsize=(15,3), title='', y_label=
         ax.spines[spine].set_visible(False)
     
     # Add bar labels
-    for p in ax.patches:
-        label = f'{p.get_height():.{round_value}f}'
-        # Check condition and append '%' if needed
-        if (show_percents == 'On') | (show_percents == 'ON'):  # Replace 'condition' with your actual condition
-            label += '%'
+    if preaggregated.lower() != 'on':
+        for p in ax.patches:
+            label = f'{p.get_height():.{round_value}f}'
+            # Check condition and append '%' if needed
+            if percents_on:
+                label += '%'
 
-        ax.annotate(label, (p.get_x() + p.get_width() / 2., p.get_height()),
-                    ha='center', fontsize=12, color='black',
-                    bbox=dict(facecolor='white', alpha=1, edgecolor='black', boxstyle='round'))
+            ax.annotate(label, (p.get_x() + p.get_width() / 2., p.get_height()),
+                        ha='center', fontsize=12, color='black',
+                        bbox=dict(facecolor='white', alpha=1, edgecolor='black', boxstyle='round'))
     
     # Set xtick rotation
     plt.xticks(rotation=x_tick_rotation)
@@ -164,18 +789,21 @@ def delta_chart(df, x_axis_data, y_axis_data, figsize=(15,3), title='', y_label=
     plt.xlabel(x_label)
     plt.ylabel(y_label)
     
+    # Record the render time before the plot is shown (plt.show() blocks on interactive backends)
+    _record_render('delta_chart', render_start)
+
     plt.show()
 
     # Create limit chart function
 def limit_chart(df, values, x_labels, target, USL, LSL, title='Limit Chart', y_label='Value', 
-                     x_label='', figsize=(15,3), round_value=4, dpi=300):
+                     x_label='', figsize=(15,3), round_value=4, dpi=300, payload='Off', tiers=None, tier_bands='On'):
     
     """
     Generate a specifcation limit chart plot and calculate relevant parameters.
 
     Parameters:
     -----------
-    df : pandas.DataFrame
+    df : pandas.DataFrame, pyarrow.Table or polars.DataFrame
         Input dataframe containing the data.
     values : str or list of str
         Column name(s) in `df` that contain the values to be plotted.
@@ -199,6 +827,15 @@ def limit_chart(df, values, x_labels, target, USL, LSL, title='Limit Chart', y_l
         Number of decimal places to round mean and PBC parameters (default is 4).
     dpi : int, optional
         Dots per inch for figure resolution (default is 300).
+    payload : str, optional
+        If 'JSON', 'msgpack' or 'Dict', skip matplotlib and return the data needed to draw the chart on
+        the client (decimated series, signal positions, limit lines and ticks) instead of the results.
+        Default is 'Off'.
+    tiers : dict or pandas.DataFrame, optional
+        Additional specification tiers (e.g. grades or bins) in order of preference, see `spec_tiers`.
+        Default is None (only USL and LSL).
+    tier_bands : str, optional
+        If 'On' (default), shade the range of every tier on the chart.
 
     Returns:
     --------
@@ -206,12 +843,14 @@ def limit_chart(df, values, x_labels, target, USL, LSL, title='Limit Chart', y_l
         DataFrame summarizing the calculated PBC parameters including Mean, Target, Mean to Target Delta,
         Upper Specification Limit (USL), Lower Specification Limit (LSL), Specification Limit Range (SLR),
         Number of Values, Number of Values Outside Specification Limits (# Outside Spec), and
-        Percentage of Values Outside Specification Limits (% Outside Spec).
+        Percentage of Values Outside Specification Limits (% Outside Spec). When `tiers` is given, the
+        count (# <Tier>) and percentage (% <Tier>) of values in every tier are added.
     """
     
     # Disaggregate the dataframe 
-    data = df[values]
-    labels = df[x_labels]
+    table_format = _table_format(df)
+    data = _series(df, values)
+    labels = _series(df, x_labels)
     
     # Values in dataset
     num_of_values = len(data)
@@ -223,12 +862,33 @@ def limit_chart(df, values, x_labels, target, USL, LSL, title='Limit Chart', y_l
     # Calculate specification limit range (SLR)
     SLR = USL - LSL
     
-    # Masking parameters for values outside process limits
-    outside_USL = np.sum(data > USL)
-    outside_LSL = np.sum(data < LSL)
-    outside_spec = round(outside_USL + outside_LSL,round_value)
+    # Classify the values against the specification limits in a single pass
+    outside = spec_tiers(data, {'Spec': (LSL, USL)})['Codes'] == 1
+    outside_spec = int(outside.sum())
     percent_outside_spec = round((outside_spec/num_of_values)*100,round_value)
     
+    # Count the values in every tier
+    if tiers is not None:
+        tier_result = spec_tiers(data, tiers, round_value=round_value)
+        tier_params = {}
+        for tier, count, percent in tier_result['Tiers'][['Tier', 'Count', '% of Values']].itertuples(index=False):
+            tier_params[f'# {tier}'] = int(count)
+            tier_params[f'% {tier}'] = percent
+    else:
+        tier_params = {}
+    
+    # Return the data to draw instead of the figure
+    payload_format = _payload_format(payload)
+    if payload_format is not None:
+        panel = _payload_panel(title, [_payload_series(values, data)], signals=outside,
+                               lines=[('Mean', mean, 'black'), ('USL', USL, 'grey'), ('LSL', LSL, 'grey')],
+                               y_label=y_label, values=data)
+        params = {'Mean': mean, 'Target': target, 'Mean to Tar. Delta': mean_to_target_delta, 'USL': USL, 'LSL': LSL,
+                  'Spec Limit Range': SLR, '# of Values': num_of_values, '# Outside Spec': outside_spec,
+                  '% Outside Spec': percent_outside_spec, **tier_params}
+        ticks = _payload_ticks(labels, np.arange(0, len(labels), max(len(labels) // 10, 1)))
+        return _chart_payload('limit_chart', title, [panel], params, ticks, payload_format)
+    
     # Create masking parameters for values greater than and less than the process limits on X-chart
     upper_lim = np.ma.masked_where(data < USL, data)
     lower_lim = np.ma.masked_where(data > LSL, data)
@@ -242,6 +902,7 @@ def limit_chart(df, values, x_labels, target, USL, LSL, title='Limit Chart', y_l
     chart_labels = [(USL,USL),(LSL,LSL),(mean,mean)]
     
     # Generate the X-chart
+    render_start = time.perf_counter()
     fig, ax = plt.subplots(figsize=figsize, dpi=dpi)
 
     # Plot data 
@@ -264,6 +925,19 @@ def limit_chart(df, values, x_labels, target, USL, LSL, title='Limit Chart', y_l
     for value, color in chart_lines:
         plt.axhline(value, ls='--', c=color)
 
+    # Shade the tiers from the widest to the tightest so the tightest stays visible
+    if tiers is not None and tier_bands.lower() == 'on':
+        tier_df = tier_result['Tiers'].iloc[:-1]
+        colors = plt.cm.Greens(np.linspace(0.3, 0.7, len(tier_df)))
+        y_min, y_max = ax.get_ylim()
+        bands = []
+        for position in range(len(tier_df) - 1, -1, -1):
+            tier, lower, upper = tier_df.iloc[position][['Tier', 'LSL', 'USL']]
+            bands.append(ax.axhspan(max(lower, y_min), min(upper, y_max), color=colors[position], alpha=0.15,
+                                    zorder=0, label=tier))
+        ax.set_ylim(y_min, y_max)
+        ax.legend(handles=bands[::-1], loc='upper left', bbox_to_anchor=(1.02, 1), fontsize=9, frameon=False)
+
     # Specify spine visibility 
     ax.spines[['top','right']].set_visible(False)
     ax.spines[['left','bottom']].set_alpha(0.5)
@@ -273,6 +947,9 @@ def limit_chart(df, values, x_labels, target, USL, LSL, title='Limit Chart', y_l
     plt.ylabel(y_label, fontsize=12)
     plt.title(title, fontsize=14)
 
+    # Record the render time before the plot is shown (plt.show() blocks on interactive backends)
+    _record_render('limit_chart', render_start)
+
     # Show plot
     plt.show()
     
@@ -282,48 +959,522 @@ def limit_chart(df, values, x_labels, target, USL, LSL, title='Limit Chart', y_l
     chart_type = ['Limit Chart']*len(chart_params)
     chart_values = [round(x,round_value) for x in [mean, target, mean_to_target_delta, USL, LSL, SLR, 
                     num_of_values, outside_spec, percent_outside_spec]]
+    chart_params += list(tier_params)
+    chart_type += ['Limit Chart']*len(tier_params)
+    chart_values += list(tier_params.values())
     # Create df for PBC parameters
     results_df = pd.DataFrame()
     results_df['Chart'] = pd.Series(chart_type)
     results_df['Parameters'] = pd.Series(chart_params)
     results_df['Values'] = pd.Series(chart_values)
     
-    return results_df
+    return _to_format(results_df, table_format)
+
+def _tier_table(tiers):
 
-# Create X-chart function
-def xchart(df, values, x_labels, title='X-chart', y_label='Individual Values (X)', x_label='',
-           fig_size=(15,3), tickinterval=5, round_value=1, dpi=300, rotate_labels=0, show_xtick_labels='On'):
-    
     """
-    Generate an X-chart (Individual Values Chart) from the provided DataFrame.
+    Return the names, lower limits and upper limits of a tier specification as arrays (missing limits are infinite).
+    """
+
+    if isinstance(tiers, dict):
+        names = list(tiers)
+        bounds = [tiers[name] for name in names]
+        lower = [bound[0] for bound in bounds]
+        upper = [bound[1] for bound in bounds]
+    else:
+        names = list(tiers['Tier'])
+        lower = list(tiers['LSL'])
+        upper = list(tiers['USL'])
+    lower = np.array([-np.inf if bound is None else bound for bound in lower], dtype=float)
+    upper = np.array([np.inf if bound is None else bound for bound in upper], dtype=float)
+    lower[np.isnan(lower)] = -np.inf
+    upper[np.isnan(upper)] = np.inf
+    if np.any(lower > upper):
+        raise ValueError("Every tier must have LSL <= USL.")
+
+    return names, lower, upper
+
+# Specification tiers function
+def spec_tiers(values, tiers, other='Out of Spec', round_value=4):
+
+    """
+    Grade every value into one of several (typically nested) specification tiers in a single pass.
+
+    The limits of all tiers are sorted into one array of edges. Every value is located among the
+    edges with a single `np.searchsorted`, and a lookup table built once from the edges maps each
+    interval between edges (and each edge itself, as the limits are inclusive) to the first listed
+    tier that contains it. Values outside every tier are graded `other`.
 
     Parameters:
     -----------
-    df : pandas.DataFrame
-        Input DataFrame containing the data.
-    values : str
-        Column name in `df` representing the individual values.
-    x_labels : str
-        Column name in `df` for the x-axis labels.
-    title : str, optional
-        Title for the plot, default is 'X-chart'.
-    y_label : str, optional
-        Label for the y-axis, default is 'Individual Values'.
-    x_label : str, optional
-        Label for the x-axis, default is an empty string.
-    tickinterval : int, optional
-        Specify the distance between x-ticks
-    fig_size : tuple, optional
-        Figure size in inches (width, height), default is (15, 3).
+    values : array-like
+        Values to grade.
+    tiers : dict or pandas.DataFrame
+        Tiers in order of preference, either a dict mapping each tier name to its (LSL, USL) or a
+        DataFrame with the columns 'Tier', 'LSL' and 'USL'. A missing limit (None or NaN) makes the
+        tier one-sided. Values are graded into the first tier whose limits contain them, so nested
+        tiers should be listed from the tightest to the widest.
+    other : str, optional
+        Name of the grade of values outside every tier, default is 'Out of Spec'.
     round_value : int, optional
-        Number of decimal places to round calculations, default is 2.
-    dpi : int, optional
-        Dots per inch (resolution) of the figure, default is 300.
-    rotate_labels : int, optional
-        Specify the rotation for the xlabels.
-    show_xtick_labels : str, optional
-        Turn xtick labels on and off, default is "On". 
-        
+        Number of decimal places to round the percentages (default is 4).
+
+    Returns:
+    --------
+    dict
+        - 'Codes': array of the smallest signed integer type that fits the codes (int8 for up to 127
+          tiers) with the position of the tier of every value in `tiers`, len(tiers) for `other` and -1
+          for missing values.
+        - 'Tiers': DataFrame with the 'Tier', 'LSL', 'USL', 'Count' and '% of Values' of every tier and of `other`.
+
+    Example:
+    --------
+    >>> tiers = {'A': (9.9, 10.1), 'B': (9.8, 10.2), 'C': (9.5, 10.5)}
+    >>> result = spec_tiers(df['Diameter'], tiers, other='Scrap')
+    >>> result['Tiers']
+    """
+
+    compute_start = time.perf_counter()
+
+    values = np.asarray(values, dtype=float).ravel()
+    names, lower, upper = _tier_table(tiers)
+    num_tiers = len(names)
+
+    # Choose the smallest signed code type that holds -1 (missing) and len(tiers) (other)
+    code_dtype = np.int8 if num_tiers <= 127 else np.int16 if num_tiers <= 32767 else np.int32
+    
+    # Build the lookup table of the intervals between the edges and the edges themselves
+    edges = np.unique(np.concatenate((lower, upper)))
+    edges = edges[np.isfinite(edges)]
+    points = np.empty(2 * len(edges) + 1)
+    if len(edges):
+        points[0::2] = np.concatenate(([edges[0] - 1], (edges[:-1] + edges[1:]) / 2, [edges[-1] + 1]))
+        points[1::2] = edges
+    else:
+        # Without finite limits every value falls in the same single interval
+        points[0] = 0.0
+    contains = (points[:, np.newaxis] >= lower) & (points[:, np.newaxis] <= upper)
+    if num_tiers:
+        lookup = np.where(contains.any(axis=1), contains.argmax(axis=1), num_tiers).astype(code_dtype)
+    else:
+        lookup = np.zeros(len(points), dtype=code_dtype)
+
+    # Locate every value among the edges with a single search
+    positions = np.searchsorted(edges, values, side='left')
+    on_edge = positions < len(edges)
+    on_edge[on_edge] = edges[positions[on_edge]] == values[on_edge]
+    codes = lookup[2 * positions + on_edge]
+    missing = np.isnan(values)
+    codes[missing] = -1
+
+    # Count the values of every tier
+    counts = np.bincount(codes[~missing], minlength=num_tiers + 1)
+    num_valid = max(int((~missing).sum()), 1)
+    tiers_df = pd.DataFrame({
+        'Tier': names + [other],
+        'LSL': np.append(lower, np.nan),
+        'USL': np.append(upper, np.nan),
+        'Count': counts,
+        '% of Values': np.round(counts / num_valid * 100, round_value)
+    })
+
+    if _metrics.enabled:
+        _metrics.increment('improvement_points_processed_total', len(values), function='spec_tiers')
+        _metrics.observe('improvement_compute_seconds', time.perf_counter() - compute_start, function='spec_tiers')
+
+    return {'Codes': codes, 'Tiers': tiers_df}
+
+# Create batch limit chart parameters function
+def limit_chart_batch(data, specs, values=None, characteristic=None, round_value=4):
+
+    """
+    Calculate the `limit_chart` parameters and capability indices for many characteristics at once.
+
+    All characteristics are evaluated in a single vectorized pass with each characteristic's
+    specification limits broadcast over its values. No chart is drawn.
+
+    Parameters:
+    -----------
+    data : numpy.ndarray, pandas.DataFrame, pyarrow.Table or polars.DataFrame
+        Either a values matrix (observations x characteristics, NaN padded where a characteristic
+        has fewer values) given as a 2D array or wide table, or a long-format table when
+        `values` and `characteristic` are specified.
+    specs : pandas.DataFrame
+        Specification table with columns 'USL', 'LSL' and 'Target'. Rows are matched to the
+        characteristics by index (or by the `characteristic` column if present). For a 2D array,
+        rows are matched by position. A missing USL or LSL is treated as a one-sided specification.
+    values : str, optional
+        Column name in a long-format `data` containing the values.
+    characteristic : str, optional
+        Column name in a long-format `data` identifying the characteristic of each value.
+    round_value : int, optional
+        Number of decimal places to round the results (default is 4).
+
+    Returns:
+    --------
+    pandas.DataFrame
+        One row per characteristic with 'Characteristic', 'Mean', 'Target', 'Mean to Tar. Delta', 'USL',
+        'LSL', 'Spec Limit Range', '# of Values', '# Outside Spec', '% Outside Spec', 'AmR', 'Sigma',
+        'Cp' and 'Cpk'.
+
+    Notes:
+    ------
+    - '# of Values' counts the non-missing values of each characteristic.
+    - Sigma is estimated from the average moving range (Sigma = AmR / 1.128) as on the XmR chart.
+    - Cp = (USL - LSL) / (6 * Sigma) and Cpk = min(USL - Mean, Mean - LSL) / (3 * Sigma).
+
+    Example:
+    --------
+    >>> specs = pd.DataFrame({'USL': [5.6, 10.2], 'LSL': [5.2, 9.8], 'Target': [5.4, 10.0]},
+    ...                      index=['InnerDiameter', 'OuterDiameter'])
+    >>> limit_chart_batch(socket_df[['InnerDiameter', 'OuterDiameter']], specs)
+    """
+
+    compute_start = time.perf_counter()
+
+    # Define the bias correction constant for sigma
+    d2 = 1.128
+
+    # Arrange the values as consecutive segments, one per characteristic
+    if values is not None and characteristic is not None:
+        codes, names = pd.factorize(_column(data, characteristic, dtype=None))
+        valid = codes >= 0
+        order = np.flatnonzero(valid)[np.argsort(codes[valid], kind='stable')]
+        series = _column(data, values)[order]
+        lengths = np.bincount(codes[valid], minlength=len(names))
+        offsets = np.concatenate(([0], np.cumsum(lengths)))
+        names = pd.Index(names)
+    else:
+        if _is_table(data):
+            names = pd.Index(_column_names(data))
+            matrix = np.column_stack([_column(data, name) for name in names])
+        else:
+            matrix = np.asarray(data, dtype=float)
+            if matrix.ndim == 1:
+                matrix = matrix[:, np.newaxis]
+            names = pd.RangeIndex(matrix.shape[1])
+        series = matrix.ravel(order='F')
+        offsets = np.arange(matrix.shape[1] + 1, dtype=np.int64) * matrix.shape[0]
+        lengths = np.diff(offsets)
+
+    # Align the specification table with the characteristics
+    if characteristic is not None and characteristic in specs.columns:
+        specs = specs.set_index(characteristic)
+    if _is_table(data):
+        specs = specs.reindex(names)
+    USL = specs['USL'].to_numpy(dtype=float)
+    LSL = specs['LSL'].to_numpy(dtype=float)
+    target = specs['Target'].to_numpy(dtype=float)
+
+    # Calculate the mean and average moving range of every characteristic
+    stats = _xmr_segment_stats(series, offsets)
+    mean = stats['Mean']
+    num_of_values = stats['Count']
+
+    # Count values outside the specification limits by broadcasting each limit over its segment
+    outside = (series > np.repeat(USL, lengths)) | (series < np.repeat(LSL, lengths))
+    outside_spec = _segment_reduce(np.add, outside, offsets).astype(np.int64)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        percent_outside_spec = (outside_spec / num_of_values) * 100
+
+        # Calculate capability indices from the XmR estimate of sigma
+        sigma = stats['AmR'] / d2
+        Cp = (USL - LSL) / (6 * sigma)
+        Cpk = np.fmin(USL - mean, mean - LSL) / (3 * sigma)
+
+    # Create df for limit chart parameters
+    results_df = pd.DataFrame({
+        'Characteristic': names,
+        'Mean': mean,
+        'Target': target,
+        'Mean to Tar. Delta': target - mean,
+        'USL': USL,
+        'LSL': LSL,
+        'Spec Limit Range': USL - LSL,
+        '# of Values': num_of_values,
+        '# Outside Spec': outside_spec,
+        '% Outside Spec': percent_outside_spec,
+        'AmR': stats['AmR'],
+        'Sigma': sigma,
+        'Cp': Cp,
+        'Cpk': Cpk
+    }).round(round_value)
+
+    # Return the results in the format of the input table
+    if _is_table(data):
+        results_df = _to_format(results_df, _table_format(data))
+
+    if _metrics.enabled:
+        _metrics.increment('improvement_series_processed_total', len(offsets) - 1, function='limit_chart_batch')
+        _metrics.increment('improvement_points_processed_total', len(series), function='limit_chart_batch')
+        _metrics.observe('improvement_compute_seconds', time.perf_counter() - compute_start, function='limit_chart_batch')
+
+    return results_df
+
+# Streaming event bucketing class
+class EventBucketer:
+    
+    """
+    Incrementally aggregate raw events (timestamps with optional measurements) into fixed periods.
+
+    Events are added in batches of any size and in any order. Each event is assigned to the period
+    that contains its timestamp. A period is closed once the watermark (the latest timestamp seen
+    minus `lateness`) passes its end, after which it is emitted and its state is released. Events
+    that arrive for a period that has already been closed are dropped and counted in `report`.
+    Only the open periods are kept, so memory is bounded by `lateness / period` regardless of the
+    length of the stream. Periods without events are emitted as well, so the output is a regular
+    series that can be passed to `pbc`, `xchart` or `NetworkAnalysis.update`.
+
+    Parameters:
+    -----------
+    period : str, pandas.Timedelta or float
+        Length of each period. Strings and Timedeltas (e.g. '15min') are used with datetime timestamps,
+        numbers with numeric timestamps.
+    agg : str, optional (default='count')
+        Aggregation of each period: 'count', 'sum', 'mean' or 'rate' (events per second for datetime
+        timestamps, per unit of time otherwise).
+    lateness : str, pandas.Timedelta or float, optional (default=0)
+        How long to wait for out-of-order events before a period is closed.
+    origin : str, pandas.Timestamp or float, optional (default=0)
+        Timestamp that the periods are aligned to. Default is the Unix epoch for datetime timestamps.
+
+    Attributes:
+    -----------
+    report : dict
+        Cumulative counts of 'Events', 'Late Events' and 'Periods Emitted', plus the current
+        number of 'Open Periods'.
+
+    Example:
+    --------
+    >>> bucketer = EventBucketer('1h', agg='mean', lateness='10min')
+    >>> bucketer.add(events_df['Timestamp'], events_df['Reading'])
+    >>> series_df = bucketer.emit()
+    >>> pbc(series_df, 'Values', 'Period')
+    """
+    
+    def __init__(self, period, agg='count', lateness=0, origin=0):
+        
+        # Validate inputs
+        if agg not in ('count', 'sum', 'mean', 'rate'):
+            raise ValueError("Agg must be 'count', 'sum', 'mean' or 'rate'.")
+        
+        self.agg = agg
+        self.is_datetime = isinstance(period, (str, pd.Timedelta, np.timedelta64))
+        if self.is_datetime:
+            self.period = pd.Timedelta(period).value
+            self.lateness = pd.Timedelta(lateness).value
+            self.origin = pd.Timestamp(origin).value if origin != 0 else 0
+        else:
+            self.period = float(period)
+            self.lateness = float(lateness)
+            self.origin = float(origin)
+        if self.period <= 0:
+            raise ValueError("Period must be positive.")
+        self.report = {'Events': 0, 'Late Events': 0, 'Periods Emitted': 0, 'Open Periods': 0}
+        
+        # State of the open periods, starting at period index self._first; periods before
+        # self._closed_until have been passed by the watermark and are closed
+        self._first = None
+        self._closed_until = None
+        self._counts = np.zeros(0)
+        self._sums = np.zeros(0)
+        self._watermark = -np.inf
+        self._closed = []
+    
+    def _period_index(self, timestamps):
+        
+        # Convert timestamps to the index of the period that contains them
+        if self.is_datetime:
+            timestamps = pd.to_datetime(np.asarray(timestamps)).to_numpy(dtype='datetime64[ns]').view(np.int64)
+            return (timestamps - self.origin) // self.period, timestamps
+        timestamps = np.asarray(timestamps, dtype=float)
+        return np.floor((timestamps - self.origin) / self.period).astype(np.int64), timestamps
+    
+    def add(self, timestamps, values=None):
+        
+        """
+        Add a batch of events and close the periods that the watermark has passed.
+
+        Parameters:
+        -----------
+        timestamps : array-like
+            Timestamps of the events, in any order.
+        values : array-like, optional
+            Measurements of the events. Required for 'sum' and 'mean'.
+
+        Returns:
+        --------
+        int
+            Number of periods closed by this batch.
+        """
+        
+        index, timestamps = self._period_index(timestamps)
+        index = index.ravel()
+        if values is None:
+            if self.agg in ('sum', 'mean'):
+                raise ValueError("Values are required for 'sum' and 'mean'.")
+            values = np.ones(len(index))
+        values = np.asarray(values, dtype=float).ravel()
+        if len(values) != len(index):
+            raise ValueError("Timestamps and values must have the same length.")
+        self.report['Events'] += len(index)
+        if len(index) == 0:
+            return 0
+        
+        # Drop events for periods that have already been closed
+        if self._closed_until is not None:
+            on_time = index >= self._closed_until
+            self.report['Late Events'] += int(len(index) - on_time.sum())
+            index = index[on_time]
+            values = values[on_time]
+        
+        # Extend the open periods backwards for events of earlier periods that are still open
+        if len(index):
+            first = int(index.min())
+            if self._first is None:
+                self._first = first
+            elif first < self._first:
+                self._counts = np.pad(self._counts, (self._first - first, 0))
+                self._sums = np.pad(self._sums, (self._first - first, 0))
+                self._first = first
+            index = index - self._first
+        
+        # Accumulate the batch into the open periods
+        if len(index):
+            size = max(len(self._counts), int(index.max()) + 1)
+            self._counts = np.bincount(index, minlength=size).astype(float) + np.pad(self._counts, (0, size - len(self._counts)))
+            self._sums = np.bincount(index, weights=values, minlength=size) + np.pad(self._sums, (0, size - len(self._sums)))
+        
+        # Advance the watermark and close every period that ends at or before it
+        self._watermark = max(self._watermark, timestamps.max() - self.lateness)
+        if self.is_datetime:
+            closed_until = int((self._watermark - self.origin) // self.period)
+        else:
+            closed_until = int(np.floor((self._watermark - self.origin) / self.period))
+        
+        return self._close(closed_until)
+    
+    def _close(self, closed_until):
+        
+        # Move the periods before closed_until from the open state to the output
+        if self._closed_until is None or closed_until > self._closed_until:
+            self._closed_until = closed_until
+        if self._first is None:
+            return 0
+        num_closed = closed_until - self._first
+        if num_closed <= 0:
+            self.report['Open Periods'] = len(self._counts)
+            return 0
+        counts = np.pad(self._counts[:num_closed], (0, max(num_closed - len(self._counts), 0)))
+        sums = np.pad(self._sums[:num_closed], (0, max(num_closed - len(self._sums), 0)))
+        self._closed.append((np.arange(self._first, closed_until), counts, sums))
+        self._counts = self._counts[num_closed:]
+        self._sums = self._sums[num_closed:]
+        self._first = closed_until
+        self.report['Periods Emitted'] += num_closed
+        self.report['Open Periods'] = len(self._counts)
+        
+        return num_closed
+    
+    def flush(self):
+        
+        """
+        Close all open periods, e.g. at the end of a stream. Events for these periods that arrive later are dropped.
+
+        Returns:
+        --------
+        int
+            Number of periods closed.
+        """
+        
+        if self._first is None:
+            return 0
+        
+        return self._close(self._first + len(self._counts))
+    
+    def emit(self):
+        
+        """
+        Return the periods closed since the last call and release them.
+
+        Returns:
+        --------
+        pandas.DataFrame
+            DataFrame with columns 'Period' (start of each period), 'Count' and 'Values' (the aggregated value).
+        """
+        
+        if self._closed:
+            index = np.concatenate([closed[0] for closed in self._closed])
+            counts = np.concatenate([closed[1] for closed in self._closed])
+            sums = np.concatenate([closed[2] for closed in self._closed])
+        else:
+            index, counts, sums = np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0)
+        self._closed = []
+        
+        # Calculate the aggregated value of each period
+        if self.agg == 'count':
+            aggregated = counts
+        elif self.agg == 'sum':
+            aggregated = sums
+        elif self.agg == 'mean':
+            with np.errstate(invalid='ignore'):
+                aggregated = sums / counts
+        else:
+            seconds = self.period / 1e9 if self.is_datetime else self.period
+            aggregated = counts / seconds
+        
+        # Convert the period indices to period start timestamps
+        starts = index * self.period + self.origin
+        if self.is_datetime:
+            starts = pd.to_datetime(starts, unit='ns')
+        
+        series_df = pd.DataFrame({'Period': starts, 'Count': counts.astype(np.int64), 'Values': aggregated})
+        
+        return series_df
+
+# Create X-chart function
+def xchart(df, values, x_labels, title='X-chart', y_label='Individual Values (X)', x_label='',
+           fig_size=(15,3), tickinterval=5, round_value=1, dpi=300, rotate_labels=0, show_xtick_labels='On',
+           payload='Off', save_path=None):
+    
+    """
+    Generate an X-chart (Individual Values Chart) from the provided DataFrame.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame, pyarrow.Table or polars.DataFrame
+        Input DataFrame containing the data.
+    values : str
+        Column name in `df` representing the individual values.
+    x_labels : str
+        Column name in `df` for the x-axis labels.
+    title : str, optional
+        Title for the plot, default is 'X-chart'.
+    y_label : str, optional
+        Label for the y-axis, default is 'Individual Values'.
+    x_label : str, optional
+        Label for the x-axis, default is an empty string.
+    tickinterval : int, optional
+        Specify the distance between x-ticks
+    fig_size : tuple, optional
+        Figure size in inches (width, height), default is (15, 3).
+    round_value : int, optional
+        Number of decimal places to round calculations, default is 2.
+    dpi : int, optional
+        Dots per inch (resolution) of the figure, default is 300.
+    rotate_labels : int, optional
+        Specify the rotation for the xlabels.
+    show_xtick_labels : str, optional
+        Turn xtick labels on and off, default is "On". 
+    payload : str, optional
+        If 'JSON', 'msgpack' or 'Dict', skip matplotlib and return the data needed to draw the chart on
+        the client (decimated series, signal positions, limit lines and ticks) instead of the results.
+        Default is 'Off'.
+    save_path : str, optional
+        If given, also save the chart to this file with `export_chart`, which rasterizes dense data
+        layers of PDF/SVG exports while limits and text stay vector. Default is None.
+        
     Returns:
     --------
     dict
@@ -344,13 +1495,10 @@ def xchart(df, values, x_labels, title='X-chart', y_label='Individual Values (X)
     """
     
     # Disaggregate the dataframe 
-    data = df[values]
+    table_format = _table_format(df)
+    data = _series(df, values)
     moving_ranges = round(abs(data.diff()),round_value)
-    labels = df[x_labels]
-
-    # Add moving ranges to df as column
-    df = df.copy()
-    df['Moving Ranges'] = pd.Series(moving_ranges)
+    labels = _series(df, x_labels)
     
     # Calculate the mean
     mean = data.mean()
@@ -370,6 +1518,16 @@ def xchart(df, values, x_labels, title='X-chart', y_label='Individual Values (X)
     # Calculate the Upper Range Limit
     URL = C2*AmR
     
+    # Return the data to draw instead of the figure
+    payload_format = _payload_format(payload)
+    if payload_format is not None:
+        panel = _payload_panel(title, [_payload_series(values, data)], signals=(data > UPL) | (data < LPL),
+                               lines=[('Mean', mean, 'black'), ('UPL', UPL, 'red'), ('LPL', LPL, 'red')],
+                               y_label=y_label, values=data)
+        params = {'Mean': mean, 'UPL': UPL, 'LPL': LPL, 'PLR': PLR}
+        return _chart_payload('xchart', title, [panel], params, _payload_ticks(labels, np.arange(0, len(labels), tickinterval)),
+                              payload_format)
+    
     # Create masking parameters for values greater than and less than the process limits on X-chart
     upper_lim = np.ma.masked_where(data < UPL, data)
     lower_lim = np.ma.masked_where(data > LPL, data)
@@ -386,6 +1544,7 @@ def xchart(df, values, x_labels, title='X-chart', y_label='Individual Values (X)
     mrchart_labels = [(URL,URL),(AmR,AmR)]
     
     # Generate the X-chart
+    render_start = time.perf_counter()
     fig, ax = plt.subplots(figsize=fig_size, dpi=dpi)
 
     # Plot data 
@@ -430,6 +1589,13 @@ def xchart(df, values, x_labels, title='X-chart', y_label='Individual Values (X)
     if (show_xtick_labels == 'Off') | (show_xtick_labels == 'off'):
       plt.xticks([])
     
+    # Record the render time before the plot is shown (plt.show() blocks on interactive backends)
+    _record_render('xchart', render_start)
+
+    # Optionally export the figure
+    if save_path is not None:
+        export_chart(save_path, fig, dpi=dpi, bbox_inches='tight')
+
     # Show plot
     plt.show()
     
@@ -440,8 +1606,8 @@ def xchart(df, values, x_labels, title='X-chart', y_label='Individual Values (X)
         else:
             return 'Common Cause'
     
-    # Apply variation_conditions
-    df['X-Chart Variation'] = df[values].apply(xchart_variation)
+    # Add moving ranges and variation_conditions to df as columns
+    df = _with_columns(df, {'Moving Ranges': moving_ranges, 'X-Chart Variation': data.apply(xchart_variation)})
     
     # Create list of PBC paramters
     chart_type = ['X-Chart']*4
@@ -454,7 +1620,7 @@ def xchart(df, values, x_labels, title='X-chart', y_label='Individual Values (X)
     PBC_params_df['Values'] = pd.Series(xchart_values)
     
     # Create dictionary of dfs
-    result_dfs = {'PBC Params':PBC_params_df, 
+    result_dfs = {'PBC Params':_to_format(PBC_params_df, table_format), 
                   'X-Chart Dataframe':df
                  }
     
@@ -462,14 +1628,14 @@ def xchart(df, values, x_labels, title='X-chart', y_label='Individual Values (X)
 
 # Create mR-chart function
 def mrchart(df, values, x_labels, fig_size=(15,3), y_label='Moving Ranges (mR)', x_label='', title='mR-chart', 
-             tickinterval=5, rotate_labels=0, round_value=2, dpi=300, show_xtick_labels='On'):
+             tickinterval=5, rotate_labels=0, round_value=2, dpi=300, show_xtick_labels='On', payload='Off', save_path=None):
     
     """
     Generate an mR-chart (Moving Range Chart) from the provided DataFrame. 
 
     Parameters:
     -----------
-    df : pandas.DataFrame
+    df : pandas.DataFrame, pyarrow.Table or polars.DataFrame
         Input DataFrame containing the data.
     values : str
         Column name in `df` representing the values from which the moving range will be calculated.
@@ -493,6 +1659,13 @@ def mrchart(df, values, x_labels, fig_size=(15,3), y_label='Moving Ranges (mR)',
         Dots per inch (resolution) of the figure, default is 300.
     show_xtick_labels : str, optional
         Turn xtick labels on and off, default is "On". 
+    payload : str, optional
+        If 'JSON', 'msgpack' or 'Dict', skip matplotlib and return the data needed to draw the chart on
+        the client (decimated series, signal positions, limit lines and ticks) instead of the results.
+        Default is 'Off'.
+    save_path : str, optional
+        If given, also save the chart to this file with `export_chart`, which rasterizes dense data
+        layers of PDF/SVG exports while limits and text stay vector. Default is None.
 
     Returns:
     --------
@@ -512,12 +1685,9 @@ def mrchart(df, values, x_labels, fig_size=(15,3), y_label='Moving Ranges (mR)',
     mr_chart(df, 'Moving Ranges', 'Observation', title='Example mR-chart')
 
     """
-    mRs = abs(df[values].diff())
-    labels = df[x_labels]
-
-    # Add moving ranges to df as column
-    df = df.copy()
-    df['Moving Ranges'] = pd.Series(mRs)
+    table_format = _table_format(df)
+    mRs = abs(_series(df, values).diff())
+    labels = _series(df, x_labels)
     
     # Calculate the average moving range 
     AmR = mRs.mean()
@@ -527,6 +1697,14 @@ def mrchart(df, values, x_labels, fig_size=(15,3), y_label='Moving Ranges (mR)',
     # Calculate the Upper Range Limit
     URL = C2*AmR
     
+    # Return the data to draw instead of the figure
+    payload_format = _payload_format(payload)
+    if payload_format is not None:
+        panel = _payload_panel(title, [_payload_series('Moving Ranges', mRs)], signals=mRs > URL,
+                               lines=[('AmR', AmR, 'black'), ('URL', URL, 'red')], y_label=y_label, values=mRs)
+        return _chart_payload('mrchart', title, [panel], {'AmR': AmR, 'URL': URL},
+                              _payload_ticks(labels, np.arange(0, len(labels), tickinterval)), payload_format)
+    
     # Create masking parameters for values greater than URL on mR-chart
     url_greater = np.ma.masked_where(mRs <= URL, mRs)
     url_less = np.ma.masked_where(mRs > URL, mRs)
@@ -537,6 +1715,7 @@ def mrchart(df, values, x_labels, fig_size=(15,3), y_label='Moving Ranges (mR)',
     mRchart_labels = [(URL,URL),(AmR,AmR)]
     
     # Generate the mR-chart
+    render_start = time.perf_counter()
     fig,ax = plt.subplots(figsize=fig_size, dpi=dpi)
 
     # Plot data 
@@ -578,6 +1757,13 @@ def mrchart(df, values, x_labels, fig_size=(15,3), y_label='Moving Ranges (mR)',
     if (show_xtick_labels == 'Off') | (show_xtick_labels == 'off'):
       plt.xticks([])
                
+    # Record the render time before the plot is shown (plt.show() blocks on interactive backends)
+    _record_render('mrchart', render_start)
+
+    # Optionally export the figure
+    if save_path is not None:
+        export_chart(save_path, fig, dpi=dpi, bbox_inches='tight')
+
     # Show plot
     plt.show()
     
@@ -588,8 +1774,8 @@ def mrchart(df, values, x_labels, fig_size=(15,3), y_label='Moving Ranges (mR)',
         else:
             return 'Common Cause'
     
-    # Apply variation_conditions
-    df['mR-Chart Variation'] = df['Moving Ranges'].apply(mrchart_variation)
+    # Add moving ranges and variation_conditions to df as columns
+    df = _with_columns(df, {'Moving Ranges': mRs, 'mR-Chart Variation': mRs.apply(mrchart_variation)})
     
     # Create list of PBC paramters
     chart_type = ['mR-Chart']*2
@@ -602,21 +1788,294 @@ def mrchart(df, values, x_labels, fig_size=(15,3), y_label='Moving Ranges (mR)',
     mrchart_params_df['Values'] = pd.Series(param_values)
     
     # Create dictionary of dfs
-    result_dfs = {'PBC Params':mrchart_params_df, 
+    result_dfs = {'PBC Params':_to_format(mrchart_params_df, table_format), 
                   'mR-Chart Dataframe':df
                  }
     
     return result_dfs
 
+# Compiled XmR kernel (only available when numba is installed)
+if numba is not None:
+    @numba.njit(cache=True)
+    def _xmr_signals_compiled(values, offsets, C1, C2, max_gap):
+        num_segments = len(offsets) - 1
+        params = np.empty((num_segments, 8))
+        moving_ranges = np.empty(len(values))
+        x_signals = np.zeros(len(values), dtype=np.bool_)
+        mr_signals = np.zeros(len(values), dtype=np.bool_)
+        for segment in range(num_segments):
+            start = offsets[segment]
+            end = offsets[segment + 1]
+            
+            # Accumulate the values and moving ranges of the segment
+            total = 0.0
+            count = 0
+            mr_total = 0.0
+            mr_count = 0
+            bridged = 0
+            last_valid = -1
+            for i in range(start, end):
+                value = values[i]
+                moving_range = np.nan
+                if not np.isnan(value):
+                    # Bridge gaps of up to max_gap missing values
+                    if last_valid >= 0 and i - last_valid - 1 <= max_gap:
+                        moving_range = abs(value - values[last_valid])
+                        if i - last_valid > 1:
+                            bridged += 1
+                    last_valid = i
+                    total += value
+                    count += 1
+                moving_ranges[i] = moving_range
+                if not np.isnan(moving_range):
+                    mr_total += moving_range
+                    mr_count += 1
+            
+            # Calculate the process limits
+            mean = total / count if count > 0 else np.nan
+            AmR = mr_total / mr_count if mr_count > 0 else np.nan
+            UPL = mean + C1 * AmR
+            LPL = mean - C1 * AmR
+            PLR = UPL - LPL
+            if LPL < 0:
+                LPL = 0.0
+            URL = C2 * AmR
+            params[segment, 0] = mean
+            params[segment, 1] = UPL
+            params[segment, 2] = LPL
+            params[segment, 3] = PLR
+            params[segment, 4] = AmR
+            params[segment, 5] = URL
+            params[segment, 6] = (end - start) - count
+            params[segment, 7] = bridged
+            
+            # Flag values outside the limits
+            for i in range(start, end):
+                x_signals[i] = (values[i] > UPL) or (values[i] < LPL)
+                mr_signals[i] = moving_ranges[i] > URL
+        
+        return params, moving_ranges, x_signals, mr_signals
+
+# XmR limits and signals function
+def xmr_signals(values, offsets=None, backend='auto', missing='skip', max_gap=1):
+    
+    """
+    Calculate moving ranges, process limits and assignable cause signals for one or many series.
+
+    This is the calculation behind `pbc`, without any plotting. When numba is installed the
+    calculation runs as a compiled kernel that makes one pass to accumulate the mean and average
+    moving range of each series and a second fused pass to flag signals, without temporary arrays.
+    Otherwise it falls back to vectorized NumPy.
+
+    Missing values (NaN) are skipped by the mean and never flagged. With `missing='skip'` a moving
+    range that involves a missing value is missing as well. With `missing='bridge'` the moving range
+    after a gap of up to `max_gap` missing values is taken between the values on either side of the
+    gap. Both policies work on masks of the input; no cleaned copy of the values is made.
+
+    Parameters:
+    -----------
+    values : array-like
+        Individual values. Several series can be passed as one concatenated array with `offsets`.
+    offsets : array-like, optional
+        Start position of each series in `values` followed by the total length. Default is None
+        (a single series).
+    backend : str, optional
+        'numba', 'numpy' or 'auto' (numba if installed, otherwise numpy). Default is 'auto'.
+    missing : str, optional
+        Policy for moving ranges that span missing values: 'skip' or 'bridge'. Default is 'skip'.
+    max_gap : int, optional
+        Longest run of missing values bridged with `missing='bridge'`, default is 1.
+
+    Returns:
+    --------
+    dict
+        - 'Mean', 'UPL', 'LPL', 'PLR', 'AmR', 'URL': Arrays with one value per series. The LPL is floored at zero as in `pbc`.
+        - 'Missing', 'mR Bridged': The number of missing values and of bridged moving ranges of each series.
+        - 'Moving Ranges': The moving range of every value (NaN for the first value of each series).
+        - 'X-Chart Signals': Boolean array, True where a value is above the UPL or below the LPL.
+        - 'mR-Chart Signals': Boolean array, True where a moving range is above the URL.
+
+    Example:
+    --------
+    >>> result = xmr_signals(df['Values'])
+    >>> df[result['X-Chart Signals']]
+    """
+    
+    compute_start = time.perf_counter()
+    
+    # Define the value of C1 and C2
+    C1 = 2.660
+    C2 = 3.268
+    
+    values = np.ascontiguousarray(values, dtype=float)
+    if offsets is None:
+        offsets = np.array([0, len(values)], dtype=np.int64)
+    offsets = np.ascontiguousarray(offsets, dtype=np.int64)
+    
+    if backend == 'auto':
+        backend = 'numpy' if numba is None else 'numba'
+    if backend == 'numba' and numba is None:
+        raise ValueError("The numba backend requires numba to be installed.")
+    if backend not in ('numba', 'numpy'):
+        raise ValueError("Backend must be 'auto', 'numba' or 'numpy'.")
+    max_gap = _max_gap(missing, max_gap)
+    
+    if backend == 'numba':
+        params, moving_ranges, x_signals, mr_signals = _xmr_signals_compiled(values, offsets, C1, C2, max_gap)
+        mean, UPL, LPL, PLR, AmR, URL = params[:, :6].T
+        num_missing = params[:, 6].astype(np.int64)
+        num_bridged = params[:, 7].astype(np.int64)
+    else:
+        stats = _xmr_segment_stats(values, offsets, max_gap)
+        mean = stats['Mean']
+        AmR = stats['AmR']
+        moving_ranges = stats['Moving Ranges']
+        num_missing = stats['Missing']
+        num_bridged = stats['mR Bridged']
+        
+        # Calculate the process limits
+        UPL = mean + (C1*AmR)
+        LPL = mean - (C1*AmR)
+        PLR = UPL - LPL
+        LPL = np.where(LPL < 0, 0.0, LPL)
+        URL = C2*AmR
+        
+        # Flag values outside the limits of their own series
+        lengths = np.diff(offsets)
+        x_signals = (values > np.repeat(UPL, lengths)) | (values < np.repeat(LPL, lengths))
+        mr_signals = moving_ranges > np.repeat(URL, lengths)
+    
+    result = {'Mean': mean, 'UPL': UPL, 'LPL': LPL, 'PLR': PLR, 'AmR': AmR, 'URL': URL,
+              'Missing': num_missing, 'mR Bridged': num_bridged,
+              'Moving Ranges': moving_ranges,
+              'X-Chart Signals': x_signals,
+              'mR-Chart Signals': mr_signals
+             }
+    
+    # Record the work done when metrics are enabled
+    if _metrics.enabled:
+        _metrics.increment('improvement_series_processed_total', len(offsets) - 1, function='xmr_signals')
+        _metrics.increment('improvement_points_processed_total', len(values), function='xmr_signals')
+        _metrics.increment('improvement_signals_total', int(x_signals.sum()), rule='x_chart')
+        _metrics.increment('improvement_signals_total', int(mr_signals.sum()), rule='mr_chart')
+        _metrics.observe('improvement_compute_seconds', time.perf_counter() - compute_start, function='xmr_signals')
+    
+    return result
+
+# Bootstrap confidence intervals for the XmR limits
+def bootstrap_limits(values, resamples=10000, block_size=1, confidence=0.95, seed=None, chunk_size=None,
+                     missing='skip', max_gap=1):
+    
+    """
+    Calculate bootstrap confidence intervals for the XmR process limits of a baseline.
+
+    Every resample draws the values of the baseline with replacement (in blocks of `block_size`
+    consecutive values for a moving block bootstrap, which keeps the short-range dependence that
+    the moving ranges measure) and calculates the Mean, AmR and limits as in `pbc`. The resamples
+    are calculated together as a (resamples x n) array, in chunks of `chunk_size` resamples to bound
+    memory, and the intervals are the percentiles of the resampled parameters.
+
+    Missing values are resampled with their positions and handled in every resample with the same
+    policy as the estimate, so the intervals describe the limits reported by `pbc` and `xmr_signals`
+    for the same `missing` and `max_gap`.
+
+    Parameters:
+    -----------
+    values : array-like
+        Baseline values, which may contain missing values (NaN).
+    resamples : int, optional
+        Number of bootstrap resamples, default is 10000.
+    block_size : int, optional
+        Number of consecutive values per block, default is 1 (the ordinary bootstrap).
+    confidence : float, optional
+        Confidence level of the intervals, default is 0.95.
+    seed : int, optional
+        Seed for reproducible results. Default is None.
+    chunk_size : int, optional
+        Resamples per chunk. Default is None (about 4 million values per chunk).
+    missing, max_gap : optional
+        Missing data policy, see `xmr_signals`. Defaults are 'skip' and 1.
+
+    Returns:
+    --------
+    pandas.DataFrame
+        One row per parameter ('Mean', 'UPL', 'LPL', 'PLR', 'AmR', 'URL') with the 'Estimate' from the
+        baseline, the bootstrap 'Std Error', and the 'CI Lower' and 'CI Upper' confidence limits.
+
+    Example:
+    --------
+    >>> bootstrap_limits(baseline_df['Values'], resamples=10000, block_size=5, seed=1)
+    """
+
+    compute_start = time.perf_counter()
+    
+    # Define the value of C1 and C2
+    C1 = 2.660
+    C2 = 3.268
+    
+    values = np.asarray(values, dtype=float).ravel()
+    num_values = len(values)
+    if np.count_nonzero(~np.isnan(values)) < 2:
+        raise ValueError("At least two values are required for the bootstrap.")
+    max_gap = _max_gap(missing, max_gap)
+    block_size = min(max(int(block_size), 1), num_values)
+    num_blocks = -(-num_values // block_size)
+    if chunk_size is None:
+        chunk_size = max(1, 4_000_000 // num_values)
+    rng = np.random.default_rng(seed)
+    
+    # Resample the mean and average moving range chunk by chunk
+    block_offsets = np.arange(block_size)
+    means = np.empty(resamples)
+    AmRs = np.empty(resamples)
+    for start in range(0, resamples, chunk_size):
+        size = min(chunk_size, resamples - start)
+        block_starts = rng.integers(0, num_values - block_size + 1, size=(size, num_blocks, 1))
+        indices = (block_starts + block_offsets).reshape(size, -1)[:, :num_values]
+        # Every resample is a segment, so moving ranges and bridged gaps never cross resamples
+        stats = _xmr_segment_stats(values[indices].ravel(), np.arange(size + 1, dtype=np.int64) * num_values, max_gap)
+        means[start:start + size] = stats['Mean']
+        AmRs[start:start + size] = stats['AmR']
+    
+    # Calculate the process limits of the baseline and of every resample
+    def limits(mean, AmR):
+        UPL = mean + (C1*AmR)
+        LPL = mean - (C1*AmR)
+        PLR = UPL - LPL
+        LPL = np.maximum(LPL, 0)
+        return {'Mean': mean, 'UPL': UPL, 'LPL': LPL, 'PLR': PLR, 'AmR': AmR, 'URL': C2*AmR}
+    
+    stats = _xmr_segment_stats(values, np.array([0, num_values], dtype=np.int64), max_gap)
+    estimates = limits(stats['Mean'][0], stats['AmR'][0])
+    resampled_limits = limits(means, AmRs)
+    
+    # Take the percentile intervals of the resampled parameters (resamples without a moving range are ignored)
+    alpha = (1 - confidence) / 2
+    bootstrap_df = pd.DataFrame({
+        'PBC Params': list(estimates),
+        'Estimate': [float(estimates[param]) for param in estimates],
+        'Std Error': [float(np.nanstd(resampled_limits[param], ddof=1)) for param in estimates],
+        'CI Lower': [float(np.nanquantile(resampled_limits[param], alpha)) for param in estimates],
+        'CI Upper': [float(np.nanquantile(resampled_limits[param], 1 - alpha)) for param in estimates]
+    })
+    
+    if _metrics.enabled:
+        _metrics.increment('improvement_points_processed_total', len(values), function='bootstrap_limits')
+        _metrics.observe('improvement_compute_seconds', time.perf_counter() - compute_start, function='bootstrap_limits')
+
+    return bootstrap_df
+
 # Process behavior chart (pbc) function
-def pbc(df, values, x_labels, xchart_title='', mrchart_title='', fig_size=(15,6), round_value=2, rotate_labels=0, tickinterval=2, dpi=300):
+def pbc(df, values, x_labels, xchart_title='', mrchart_title='', fig_size=(15,6), round_value=2, rotate_labels=0, tickinterval=2, dpi=300,
+        payload='Off', save_path=None, bootstrap=0, block_size=1,
+        missing='skip', max_gap=1, confidence=0.95, seed=None):
     
     """
     Generate an XmR chart (X and mR-chart) from the provided DataFrame.
 
     Parameters:
     -----------
-    df : pandas.DataFrame
+    df : pandas.DataFrame, pyarrow.Table or polars.DataFrame
         Input DataFrame containing the data.
     values : str
         Column name in `df` representing the individual values for X-chart.
@@ -637,12 +2096,36 @@ def pbc(df, values, x_labels, xchart_title='', mrchart_title='', fig_size=(15,6)
     dpi : int, optional
         Dots per inch (resolution) of the figure, default is 300.
 
+    payload : str, optional
+        If 'JSON', 'msgpack' or 'Dict', skip matplotlib and return the data needed to draw the chart on
+        the client (decimated series, signal positions, limit lines and ticks) instead of the results.
+        Default is 'Off'.
+    save_path : str, optional
+        If given, also save the chart to this file with `export_chart`, which rasterizes dense data
+        layers of PDF/SVG exports while limits and text stay vector. Default is None.
+    bootstrap : int, optional
+        Number of bootstrap resamples for confidence intervals of the parameters (see `bootstrap_limits`).
+        Default is 0 (no confidence intervals).
+    block_size : int, optional
+        Block size of the bootstrap, default is 1. Use larger blocks for autocorrelated values.
+    missing : str, optional
+        Policy for moving ranges that span missing values (see `xmr_signals`): 'skip' leaves them
+        missing, 'bridge' takes them across gaps of up to `max_gap` missing values. Default is 'skip'.
+    max_gap : int, optional
+        Longest run of missing values bridged with `missing='bridge'`, default is 1.
+    confidence : float, optional
+        Confidence level of the bootstrap intervals, default is 0.95.
+    seed : int, optional
+        Seed of the bootstrap for reproducible intervals. Default is None.
     Returns:
     --------
     dict
         A dictionary containing DataFrames with calculated parameters and causes:
         - 'PBC Params': DataFrame with calculated parameters including 'Mean', 'UPL' (Upper Process Limit), 'LPL' (Lower Process Limit) for X-chart,
                         'PLR' (Process Limit Range), 'AmR' (Average Moving Range), and 'URL' (Upper Range Limit) for mR-chart.
+                        With `bootstrap`, the columns 'CI Lower' and 'CI Upper' hold the `confidence` limits of each parameter.
+                        The missing data policy is always reported in the 'Missing Data (skip)' or 'Missing Data (bridge)'
+                        rows: 'Missing Values', 'Max Gap Bridged' (0 with `missing='skip'`) and 'Bridged mRs'.
         - 'XmR-Chart Dataframe': DataFrame with added columns 'X-Chart Variation' and 'mR-Chart Variation' categorizing causes as 'Routine Cause' or 'Assignable Cause'.
 
     Notes:
@@ -657,48 +2140,42 @@ def pbc(df, values, x_labels, xchart_title='', mrchart_title='', fig_size=(15,6)
     """
     
     # Disaggregate the dataframe 
-    data = df[values]
-    moving_ranges = abs(data.diff())
-    labels = df[x_labels]
-
-    # Add moving ranges to df as column
-    df = df.copy() # Added this line to address the issue of a value trying to be set on a copy of a slice in a df.
-    df['Moving Ranges'] = pd.Series(moving_ranges)
+    table_format = _table_format(df)
+    data = _series(df, values)
+    labels = _series(df, x_labels)
     
-    # Calculate the mean
-    mean = data.mean()
-    # Calculate the average moving range 
-    AmR = moving_ranges.mean()
+    # Calculate the moving ranges, process limits and signals in one pass
+    xmr = xmr_signals(_column(df, values), missing=missing, max_gap=max_gap)
+    moving_ranges = pd.Series(xmr['Moving Ranges'], index=data.index)
+    mean, UPL, LPL, PLR, AmR, URL = [xmr[param][0] for param in ['Mean','UPL','LPL','PLR','AmR','URL']]
     
-    # Define the value of C1 and C2and calculate the UPL and LPL
-    C1 = 2.660
-    C2 = 3.268
-    # Calculate the process limits
-    UPL = mean + (C1*AmR)
-    LPL = mean - (C1*AmR)
-    # Calculate process limit range (PLR)
-    PLR = UPL - LPL
-    # Conditionally determine LPL if LPL is less than zero
-    LPL = max(LPL,0)
-    # Calculate the Upper Range Limit
-    URL = C2*AmR
+    # Return the data to draw instead of the figure
+    payload_format = _payload_format(payload)
+    if payload_format is not None:
+        panels = [
+            _payload_panel(xchart_title, [_payload_series(values, data)], signals=xmr['X-Chart Signals'],
+                           lines=[('Mean', mean, 'black'), ('UPL', UPL, 'red'), ('LPL', LPL, 'red')],
+                           y_label='Individual Values (X)', values=data),
+            _payload_panel(mrchart_title, [_payload_series('Moving Ranges', xmr['Moving Ranges'])],
+                           signals=xmr['mR-Chart Signals'], lines=[('AmR', AmR, 'black'), ('URL', URL, 'red')],
+                           y_label='Moving Range (mR)', values=xmr['Moving Ranges'])
+        ]
+        params = {'Mean': mean, 'UPL': UPL, 'LPL': LPL, 'PLR': PLR, 'AmR': AmR, 'URL': URL}
+        return _chart_payload('pbc', xchart_title, panels, params,
+                              _payload_ticks(labels, np.arange(0, len(labels), tickinterval)), payload_format)
     
     # Create masking parameters for values greater than and less than the process limits on X-chart
     upper_lim = np.ma.masked_where(data < UPL, data)
     lower_lim = np.ma.masked_where(data > LPL, data)
     # Create masking parameters for values greater than URL on mR-chart
     url_greater = np.ma.masked_where(moving_ranges <= URL, moving_ranges)
-    url_less = np.ma.masked_where(moving_ranges > URL, moving_ranges)
     
     # Create list of tuples that specify value and color for mean, AmR, UPL, LPL, and URL
     xchart_lines = [(mean,'black'), (UPL,'red'), (LPL,'red')]
     mrchart_lines = [(AmR,'black'), (URL,'red')]
-    # Create list of tuples with y-coordinate and labels for x-chart process limits and centerline 
-    xchart_labels = [(UPL,UPL),(LPL,LPL),(mean,mean)]
-    # Create list of tuples with y-coordinate and labels for mR-chart process limit and centerline
-    mrchart_labels = [(URL,URL),(AmR,AmR)]
     
     # Generate the XmR-chart
+    render_start = time.perf_counter()
     fig, axs = plt.subplots(nrows=2, ncols=1, figsize=fig_size, dpi=dpi)
     fig.subplots_adjust(hspace=0.3)
     
@@ -754,25 +2231,22 @@ def pbc(df, values, x_labels, xchart_title='', mrchart_title='', fig_size=(15,6)
     # Remove xticks from mR chart
     axs[1].set_xticks([])
   
+    # Record the render time before the plot is shown (plt.show() blocks on interactive backends)
+    _record_render('pbc', render_start)
+
+    # Optionally export the figure
+    if save_path is not None:
+        export_chart(save_path, fig, dpi=dpi, bbox_inches='tight')
+
     # Show XmR chart figure
     plt.show()
     
-    # Create functions for labeling types of variation 
-    def xchart_variation(value):
-        if (value > UPL) | (value < LPL):
-            return 'Assignable Cause'
-        else:
-            return 'Common Cause'
-    
-    def mrchart_variation(value):
-        if value > URL:
-            return 'Assignable Cause'
-        else:
-            return 'Common Cause'
-    
-    # Apply variation_conditions
-    df['X-Chart Variation'] = df[values].apply(xchart_variation)
-    df['mR-Chart Variation'] = df['Moving Ranges'].apply(mrchart_variation)
+    # Add moving ranges and types of variation to df as columns
+    df = _with_columns(df, {
+        'Moving Ranges': xmr['Moving Ranges'],
+        'X-Chart Variation': np.where(xmr['X-Chart Signals'], 'Assignable Cause', 'Common Cause'),
+        'mR-Chart Variation': np.where(xmr['mR-Chart Signals'], 'Assignable Cause', 'Common Cause')
+    })
     
     # Create list of PBC paramters
     chart_type = ['X-Chart']*4
@@ -785,32 +2259,1433 @@ def pbc(df, values, x_labels, xchart_title='', mrchart_title='', fig_size=(15,6)
     PBC_params_df['Chart'] = pd.Series(chart_type)
     PBC_params_df['PBC Params'] = pd.Series(param_names)
     PBC_params_df['Param Values'] = pd.Series(param_values)
+    # Report the missing data policy (named in the chart column, so the values stay numeric)
+    PBC_params_df = pd.concat([PBC_params_df, pd.DataFrame({
+        'Chart': [f'Missing Data ({missing})'] * 3,
+        'PBC Params': ['Missing Values', 'Max Gap Bridged', 'Bridged mRs'],
+        'Param Values': [xmr['Missing'][0], max_gap if missing == 'bridge' else 0, xmr['mR Bridged'][0]]
+    })], ignore_index=True)
+    # Optionally add bootstrap confidence intervals of the parameters
+    if bootstrap:
+        bootstrap_df = bootstrap_limits(_column(df, values), resamples=bootstrap, block_size=block_size,
+                                        confidence=confidence, seed=seed, missing=missing, max_gap=max_gap)
+        PBC_params_df['CI Lower'] = bootstrap_df['CI Lower'].round(round_value)
+        PBC_params_df['CI Upper'] = bootstrap_df['CI Upper'].round(round_value)
     
     # Create dictionary of dfs
-    result_dfs = {'PBC Params':PBC_params_df, 
+    result_dfs = {'PBC Params':_to_format(PBC_params_df, table_format), 
                   'XmR-Chart Dataframe':df
                  }
     
     return result_dfs
 
-# Improved network analysis function
-def network_analysis(df_list, condition, label_list, title='Network Analysis', rows=1, 
-                     cols=2, linestyle='-', xticks=False, hide_last='Off', color=None,
-                     round_value=3, figsize=(15,10), dpi=300):
+# Change-point detection function
+def detect_phases(values, penalty=None, min_size=10, max_phases=None):
     
     """
-    Perform network analysis on a list of DataFrames, plotting control charts and returning statistical summaries.
+    Detect the phases (segments with different means) of a series using binary segmentation.
+
+    Candidate splits are scored with the reduction in the sum of squared deviations from the
+    segment means, which is calculated for every split position at once from cumulative sums.
+    Segments are split best-first while the reduction exceeds `penalty` times the variance
+    estimated from the average moving range (AmR / 1.128). Every split rescans the two segments
+    it creates, so the run time is O(n log k) when the k phases split evenly and O(n k) in the
+    worst case (O(n^2) when `max_phases` is None and splits keep cutting off short segments).
+    Series of a million values with a few dozen phases are segmented in seconds.
 
     Parameters:
     -----------
-    df_list : list of pandas.DataFrame
-        List of DataFrames containing the data to be analyzed.
-    condition : str
-        Column name in the DataFrames to be used for analysis.
-    label_list : list of str
-        List of labels corresponding to each DataFrame for plot titles.
-    title : str, optional (default='Network Analysis')
-        Title for the overall figure.
+    values : array-like
+        Individual values in time order. Missing values are ignored: the phases are detected on the
+        valid values, and the missing values before the first value of a phase belong to the previous phase.
+    penalty : float, optional
+        Minimum reduction in the sum of squares (in units of the variance) required to accept a split.
+        Default is None (3 * log(n)).
+    min_size : int, optional
+        Minimum number of values in a phase. Default is 10.
+    max_phases : int, optional
+        Maximum number of phases. Default is None (no limit).
+
+    Returns:
+    --------
+    numpy.ndarray
+        Phase offsets: the start position of each phase followed by the total length. Can be passed
+        directly as `offsets` to `xmr_signals`.
+
+    Example:
+    --------
+    >>> offsets = detect_phases(df['Values'])
+    >>> xmr = xmr_signals(df['Values'], offsets)
+    """
+    
+    # Define the bias correction constant for sigma
+    d2 = 1.128
+    
+    values = np.asarray(values, dtype=float).ravel()
+    num_values = len(values)
+    
+    # Segment the valid values and map the phase starts back to positions in `values`
+    valid = np.flatnonzero(~np.isnan(values))
+    if len(valid) < num_values:
+        offsets = np.append(valid, num_values)[detect_phases(values[valid], penalty, min_size, max_phases)]
+        offsets[0] = 0
+        return offsets
+    if num_values < 2 * min_size:
+        return np.array([0, num_values], dtype=np.int64)
+    
+    # Estimate the variance from the average moving range
+    sigma = np.mean(np.abs(np.diff(values))) / d2
+    if penalty is None:
+        penalty = 3 * np.log(num_values)
+    threshold = penalty * sigma**2
+    
+    # Cumulative sums of the centered values
+    cumulative = np.concatenate(([0.0], np.cumsum(values - values.mean())))
+    
+    def best_split(start, end):
+        # Score every admissible split in [start + min_size, end - min_size]
+        splits = np.arange(start + min_size, end - min_size + 1)
+        if len(splits) == 0:
+            return None
+        left_sizes = splits - start
+        right_sizes = end - splits
+        left_means = (cumulative[splits] - cumulative[start]) / left_sizes
+        right_means = (cumulative[end] - cumulative[splits]) / right_sizes
+        gains = left_sizes * right_sizes / (end - start) * (left_means - right_means)**2
+        best = np.argmax(gains)
+        if gains[best] <= threshold:
+            return None
+        return (-gains[best], int(splits[best]), start, end)
+    
+    # Split the segments best-first
+    candidates = []
+    candidate = best_split(0, num_values)
+    if candidate is not None:
+        heapq.heappush(candidates, candidate)
+    change_points = []
+    while candidates and (max_phases is None or len(change_points) + 1 < max_phases):
+        _, split, start, end = heapq.heappop(candidates)
+        change_points.append(split)
+        for segment in [(start, split), (split, end)]:
+            candidate = best_split(*segment)
+            if candidate is not None:
+                heapq.heappush(candidates, candidate)
+    
+    offsets = np.array([0] + sorted(change_points) + [num_values], dtype=np.int64)
+    
+    return offsets
+
+# Process behavior chart with automatic phases function
+def pbc_phases(df, values, x_labels, penalty=None, min_size=10, max_phases=None, xchart_title='', mrchart_title='',
+               fig_size=(15,6), round_value=2, rotate_labels=0, tickinterval=2, dpi=300, payload='Off', save_path=None,
+               missing='skip', max_gap=1):
+    
+    """
+    Generate an XmR chart with automatically detected phases and separate limits for each phase.
+
+    When a process shifts, a single set of limits computed across all values is inflated and hides
+    signals. This function detects the phases with `detect_phases`, calculates the XmR limits of
+    each phase and draws them as stepped limits. Moving ranges are not calculated across phase boundaries.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame, pyarrow.Table or polars.DataFrame
+        Input DataFrame containing the data.
+    values : str
+        Column name in `df` representing the individual values for X-chart.
+    x_labels : str
+        Column name in `df` for the x-axis labels.
+    penalty : float, optional
+        Minimum reduction in the sum of squares (in units of the variance) required to start a new phase.
+        Default is None (3 * log(n)).
+    min_size : int, optional
+        Minimum number of values in a phase, default is 10.
+    max_phases : int, optional
+        Maximum number of phases, default is None (no limit).
+    xchart_title : str, optional
+        Title for the X-chart plot, default is ''.
+    mrchart_title : str, optional
+        Title for the mR-chart plot, default is ''.
+    fig_size : tuple, optional
+        Figure size in inches (width, height), default is (15, 6).
+    round_value : int, optional
+        Number of decimal places to round calculations, default is 2.
+    rotate_labels : int, optional
+        Specify the rotation for xlabels.
+    tickinterval : int, optional
+        Specify the distance between x-ticks, default is 2.
+    dpi : int, optional
+        Dots per inch (resolution) of the figure, default is 300.
+
+    payload : str, optional
+        If 'JSON', 'msgpack' or 'Dict', skip matplotlib and return the data needed to draw the chart on
+        the client (decimated series, signal positions, limit lines and ticks) instead of the results.
+        Default is 'Off'.
+    save_path : str, optional
+        If given, also save the chart to this file with `export_chart`, which rasterizes dense data
+        layers of PDF/SVG exports while limits and text stay vector. Default is None.
+    missing : str, optional
+        Policy for moving ranges that span missing values (see `xmr_signals`): 'skip' leaves them
+        missing, 'bridge' takes them across gaps of up to `max_gap` missing values. Missing values are ignored
+        when detecting the phases. Default is 'skip'.
+    max_gap : int, optional
+        Longest run of missing values bridged with `missing='bridge'`, default is 1.
+    Returns:
+    --------
+    dict
+        A dictionary containing DataFrames with calculated parameters and causes:
+        - 'PBC Params': DataFrame with the 'Phase' and its 'Mean', 'UPL', 'LPL', 'PLR', 'AmR' and 'URL'.
+        - 'XmR-Chart Dataframe': DataFrame with added columns 'Phase', 'Moving Ranges', 'X-Chart Variation'
+          and 'mR-Chart Variation'.
+
+    Example:
+    --------
+    pbc_phases(df, 'Values', 'Observation', min_size=20)
+    """
+    
+    # Disaggregate the dataframe 
+    table_format = _table_format(df)
+    data = _column(df, values)
+    labels = _series(df, x_labels)
+    
+    # Detect the phases and calculate the limits of each phase
+    offsets = detect_phases(data, penalty=penalty, min_size=min_size, max_phases=max_phases)
+    xmr = xmr_signals(data, offsets, missing=missing, max_gap=max_gap)
+    lengths = np.diff(offsets)
+    num_phases = len(lengths)
+    moving_ranges = xmr['Moving Ranges']
+    
+    # Return the data to draw instead of the figure
+    payload_format = _payload_format(payload)
+    if payload_format is not None:
+        def steps(param):
+            # Stepped line with one [start, end, value] segment per phase
+            return np.column_stack((offsets[:-1] - 0.5, offsets[1:] - 0.5, xmr[param]))
+        panels = [
+            _payload_panel(xchart_title, [_payload_series(values, data)], signals=xmr['X-Chart Signals'],
+                           lines=[('Mean', steps('Mean'), 'black'), ('UPL', steps('UPL'), 'red'), ('LPL', steps('LPL'), 'red')],
+                           y_label='Individual Values (X)', values=data),
+            _payload_panel(mrchart_title, [_payload_series('Moving Ranges', moving_ranges)], signals=xmr['mR-Chart Signals'],
+                           lines=[('AmR', steps('AmR'), 'black'), ('URL', steps('URL'), 'red')],
+                           y_label='Moving Range (mR)', values=moving_ranges)
+        ]
+        params = {param: xmr[param] for param in ['Mean','UPL','LPL','PLR','AmR','URL']}
+        params['Phase Starts'] = offsets[:-1]
+        return _chart_payload('pbc_phases', xchart_title, panels, params,
+                              _payload_ticks(labels, np.arange(0, len(labels), tickinterval)), payload_format)
+    
+    # Create masking parameters for values outside the limits of their phase
+    x_signals = np.ma.masked_where(~xmr['X-Chart Signals'], data)
+    mr_signals = np.ma.masked_where(~xmr['mR-Chart Signals'], moving_ranges)
+    
+    # Generate the XmR-chart
+    render_start = time.perf_counter()
+    fig, axs = plt.subplots(nrows=2, ncols=1, figsize=fig_size, dpi=dpi)
+    fig.subplots_adjust(hspace=0.3)
+    positions = np.arange(len(data))
+    
+    # Plot data for x-chart and mR-chart
+    axs[0].plot(positions, data, marker='o')
+    axs[1].plot(positions, moving_ranges, marker='o')
+    
+    # Add masking parameters to color values outside process limits
+    axs[0].plot(positions, x_signals, marker='o', ls='none', color='tab:red',
+            markeredgecolor='black', markersize=9)
+    axs[1].plot(positions, mr_signals, marker='o', ls='none', color='tab:red',
+            markeredgecolor='black', markersize=9)
+    
+    # Add stepped centerlines and process limits 
+    starts = offsets[:-1] - 0.5
+    ends = offsets[1:] - 0.5
+    axs[0].hlines(xmr['Mean'], starts, ends, ls='--', color='black')
+    axs[0].hlines(xmr['UPL'], starts, ends, ls='--', color='red')
+    axs[0].hlines(xmr['LPL'], starts, ends, ls='--', color='red')
+    axs[1].hlines(xmr['AmR'], starts, ends, ls='--', color='black')
+    axs[1].hlines(xmr['URL'], starts, ends, ls='--', color='red')
+    
+    # Add text labels for the limits and centerline of the last phase
+    bbox_props = dict(boxstyle="round,pad=0.3", fc="white", ec="red", lw=1)
+    bbox_props_centerline = dict(boxstyle="round,pad=0.3", fc="white", ec="black", lw=1)
+    for ax, lines in [(axs[0], [('UPL','red'), ('LPL','red'), ('Mean','black')]),
+                      (axs[1], [('URL','red'), ('AmR','black')])]:
+        for param, color in lines:
+            value = xmr[param][-1]
+            ax.text(ax.get_xlim()[1] * 1.0, value, round(value,round_value), color=color, ha='center', va='center',
+                    bbox=bbox_props_centerline if color == 'black' else bbox_props)
+    
+    # Specify spine visibility 
+    for ax in axs:
+        ax.spines[['top','right']].set_visible(False)
+        ax.spines[['left','bottom']].set_alpha(0.5)
+    
+    # Specify axis labels and title for x-chart
+    axs[0].set_ylabel('Individual Values (X)', fontsize=12)
+    axs[0].set_title(xchart_title, fontsize=14)
+    tick_positions = np.arange(0, len(labels), tickinterval)
+    axs[0].set_xticks(tick_positions)
+    axs[0].set_xticklabels(labels.iloc[tick_positions], rotation=rotate_labels, ha='center')
+    
+    # Specify axis labels and title for mR-chart
+    axs[1].set_ylabel('Moving Range (mR)', fontsize=12)
+    axs[1].set_title(mrchart_title, fontsize=14)
+    axs[1].set_xticks([])
+    
+    # Record the render time before the plot is shown (plt.show() blocks on interactive backends)
+    _record_render('pbc_phases', render_start)
+
+    # Optionally export the figure
+    if save_path is not None:
+        export_chart(save_path, fig, dpi=dpi, bbox_inches='tight')
+
+    # Show XmR chart figure
+    plt.show()
+    
+    # Add phases, moving ranges and types of variation to df as columns
+    df = _with_columns(df, {
+        'Phase': np.repeat(np.arange(1, num_phases + 1), lengths),
+        'Moving Ranges': moving_ranges,
+        'X-Chart Variation': np.where(xmr['X-Chart Signals'], 'Assignable Cause', 'Common Cause'),
+        'mR-Chart Variation': np.where(xmr['mR-Chart Signals'], 'Assignable Cause', 'Common Cause')
+    })
+    
+    # Create df for PBC parameters with one block of parameters per phase
+    param_names = ['Mean','UPL','LPL','PLR','AmR','URL']
+    PBC_params_df = pd.DataFrame()
+    PBC_params_df['Phase'] = np.repeat(np.arange(1, num_phases + 1), len(param_names))
+    PBC_params_df['Chart'] = np.tile(['X-Chart']*4 + ['mR-Chart']*2, num_phases)
+    PBC_params_df['PBC Params'] = np.tile(param_names, num_phases)
+    PBC_params_df['Param Values'] = np.column_stack([xmr[param] for param in param_names]).ravel().round(round_value)
+    
+    # Create dictionary of dfs
+    result_dfs = {'PBC Params':_to_format(PBC_params_df, table_format), 
+                  'XmR-Chart Dataframe':df
+                 }
+    
+    return result_dfs
+
+# Live-updating XmR chart class
+class LiveXmRChart:
+    
+    """
+    XmR chart for control-room displays that is updated in place as new values arrive.
+
+    The axes, spines and titles are drawn once. New values update the data lines, signal markers,
+    limit lines and limit labels through `set_data` and matplotlib blitting, so the cost of an update
+    depends on the number of displayed points (`window`) and not on the length of the history. The
+    limit lines and labels are only changed when their rounded values change, and the whole figure
+    is only redrawn when the y-axis has to be rescaled. Backends without blitting support fall back
+    to `draw_idle`.
+
+    The limits are calculated from running sums of all values received (or fixed by `limits`), so
+    they are the same as those of `pbc` on the complete history.
+
+    Parameters:
+    -----------
+    values : array-like, optional
+        Initial values. Default is None.
+    limits : dict, optional
+        Frozen limits with 'Mean', 'UPL', 'LPL', 'AmR' and 'URL' (e.g. from `SeriesStore.limits` or a
+        `LimitsRegistry` lookup). Default is None (calculate the limits from the values received).
+    window : int, optional
+        Number of most recent values displayed, default is 500.
+    xchart_title : str, optional
+        Title for the X-chart plot, default is ''.
+    mrchart_title : str, optional
+        Title for the mR-chart plot, default is ''.
+    fig_size : tuple, optional
+        Figure size in inches (width, height), default is (15, 6).
+    round_value : int, optional
+        Number of decimal places of the limit labels, default is 2.
+    dpi : int, optional
+        Dots per inch (resolution) of the figure, default is 100.
+
+    Attributes:
+    -----------
+    fig : matplotlib.figure.Figure
+        The chart figure.
+    limits : dict
+        The current 'Mean', 'UPL', 'LPL', 'PLR', 'AmR' and 'URL'.
+    report : dict
+        Cumulative counts of 'Updates', 'Limit Redraws' and 'Full Redraws'.
+
+    Example:
+    --------
+    >>> live = LiveXmRChart(history_df['Values'], window=300)
+    >>> live.update(new_readings)
+    {'Points': 5, 'X-Chart Signals': 0, 'mR-Chart Signals': 1, 'Limits Changed': False, 'Full Redraw': False}
+    """
+    
+    def __init__(self, values=None, limits=None, window=500, xchart_title='', mrchart_title='', fig_size=(15,6),
+                 round_value=2, dpi=100):
+        
+        self.window = window
+        self.round_value = round_value
+        self.report = {'Updates': 0, 'Limit Redraws': 0, 'Full Redraws': 0}
+        self._frozen_limits = limits
+        
+        # Running sums of the complete history and the displayed window
+        self._count = 0
+        self._sum = 0.0
+        self._mr_count = 0
+        self._mr_sum = 0.0
+        self._last = np.nan
+        self._values = np.full(window, np.nan)
+        self._moving_ranges = np.full(window, np.nan)
+        self.limits = self._calculate_limits()
+        
+        # Draw the static parts of the chart once
+        self.fig, self.axs = plt.subplots(nrows=2, ncols=1, figsize=fig_size, dpi=dpi)
+        self.fig.subplots_adjust(hspace=0.3)
+        self._blit = self.fig.canvas.supports_blit
+        positions = np.arange(window)
+        bbox_props = dict(boxstyle="round,pad=0.3", fc="white", ec="red", lw=1)
+        bbox_props_centerline = dict(boxstyle="round,pad=0.3", fc="white", ec="black", lw=1)
+        self._lines = {}
+        self._labels = {}
+        for ax, params in [(self.axs[0], [('UPL','red'), ('LPL','red'), ('Mean','black')]),
+                           (self.axs[1], [('URL','red'), ('AmR','black')])]:
+            for param, color in params:
+                self._lines[param] = ax.axhline(np.nan, ls='--', c=color, animated=self._blit)
+                self._labels[param] = ax.text(window - 0.5, np.nan, '', color=color, ha='center', va='center',
+                                              bbox=bbox_props_centerline if color == 'black' else bbox_props,
+                                              animated=self._blit)
+        self._x_line, = self.axs[0].plot(positions, self._values, marker='o', animated=self._blit)
+        self._mr_line, = self.axs[1].plot(positions, self._moving_ranges, marker='o', animated=self._blit)
+        self._x_signals, = self.axs[0].plot(positions, self._values, marker='o', ls='none', color='tab:red',
+                                            markeredgecolor='black', markersize=9, animated=self._blit)
+        self._mr_signals, = self.axs[1].plot(positions, self._moving_ranges, marker='o', ls='none', color='tab:red',
+                                             markeredgecolor='black', markersize=9, animated=self._blit)
+        self._displayed_limits = {}
+        
+        # Specify spine visibility, axis labels and titles
+        for ax in self.axs:
+            ax.spines[['top','right']].set_visible(False)
+            ax.spines[['left','bottom']].set_alpha(0.5)
+            ax.set_xlim(-0.5, window - 0.5)
+            ax.set_xticks([])
+        self.axs[0].set_ylabel('Individual Values (X)', fontsize=12)
+        self.axs[0].set_title(xchart_title, fontsize=14)
+        self.axs[1].set_ylabel('Moving Range (mR)', fontsize=12)
+        self.axs[1].set_title(mrchart_title, fontsize=14)
+        self._background = None
+        
+        plt.show(block=False)
+        if values is not None:
+            self.update(values)
+    
+    def _calculate_limits(self):
+        
+        # Constants for control limits
+        C1 = 2.660
+        C2 = 3.268
+        
+        if self._frozen_limits is not None:
+            limits = {param: float(self._frozen_limits[param]) for param in ['Mean','UPL','LPL','AmR','URL']}
+            limits['PLR'] = limits['UPL'] - limits['LPL']
+            return limits
+        mean = self._sum / self._count if self._count else np.nan
+        AmR = self._mr_sum / self._mr_count if self._mr_count else np.nan
+        UPL = mean + (C1*AmR)
+        LPL = mean - (C1*AmR)
+        PLR = UPL - LPL
+        LPL = max(LPL,0) if not np.isnan(LPL) else LPL
+        
+        return {'Mean': mean, 'UPL': UPL, 'LPL': LPL, 'PLR': PLR, 'AmR': AmR, 'URL': C2*AmR}
+    
+    def _rescale(self):
+        
+        # Return True if a y-axis has to be rescaled to fit the limits and the displayed values
+        rescaled = False
+        for ax, series, params in [(self.axs[0], self._values, ['UPL','LPL','Mean']),
+                                   (self.axs[1], self._moving_ranges, ['URL','AmR'])]:
+            extremes = np.concatenate((series, [self.limits[param] for param in params]))
+            if np.isnan(extremes).all():
+                continue
+            low, high = np.nanmin(extremes), np.nanmax(extremes)
+            bottom, top = ax.get_ylim()
+            if low < bottom or high > top or (top - bottom) > 4 * max(high - low, 1e-12):
+                margin = 0.1 * max(high - low, 1e-12)
+                ax.set_ylim(low - margin, high + margin)
+                rescaled = True
+        
+        return rescaled
+    
+    def update(self, values):
+        
+        """
+        Append new values, update the limits and signal markers, and refresh the display.
+
+        Parameters:
+        -----------
+        values : array-like
+            New values in time order.
+
+        Returns:
+        --------
+        dict
+            'Points': number of new values, 'X-Chart Signals' and 'mR-Chart Signals': number of new values
+            outside the limits, 'Limits Changed': whether the displayed limits changed, and 'Full Redraw':
+            whether the figure was redrawn completely.
+        """
+        
+        values = np.asarray(values, dtype=float).ravel()
+        
+        # Update the running sums, bridging the last value and the first new value
+        moving_ranges = np.abs(np.diff(np.concatenate(([self._last], values))))
+        self._count += int(np.sum(~np.isnan(values)))
+        self._sum += float(np.nansum(values))
+        self._mr_count += int(np.sum(~np.isnan(moving_ranges)))
+        self._mr_sum += float(np.nansum(moving_ranges))
+        if len(values):
+            self._last = values[-1]
+        self.limits = self._calculate_limits()
+        UPL, LPL, URL = self.limits['UPL'], self.limits['LPL'], self.limits['URL']
+        
+        # Count the signals of all new values, including those that scroll out of the window at once
+        with np.errstate(invalid='ignore'):
+            num_x_signals = int(np.sum((values > UPL) | (values < LPL)))
+            num_mr_signals = int(np.sum(moving_ranges > URL))
+        
+        # Scroll the displayed window
+        self._values = np.concatenate((self._values, values[-self.window:]))[-self.window:]
+        self._moving_ranges = np.concatenate((self._moving_ranges, moving_ranges[-self.window:]))[-self.window:]
+        with np.errstate(invalid='ignore'):
+            x_signals = (self._values > UPL) | (self._values < LPL)
+            mr_signals = self._moving_ranges > URL
+        self._x_line.set_ydata(self._values)
+        self._mr_line.set_ydata(self._moving_ranges)
+        self._x_signals.set_ydata(np.where(x_signals, self._values, np.nan))
+        self._mr_signals.set_ydata(np.where(mr_signals, self._moving_ranges, np.nan))
+        
+        # Move the limit lines and labels only when their rounded values change
+        rounded = {param: round(value, self.round_value) for param, value in self.limits.items()}
+        limits_changed = any(param not in self._displayed_limits
+                             or not np.isclose(rounded[param], self._displayed_limits[param], rtol=0, atol=0, equal_nan=True)
+                             for param in self._lines)
+        if limits_changed:
+            for param in self._lines:
+                self._lines[param].set_ydata([self.limits[param]] * 2)
+                self._labels[param].set_y(self.limits[param])
+                self._labels[param].set_text(rounded[param])
+            self._displayed_limits = rounded
+            self.report['Limit Redraws'] += 1
+        
+        # Redraw the whole figure only when an axis is rescaled, otherwise blit the changed artists
+        full_redraw = self._rescale() or self._background is None or not self._blit
+        if self._blit:
+            if full_redraw:
+                self.fig.canvas.draw()
+                self._background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+            else:
+                self.fig.canvas.restore_region(self._background)
+            for artist in [self._x_line, self._mr_line, self._x_signals, self._mr_signals,
+                           *self._lines.values(), *self._labels.values()]:
+                artist.axes.draw_artist(artist)
+            self.fig.canvas.blit(self.fig.bbox)
+            self.fig.canvas.flush_events()
+        else:
+            self.fig.canvas.draw_idle()
+        if full_redraw:
+            self.report['Full Redraws'] += 1
+        self.report['Updates'] += 1
+        
+        result = {'Points': len(values),
+                  'X-Chart Signals': num_x_signals,
+                  'mR-Chart Signals': num_mr_signals,
+                  'Limits Changed': limits_changed,
+                  'Full Redraw': full_redraw}
+        
+        return result
+
+# Subgroup statistics function
+def subgroup_statistics(values, subgroup_size=5, dispersion='Range'):
+    
+    """
+    Calculate Average and Range (or Standard Deviation) chart statistics for subgrouped data.
+
+    The values are reshaped into an (n_subgroups x subgroup_size) array and the subgroup averages,
+    dispersions and limits are calculated in one vectorized step using the A2/D3/D4
+    (or A3/B3/B4) scaling factors.
+
+    Parameters:
+    -----------
+    values : array-like
+        Individual values in time order. Consecutive runs of `subgroup_size` values form a subgroup.
+        Trailing values that do not fill a complete subgroup are ignored.
+    subgroup_size : int, optional
+        Number of values per subgroup (2 to 25). Default is 5.
+    dispersion : str, optional
+        'Range' for an Average and Range chart or 'Std Dev' for an Average and Standard Deviation chart.
+        Default is 'Range'.
+
+    Returns:
+    --------
+    dict
+        - 'Averages', 'Dispersions': The average and range (or standard deviation) of every subgroup.
+        - 'Grand Average', 'UPL', 'LPL', 'PLR': Average chart parameters. The LPL is floored at zero as in `pbc`.
+        - 'Average Dispersion', 'URL', 'LRL': Range (or Standard Deviation) chart parameters.
+        - 'Average Signals', 'Dispersion Signals': Boolean arrays, True for subgroups outside the limits.
+
+    Example:
+    --------
+    >>> result = subgroup_statistics(df['Values'], subgroup_size=5)
+    >>> result['Averages'][result['Average Signals']]
+    """
+    
+    # Bias correction factors d2 and d3 for subgroup sizes 2 to 25
+    d2 = [1.128, 1.693, 2.059, 2.326, 2.534, 2.704, 2.847, 2.970, 3.078, 3.173, 3.258, 3.336,
+          3.407, 3.472, 3.532, 3.588, 3.640, 3.689, 3.735, 3.778, 3.819, 3.858, 3.895, 3.931]
+    d3 = [0.853, 0.888, 0.880, 0.864, 0.848, 0.833, 0.820, 0.808, 0.797, 0.787, 0.778, 0.770,
+          0.763, 0.756, 0.750, 0.744, 0.739, 0.733, 0.729, 0.724, 0.720, 0.716, 0.712, 0.708]
+    
+    if not 2 <= subgroup_size <= 25:
+        raise ValueError("Subgroup size must be between 2 and 25.")
+    if dispersion not in ('Range', 'Std Dev'):
+        raise ValueError("Dispersion must be 'Range' or 'Std Dev'.")
+    
+    # Reshape the values into subgroups
+    values = np.asarray(values, dtype=float).ravel()
+    num_subgroups = len(values) // subgroup_size
+    if num_subgroups * subgroup_size != len(values):
+        warnings.warn(f"Ignoring {len(values) - num_subgroups * subgroup_size} trailing value(s) "
+                      f"that do not fill a subgroup of {subgroup_size}.", stacklevel=2)
+    subgroups = values[:num_subgroups * subgroup_size].reshape(num_subgroups, subgroup_size)
+    
+    # Calculate subgroup averages and dispersions
+    averages = subgroups.mean(axis=1)
+    if dispersion == 'Range':
+        dispersions = subgroups.max(axis=1) - subgroups.min(axis=1)
+        # Calculate the scaling factors A2, D3 and D4
+        n = subgroup_size
+        A = 3 / (d2[n - 2] * np.sqrt(n))
+        D_lower = max(0.0, 1 - 3 * d3[n - 2] / d2[n - 2])
+        D_upper = 1 + 3 * d3[n - 2] / d2[n - 2]
+    else:
+        dispersions = subgroups.std(axis=1, ddof=1)
+        # Calculate the scaling factors A3, B3 and B4
+        n = subgroup_size
+        c4 = np.sqrt(2 / (n - 1)) * np.exp(math.lgamma(n / 2) - math.lgamma((n - 1) / 2))
+        A = 3 / (c4 * np.sqrt(n))
+        D_lower = max(0.0, 1 - 3 * np.sqrt(1 - c4**2) / c4)
+        D_upper = 1 + 3 * np.sqrt(1 - c4**2) / c4
+    
+    # Calculate the limits
+    grand_average = averages.mean()
+    average_dispersion = dispersions.mean()
+    UPL = grand_average + A * average_dispersion
+    LPL = grand_average - A * average_dispersion
+    PLR = UPL - LPL
+    LPL = max(LPL, 0)
+    URL = D_upper * average_dispersion
+    LRL = D_lower * average_dispersion
+    
+    result = {'Averages': averages, 'Dispersions': dispersions,
+              'Grand Average': grand_average, 'UPL': UPL, 'LPL': LPL, 'PLR': PLR,
+              'Average Dispersion': average_dispersion, 'URL': URL, 'LRL': LRL,
+              'Average Signals': (averages > UPL) | (averages < LPL),
+              'Dispersion Signals': (dispersions > URL) | (dispersions < LRL)
+             }
+    
+    return result
+
+# Average and Range chart function
+def xbarchart(df, values, x_labels, subgroup_size=5, dispersion='Range', xchart_title='', rchart_title='',
+              fig_size=(15,6), round_value=2, rotate_labels=0, tickinterval=2, dpi=300, payload='Off'):
+    
+    """
+    Generate an Average and Range chart (or Average and Standard Deviation chart) from the provided DataFrame.
+
+    Consecutive runs of `subgroup_size` values form a subgroup. One point is plotted per subgroup,
+    reducing the number of plotted points by a factor of `subgroup_size` compared with `pbc`.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame, pyarrow.Table or polars.DataFrame
+        Input DataFrame containing the data.
+    values : str
+        Column name in `df` representing the individual values.
+    x_labels : str
+        Column name in `df` for the x-axis labels. Each subgroup is labelled with the label of its first value.
+    subgroup_size : int, optional
+        Number of values per subgroup (2 to 25), default is 5.
+    dispersion : str, optional
+        'Range' or 'Std Dev', default is 'Range'.
+    xchart_title : str, optional
+        Title for the Average chart, default is ''.
+    rchart_title : str, optional
+        Title for the Range (or Standard Deviation) chart, default is ''.
+    fig_size : tuple, optional
+        Figure size in inches (width, height), default is (15, 6).
+    round_value : int, optional
+        Number of decimal places to round calculations, default is 2.
+    rotate_labels : int, optional
+        Specify the rotation for xlabels.
+    tickinterval : int, optional
+        Specify the distance between x-ticks (in subgroups), default is 2.
+    dpi : int, optional
+        Dots per inch (resolution) of the figure, default is 300.
+
+    payload : str, optional
+        If 'JSON', 'msgpack' or 'Dict', skip matplotlib and return the data needed to draw the chart on
+        the client (decimated series, signal positions, limit lines and ticks) instead of the results.
+        Default is 'Off'.
+    Returns:
+    --------
+    dict
+        A dictionary containing DataFrames with calculated parameters and causes:
+        - 'PBC Params': DataFrame with 'Grand Average', 'UPL', 'LPL' and 'PLR' for the Average chart and
+          'Average Range' (or 'Average Std Dev'), 'URL' and 'LRL' for the Range (or Standard Deviation) chart.
+        - 'Subgroup Dataframe': DataFrame with one row per subgroup containing the label, 'Average',
+          'Range' (or 'Std Dev'), 'Average Chart Variation' and 'Range Chart Variation' (or 'Std Dev Chart Variation').
+
+    Example:
+    --------
+    xbarchart(df, 'Values', 'Timestamp', subgroup_size=5)
+    """
+    
+    # Calculate the subgroup statistics and limits
+    table_format = _table_format(df)
+    stats = subgroup_statistics(_column(df, values), subgroup_size, dispersion)
+    averages = stats['Averages']
+    dispersions = stats['Dispersions']
+    grand_average, UPL, LPL, PLR = stats['Grand Average'], stats['UPL'], stats['LPL'], stats['PLR']
+    average_dispersion, URL, LRL = stats['Average Dispersion'], stats['URL'], stats['LRL']
+    labels = _series(df, x_labels).iloc[:len(averages) * subgroup_size:subgroup_size].reset_index(drop=True)
+    
+    # Create masking parameters for subgroups outside the limits
+    average_signals = np.ma.masked_where(~stats['Average Signals'], averages)
+    dispersion_signals = np.ma.masked_where(~stats['Dispersion Signals'], dispersions)
+    
+    # Create list of tuples that specify value and color for the centerlines and limits
+    xchart_lines = [(grand_average,'black'), (UPL,'red'), (LPL,'red')]
+    rchart_lines = [(average_dispersion,'black'), (URL,'red')]
+    if LRL > 0:
+        rchart_lines.append((LRL,'red'))
+    
+    # Return the data to draw instead of the figure
+    payload_format = _payload_format(payload)
+    if payload_format is not None:
+        line_names = [['Grand Average', 'UPL', 'LPL'], [f'Average {dispersion}', 'URL', 'LRL']]
+        panels = [
+            _payload_panel(xchart_title, [_payload_series('Average', averages)], signals=stats['Average Signals'],
+                           lines=[(name, value, color) for name, (value, color) in zip(line_names[0], xchart_lines)],
+                           y_label='Subgroup Averages', values=averages),
+            _payload_panel(rchart_title, [_payload_series(dispersion, dispersions)], signals=stats['Dispersion Signals'],
+                           lines=[(name, value, color) for name, (value, color) in zip(line_names[1], rchart_lines)],
+                           y_label='Subgroup Ranges' if dispersion == 'Range' else 'Subgroup Std Devs', values=dispersions)
+        ]
+        params = {'Grand Average': grand_average, 'UPL': UPL, 'LPL': LPL, 'PLR': PLR,
+                  f'Average {dispersion}': average_dispersion, 'URL': URL, 'LRL': LRL}
+        return _chart_payload('xbarchart', xchart_title, panels, params,
+                              _payload_ticks(labels, np.arange(0, len(labels), tickinterval)), payload_format)
+    
+    # Generate the Average and Range chart
+    render_start = time.perf_counter()
+    fig, axs = plt.subplots(nrows=2, ncols=1, figsize=fig_size, dpi=dpi)
+    fig.subplots_adjust(hspace=0.3)
+    positions = np.arange(len(averages))
+    
+    # Plot data for both charts
+    axs[0].plot(positions, averages, marker='o')
+    axs[1].plot(positions, dispersions, marker='o')
+    
+    # Add masking parameters to color subgroups outside the limits
+    axs[0].plot(positions, average_signals, marker='o', ls='none', color='tab:red',
+            markeredgecolor='black', markersize=9)
+    axs[1].plot(positions, dispersion_signals, marker='o', ls='none', color='tab:red',
+            markeredgecolor='black', markersize=9)
+    
+    # Add text labels for limits and centerline
+    bbox_props = dict(boxstyle="round,pad=0.3", fc="white", ec="red", lw=1)
+    bbox_props_centerline = dict(boxstyle="round,pad=0.3", fc="white", ec="black", lw=1)
+    for ax, lines in [(axs[0], xchart_lines), (axs[1], rchart_lines)]:
+        for value, color in lines:
+            ax.axhline(value, ls='--', c=color)
+            ax.text(ax.get_xlim()[1] * 1.0, value, round(value,round_value), color=color, ha='center', va='center',
+                    bbox=bbox_props_centerline if color == 'black' else bbox_props)
+    
+    # Specify spine visibility 
+    for ax in axs:
+        ax.spines[['top','right']].set_visible(False)
+        ax.spines[['left','bottom']].set_alpha(0.5)
+    
+    # Specify axis labels and title for Average chart
+    axs[0].set_ylabel('Subgroup Averages', fontsize=12)
+    axs[0].set_title(xchart_title, fontsize=14)
+    tick_positions = np.arange(0, len(labels), tickinterval)
+    axs[0].set_xticks(tick_positions)
+    axs[0].set_xticklabels(labels.iloc[tick_positions], rotation=rotate_labels, ha='center')
+    
+    # Specify axis labels and title for Range chart
+    axs[1].set_ylabel('Subgroup Ranges' if dispersion == 'Range' else 'Subgroup Std Devs', fontsize=12)
+    axs[1].set_title(rchart_title, fontsize=14)
+    axs[1].set_xticks([])
+    
+    # Record the render time before the plot is shown (plt.show() blocks on interactive backends)
+    _record_render('xbarchart', render_start)
+
+    # Show chart figure
+    plt.show()
+    
+    # Create subgroup dataframe
+    subgroup_df = pd.DataFrame({x_labels: labels, 'Average': averages, dispersion: dispersions})
+    subgroup_df['Average Chart Variation'] = np.where(stats['Average Signals'], 'Assignable Cause', 'Common Cause')
+    subgroup_df[f'{dispersion} Chart Variation'] = np.where(stats['Dispersion Signals'], 'Assignable Cause', 'Common Cause')
+    
+    # Create list of PBC paramters
+    chart_type = ['Average Chart']*4
+    chart_type.extend([f'{dispersion} Chart'] * 3)
+    param_names = ['Grand Average','UPL','LPL','PLR',f'Average {dispersion}','URL','LRL']
+    param_values = [round(x,round_value) for x in [grand_average,UPL,LPL,PLR,average_dispersion,URL,LRL]] 
+    # Create df for PBC parameters
+    PBC_params_df = pd.DataFrame()
+    PBC_params_df['Chart'] = pd.Series(chart_type)
+    PBC_params_df['PBC Params'] = pd.Series(param_names)
+    PBC_params_df['Param Values'] = pd.Series(param_values)
+    
+    # Create dictionary of dfs
+    result_dfs = {'PBC Params':_to_format(PBC_params_df, table_format), 
+                  'Subgroup Dataframe':_to_format(subgroup_df, table_format)
+                 }
+    
+    return result_dfs
+
+# Helper functions for EWMA and CUSUM charts
+def _xmr_center_and_sigma(matrix, center=None, sigma=None):
+
+    """
+    Return the mean and XmR sigma (AmR / 1.128) of every column of `matrix` unless given.
+    """
+
+    # Define the bias correction constant for sigma
+    d2 = 1.128
+
+    num_values, num_streams = matrix.shape
+    offsets = np.arange(num_streams + 1, dtype=np.int64) * num_values
+    stats = _xmr_segment_stats(matrix.ravel(order='F'), offsets)
+    center = stats['Mean'] if center is None else np.broadcast_to(np.asarray(center, dtype=float), (num_streams,))
+    sigma = stats['AmR'] / d2 if sigma is None else np.broadcast_to(np.asarray(sigma, dtype=float), (num_streams,))
+
+    return center, sigma
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def _ewma_filter_compiled(matrix, lam, start):
+        result = np.empty_like(matrix)
+        previous = start.copy()
+        for i in range(matrix.shape[0]):
+            for j in range(matrix.shape[1]):
+                previous[j] = lam * matrix[i, j] + (1 - lam) * previous[j]
+                result[i, j] = previous[j]
+        return result
+
+def _ewma_filter(matrix, lam, start):
+
+    """
+    Apply the EWMA recursion z[t] = lam * x[t] + (1 - lam) * z[t-1] down every column of `matrix`.
+
+    Uses the compiled recursion when numba is installed. Otherwise the recursion is evaluated as a
+    linear filter in blocks: within a block every value is a scaled cumulative sum, and the block
+    length is chosen so the scaling factors stay well inside floating point range.
+    """
+
+    if numba is not None:
+        return _ewma_filter_compiled(np.ascontiguousarray(matrix), lam, np.array(start, dtype=float))
+
+    decay = 1 - lam
+    if decay == 0:
+        return matrix.copy()
+
+    # Largest block for which decay ** -block_size stays below 1e12
+    block_size = max(1, int(np.log(1e12) / -np.log(decay)))
+    steps = np.arange(block_size, dtype=float)[:, np.newaxis]
+    growth = decay ** -steps
+    shrink = decay ** steps
+
+    result = np.empty_like(matrix)
+    previous = np.array(start, dtype=float)
+    for block_start in range(0, matrix.shape[0], block_size):
+        block = matrix[block_start:block_start + block_size]
+        size = len(block)
+        weighted = np.cumsum(block * growth[:size], axis=0)
+        result[block_start:block_start + size] = shrink[:size] * (decay * previous + lam * weighted)
+        previous = result[block_start + size - 1]
+
+    return result
+
+# EWMA statistics function
+def ewma_statistics(values, lam=0.2, L=3.0, center=None, sigma=None):
+    
+    """
+    Calculate an EWMA (exponentially weighted moving average) chart for one or many streams.
+
+    The EWMA chart detects small sustained shifts that do not produce points outside the limits
+    of an X-chart. Sigma is estimated from the average moving range (AmR / 1.128) as on the XmR
+    chart, and the recursion is evaluated as a vectorized linear filter (or a compiled recursion
+    when numba is installed).
+
+    Parameters:
+    -----------
+    values : array-like
+        Individual values. A 2D array is treated as one stream per column.
+    lam : float, optional
+        Weight given to the most recent value (0 < lam <= 1). Default is 0.2.
+    L : float, optional
+        Width of the limits in multiples of the EWMA standard deviation. Default is 3.0.
+    center : float or array-like, optional
+        Centerline of each stream. Default is None (the mean of each stream).
+    sigma : float or array-like, optional
+        Sigma of each stream. Default is None (AmR / 1.128 of each stream).
+
+    Returns:
+    --------
+    dict
+        - 'Mean', 'Sigma': The centerline and sigma of each stream.
+        - 'EWMA': The EWMA statistic of every value.
+        - 'UCL', 'LCL': The time-varying upper and lower control limits of every value.
+        - 'Signals': Boolean array, True where the EWMA statistic is outside the limits.
+
+    Example:
+    --------
+    >>> result = ewma_statistics(df['Values'], lam=0.1)
+    >>> np.flatnonzero(result['Signals'])
+    """
+    
+    compute_start = time.perf_counter()
+    
+    if not 0 < lam <= 1:
+        raise ValueError("lam must be in the interval (0, 1].")
+    
+    values = np.asarray(values, dtype=float)
+    matrix = values.reshape(len(values), -1)
+    center, sigma = _xmr_center_and_sigma(matrix, center, sigma)
+    
+    # Calculate the EWMA statistic
+    ewma = _ewma_filter(matrix, lam, center)
+    
+    # Calculate the time-varying control limits
+    steps = np.arange(1, len(matrix) + 1, dtype=float)[:, np.newaxis]
+    width = L * sigma * np.sqrt(lam / (2 - lam) * (1 - (1 - lam) ** (2 * steps)))
+    UCL = center + width
+    LCL = center - width
+    
+    result = {'Mean': center, 'Sigma': sigma, 'EWMA': ewma, 'UCL': UCL, 'LCL': LCL,
+              'Signals': (ewma > UCL) | (ewma < LCL)}
+    
+    # Record the work done when metrics are enabled
+    if _metrics.enabled:
+        _metrics.increment('improvement_series_processed_total', matrix.shape[1], function='ewma_statistics')
+        _metrics.increment('improvement_points_processed_total', matrix.size, function='ewma_statistics')
+        _metrics.increment('improvement_signals_total', int(result['Signals'].sum()), rule='ewma')
+        _metrics.observe('improvement_compute_seconds', time.perf_counter() - compute_start, function='ewma_statistics')
+    
+    # Return 1D arrays for a single stream
+    if values.ndim == 1:
+        result = {key: value[..., 0] if np.ndim(value) == 2 else value[0] for key, value in result.items()}
+    
+    return result
+
+# CUSUM statistics function
+def cusum_statistics(values, k=0.5, h=5.0, center=None, sigma=None):
+    
+    """
+    Calculate a tabular CUSUM (cumulative sum) chart for one or many streams.
+
+    The upper and lower cumulative sums C+[t] = max(0, C+[t-1] + x[t] - (mean + k*sigma)) and
+    C-[t] = max(0, C-[t-1] + (mean - k*sigma) - x[t]) are evaluated without a Python loop as a
+    cumulative sum minus its running minimum. Sigma is estimated from the average moving range
+    (AmR / 1.128) as on the XmR chart.
+
+    Parameters:
+    -----------
+    values : array-like
+        Individual values. A 2D array is treated as one stream per column.
+    k : float, optional
+        Reference value (allowance) in multiples of sigma. Default is 0.5.
+    h : float, optional
+        Decision interval in multiples of sigma. Default is 5.0.
+    center : float or array-like, optional
+        Centerline of each stream. Default is None (the mean of each stream).
+    sigma : float or array-like, optional
+        Sigma of each stream. Default is None (AmR / 1.128 of each stream).
+
+    Returns:
+    --------
+    dict
+        - 'Mean', 'Sigma': The centerline and sigma of each stream.
+        - 'K', 'H': The reference value and decision interval of each stream in the units of the data.
+        - 'CUSUM+', 'CUSUM-': The upper and lower cumulative sums of every value.
+        - 'Signals': Boolean array, True where either cumulative sum is above the decision interval.
+
+    Example:
+    --------
+    >>> result = cusum_statistics(df['Values'], k=0.5, h=4)
+    >>> np.flatnonzero(result['Signals'])
+    """
+    
+    compute_start = time.perf_counter()
+    
+    values = np.asarray(values, dtype=float)
+    matrix = values.reshape(len(values), -1)
+    center, sigma = _xmr_center_and_sigma(matrix, center, sigma)
+    K = k * sigma
+    H = h * sigma
+    
+    # Calculate the cumulative sums with a reset at zero
+    def tabular_cusum(increments):
+        total = np.cumsum(increments, axis=0)
+        return total - np.minimum.accumulate(np.minimum(total, 0), axis=0)
+    
+    upper = tabular_cusum(matrix - (center + K))
+    lower = tabular_cusum((center - K) - matrix)
+    
+    result = {'Mean': center, 'Sigma': sigma, 'K': K, 'H': H, 'CUSUM+': upper, 'CUSUM-': lower,
+              'Signals': (upper > H) | (lower > H)}
+    
+    # Record the work done when metrics are enabled
+    if _metrics.enabled:
+        _metrics.increment('improvement_series_processed_total', matrix.shape[1], function='cusum_statistics')
+        _metrics.increment('improvement_points_processed_total', matrix.size, function='cusum_statistics')
+        _metrics.increment('improvement_signals_total', int(result['Signals'].sum()), rule='cusum')
+        _metrics.observe('improvement_compute_seconds', time.perf_counter() - compute_start, function='cusum_statistics')
+    
+    # Return 1D arrays for a single stream
+    if values.ndim == 1:
+        result = {key: value[..., 0] if np.ndim(value) == 2 else value[0] for key, value in result.items()}
+    
+    return result
+
+# Create EWMA chart function
+def ewmachart(df, values, x_labels, lam=0.2, L=3.0, title='EWMA Chart', y_label='EWMA', x_label='',
+              fig_size=(15,3), tickinterval=5, round_value=2, dpi=300, rotate_labels=0, payload='Off'):
+    
+    """
+    Generate an EWMA chart from the provided DataFrame.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame, pyarrow.Table or polars.DataFrame
+        Input DataFrame containing the data.
+    values : str
+        Column name in `df` representing the individual values.
+    x_labels : str
+        Column name in `df` for the x-axis labels.
+    lam : float, optional
+        Weight given to the most recent value, default is 0.2.
+    L : float, optional
+        Width of the limits in multiples of the EWMA standard deviation, default is 3.0.
+    title : str, optional
+        Title for the plot, default is 'EWMA Chart'.
+    y_label : str, optional
+        Label for the y-axis, default is 'EWMA'.
+    x_label : str, optional
+        Label for the x-axis, default is an empty string.
+    fig_size : tuple, optional
+        Figure size in inches (width, height), default is (15, 3).
+    tickinterval : int, optional
+        Specify the distance between x-ticks, default is 5.
+    round_value : int, optional
+        Number of decimal places to round calculations, default is 2.
+    dpi : int, optional
+        Dots per inch (resolution) of the figure, default is 300.
+    rotate_labels : int, optional
+        Specify the rotation for the xlabels.
+
+    payload : str, optional
+        If 'JSON', 'msgpack' or 'Dict', skip matplotlib and return the data needed to draw the chart on
+        the client (decimated series, signal positions, limit lines and ticks) instead of the results.
+        Default is 'Off'.
+    Returns:
+    --------
+    dict
+        A dictionary containing DataFrames with calculated parameters and causes:
+        - 'PBC Params': DataFrame with 'Mean', 'Sigma' (AmR / 1.128), 'Lambda', 'L' and the asymptotic 'UCL' and 'LCL'.
+        - 'EWMA Chart Dataframe': DataFrame with added columns 'EWMA', 'EWMA UCL', 'EWMA LCL' and
+          'EWMA Chart Variation' categorizing causes as 'Common Cause' or 'Assignable Cause'.
+
+    Example:
+    --------
+    ewmachart(df, 'Values', 'Observation', lam=0.1)
+    """
+    
+    # Disaggregate the dataframe 
+    table_format = _table_format(df)
+    labels = _series(df, x_labels)
+    
+    # Calculate the EWMA statistic and limits
+    ewma = ewma_statistics(_column(df, values), lam=lam, L=L)
+    mean = ewma['Mean']
+    sigma = ewma['Sigma']
+    width = L * sigma * np.sqrt(lam / (2 - lam))
+    
+    # Return the data to draw instead of the figure
+    payload_format = _payload_format(payload)
+    if payload_format is not None:
+        series = [_payload_series('EWMA', ewma['EWMA']), _payload_series('UCL', ewma['UCL'], color='red'),
+                  _payload_series('LCL', ewma['LCL'], color='red')]
+        panel = _payload_panel(title, series, signals=ewma['Signals'], lines=[('Mean', mean, 'black')],
+                               y_label=y_label, values=ewma['EWMA'])
+        params = {'Mean': mean, 'Sigma': sigma, 'Lambda': lam, 'L': L, 'UCL': mean + width, 'LCL': mean - width}
+        return _chart_payload('ewmachart', title, [panel], params,
+                              _payload_ticks(labels, np.arange(0, len(labels), tickinterval)), payload_format)
+    
+    # Create masking parameters for EWMA values outside the limits
+    signals = np.ma.masked_where(~ewma['Signals'], ewma['EWMA'])
+    
+    # Generate the EWMA chart
+    render_start = time.perf_counter()
+    fig, ax = plt.subplots(figsize=fig_size, dpi=dpi)
+    positions = np.arange(len(labels))
+    ax.plot(positions, ewma['EWMA'], marker='o')
+    ax.plot(positions, signals, marker='o', ls='none', color='tab:red', markeredgecolor='black', markersize=9)
+    
+    # Add centerline and time-varying limits 
+    ax.axhline(mean, ls='--', c='black')
+    ax.plot(positions, ewma['UCL'], ls='--', c='red', drawstyle='steps-mid')
+    ax.plot(positions, ewma['LCL'], ls='--', c='red', drawstyle='steps-mid')
+    
+    # Add text labels for limits and centerline
+    bbox_props = dict(boxstyle="round,pad=0.3", fc="white", ec="red", lw=1)
+    bbox_props_centerline = dict(boxstyle="round,pad=0.3", fc="white", ec="black", lw=1)
+    ax.text(ax.get_xlim()[1] * 1.0, ewma['UCL'][-1], round(ewma['UCL'][-1],round_value), color='red', ha='center', va='center', bbox=bbox_props)
+    ax.text(ax.get_xlim()[1] * 1.0, ewma['LCL'][-1], round(ewma['LCL'][-1],round_value), color='red', ha='center', va='center', bbox=bbox_props)
+    ax.text(ax.get_xlim()[1] * 1.0, mean, round(mean,round_value), color='black', ha='center', va='center', bbox=bbox_props_centerline)
+    
+    # Specify spine visibility 
+    ax.spines[['top','right']].set_visible(False)
+    ax.spines[['left','bottom']].set_alpha(0.5)
+    
+    # Set the x-tick labels with increased intervals
+    tick_positions = np.arange(0, len(labels), tickinterval)
+    ax.set_xticks(tick_positions)
+    ax.set_xticklabels(labels.iloc[tick_positions], rotation=rotate_labels, ha='center')
+    
+    # Specify axis labels and title
+    plt.xlabel(x_label,fontsize=12)
+    plt.ylabel(y_label, fontsize=12)
+    plt.title(title, fontsize=14)
+    
+    # Record the render time before the plot is shown (plt.show() blocks on interactive backends)
+    _record_render('ewmachart', render_start)
+
+    # Show plot
+    plt.show()
+    
+    # Add EWMA columns and types of variation to df
+    df = _with_columns(df, {
+        'EWMA': ewma['EWMA'],
+        'EWMA UCL': ewma['UCL'],
+        'EWMA LCL': ewma['LCL'],
+        'EWMA Chart Variation': np.where(ewma['Signals'], 'Assignable Cause', 'Common Cause')
+    })
+    
+    # Create list of EWMA chart parameters
+    param_names = ['Mean','Sigma','Lambda','L','UCL','LCL']
+    chart_type = ['EWMA Chart']*len(param_names)
+    param_values = [round(x,round_value) for x in [mean,sigma,lam,L,mean + width,mean - width]]
+    # Create df for EWMA chart parameters
+    PBC_params_df = pd.DataFrame()
+    PBC_params_df['Chart'] = pd.Series(chart_type)
+    PBC_params_df['PBC Params'] = pd.Series(param_names)
+    PBC_params_df['Param Values'] = pd.Series(param_values)
+    
+    # Create dictionary of dfs
+    result_dfs = {'PBC Params':_to_format(PBC_params_df, table_format), 
+                  'EWMA Chart Dataframe':df
+                 }
+    
+    return result_dfs
+
+# Create CUSUM chart function
+def cusumchart(df, values, x_labels, k=0.5, h=5.0, title='CUSUM Chart', y_label='Cumulative Sum', x_label='',
+               fig_size=(15,3), tickinterval=5, round_value=2, dpi=300, rotate_labels=0, payload='Off'):
+    
+    """
+    Generate a tabular CUSUM chart from the provided DataFrame.
+
+    The upper cumulative sum (C+) is plotted above zero and the lower cumulative sum (C-) below
+    zero. Values are assignable causes when either sum exceeds the decision interval H.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame, pyarrow.Table or polars.DataFrame
+        Input DataFrame containing the data.
+    values : str
+        Column name in `df` representing the individual values.
+    x_labels : str
+        Column name in `df` for the x-axis labels.
+    k : float, optional
+        Reference value in multiples of sigma, default is 0.5.
+    h : float, optional
+        Decision interval in multiples of sigma, default is 5.0.
+    title : str, optional
+        Title for the plot, default is 'CUSUM Chart'.
+    y_label : str, optional
+        Label for the y-axis, default is 'Cumulative Sum'.
+    x_label : str, optional
+        Label for the x-axis, default is an empty string.
+    fig_size : tuple, optional
+        Figure size in inches (width, height), default is (15, 3).
+    tickinterval : int, optional
+        Specify the distance between x-ticks, default is 5.
+    round_value : int, optional
+        Number of decimal places to round calculations, default is 2.
+    dpi : int, optional
+        Dots per inch (resolution) of the figure, default is 300.
+    rotate_labels : int, optional
+        Specify the rotation for the xlabels.
+
+    payload : str, optional
+        If 'JSON', 'msgpack' or 'Dict', skip matplotlib and return the data needed to draw the chart on
+        the client (decimated series, signal positions, limit lines and ticks) instead of the results.
+        Default is 'Off'.
+    Returns:
+    --------
+    dict
+        A dictionary containing DataFrames with calculated parameters and causes:
+        - 'PBC Params': DataFrame with 'Mean', 'Sigma' (AmR / 1.128), 'K' and 'H'.
+        - 'CUSUM Chart Dataframe': DataFrame with added columns 'CUSUM+', 'CUSUM-' and
+          'CUSUM Chart Variation' categorizing causes as 'Common Cause' or 'Assignable Cause'.
+
+    Example:
+    --------
+    cusumchart(df, 'Values', 'Observation', k=0.5, h=4)
+    """
+    
+    # Disaggregate the dataframe 
+    table_format = _table_format(df)
+    labels = _series(df, x_labels)
+    
+    # Calculate the cumulative sums
+    cusum = cusum_statistics(_column(df, values), k=k, h=h)
+    H = cusum['H']
+    
+    # Return the data to draw instead of the figure
+    payload_format = _payload_format(payload)
+    if payload_format is not None:
+        series = [_payload_series('CUSUM+', cusum['CUSUM+']), _payload_series('CUSUM-', -cusum['CUSUM-'])]
+        panel = _payload_panel(title, series, signals=cusum['Signals'],
+                               lines=[('Center', 0, 'black'), ('H', H, 'red'), ('-H', -H, 'red')], y_label=y_label,
+                               values=np.where(cusum['CUSUM+'] > H, cusum['CUSUM+'], -cusum['CUSUM-']))
+        params = {'Mean': cusum['Mean'], 'Sigma': cusum['Sigma'], 'K': cusum['K'], 'H': H}
+        return _chart_payload('cusumchart', title, [panel], params,
+                              _payload_ticks(labels, np.arange(0, len(labels), tickinterval)), payload_format)
+    
+    # Create masking parameters for sums above the decision interval
+    upper_signals = np.ma.masked_where(cusum['CUSUM+'] <= H, cusum['CUSUM+'])
+    lower_signals = np.ma.masked_where(cusum['CUSUM-'] <= H, -cusum['CUSUM-'])
+    
+    # Generate the CUSUM chart
+    render_start = time.perf_counter()
+    fig, ax = plt.subplots(figsize=fig_size, dpi=dpi)
+    positions = np.arange(len(labels))
+    ax.plot(positions, cusum['CUSUM+'], marker='o', color='tab:blue')
+    ax.plot(positions, -cusum['CUSUM-'], marker='o', color='tab:blue')
+    ax.plot(positions, upper_signals, marker='o', ls='none', color='tab:red', markeredgecolor='black', markersize=9)
+    ax.plot(positions, lower_signals, marker='o', ls='none', color='tab:red', markeredgecolor='black', markersize=9)
+    
+    # Add centerline and decision intervals 
+    for value, color in [(0,'black'), (H,'red'), (-H,'red')]:
+        ax.axhline(value, ls='--', c=color)
+    
+    # Add text labels for decision intervals
+    bbox_props = dict(boxstyle="round,pad=0.3", fc="white", ec="red", lw=1)
+    ax.text(ax.get_xlim()[1] * 1.0, H, round(H,round_value), color='red', ha='center', va='center', bbox=bbox_props)
+    ax.text(ax.get_xlim()[1] * 1.0, -H, round(-H,round_value), color='red', ha='center', va='center', bbox=bbox_props)
+    
+    # Specify spine visibility 
+    ax.spines[['top','right']].set_visible(False)
+    ax.spines[['left','bottom']].set_alpha(0.5)
+    
+    # Set the x-tick labels with increased intervals
+    tick_positions = np.arange(0, len(labels), tickinterval)
+    ax.set_xticks(tick_positions)
+    ax.set_xticklabels(labels.iloc[tick_positions], rotation=rotate_labels, ha='center')
+    
+    # Specify axis labels and title
+    plt.xlabel(x_label,fontsize=12)
+    plt.ylabel(y_label, fontsize=12)
+    plt.title(title, fontsize=14)
+    
+    # Record the render time before the plot is shown (plt.show() blocks on interactive backends)
+    _record_render('cusumchart', render_start)
+
+    # Show plot
+    plt.show()
+    
+    # Add CUSUM columns and types of variation to df
+    df = _with_columns(df, {
+        'CUSUM+': cusum['CUSUM+'],
+        'CUSUM-': cusum['CUSUM-'],
+        'CUSUM Chart Variation': np.where(cusum['Signals'], 'Assignable Cause', 'Common Cause')
+    })
+    
+    # Create list of CUSUM chart parameters
+    param_names = ['Mean','Sigma','K','H']
+    chart_type = ['CUSUM Chart']*len(param_names)
+    param_values = [round(x,round_value) for x in [cusum['Mean'],cusum['Sigma'],cusum['K'],H]]
+    # Create df for CUSUM chart parameters
+    PBC_params_df = pd.DataFrame()
+    PBC_params_df['Chart'] = pd.Series(chart_type)
+    PBC_params_df['PBC Params'] = pd.Series(param_names)
+    PBC_params_df['Param Values'] = pd.Series(param_values)
+    
+    # Create dictionary of dfs
+    result_dfs = {'PBC Params':_to_format(PBC_params_df, table_format), 
+                  'CUSUM Chart Dataframe':df
+                 }
+    
+    return result_dfs
+
+def _network_stats(df_list, condition, return_stats=False, missing='skip', max_gap=1):
+
+    """
+    Calculate the network analysis statistics of every DataFrame in `df_list` in a single pass.
+
+    Missing values are skipped by the mean and the characterization, and moving ranges that span
+    them follow the `missing` / `max_gap` policy of `xmr_signals`.
+
+    Returns:
+    --------
+    pandas.DataFrame
+        One row per DataFrame with 'Mean', 'AmR', 'UPL', 'LPL', 'URL', 'PLR', 'Characterization'
+        (all values within the process limits) and 'mR Characterization' (all moving ranges below the URL).
+    dict
+        Only if `return_stats` is True. The output of `_xmr_segment_stats` plus the concatenated
+        'Values' and their 'Offsets'.
+    """
+
+    compute_start = time.perf_counter()
+
+    # Constants for control limits
+    C1 = 2.660
+    C2 = 3.268
+
+    # Calculate statistics over the concatenated values of all dataframes
+    values, offsets = _concatenate_segments([_column(df, condition) for df in df_list])
+    stats = _xmr_segment_stats(values, offsets, _max_gap(missing, max_gap))
+    mean = stats['Mean']
+    AmR = stats['AmR']
+
+    # Create parameters dataframe
+    parameters_df = pd.DataFrame({
+        'Mean': mean,
+        'AmR': AmR,
+        'UPL': np.maximum(mean + C1 * AmR, 0),
+        'LPL': np.maximum(mean - C1 * AmR, 0),
+        'URL': C2 * AmR
+    })
+    parameters_df['PLR'] = parameters_df['UPL'] - parameters_df['LPL']
+
+    # Determine characterization from the valid values (the minimum and maximum skip missing values)
+    within_limits = (stats['Min'] >= parameters_df['LPL']) & (stats['Max'] <= parameters_df['UPL'])
+    predictable = (stats['Count'] == 0) | within_limits
+    parameters_df['Characterization'] = np.where(predictable, 'Predictable', 'Unpredictable')
+    max_mR = _segment_reduce(np.fmax, stats['Moving Ranges'], offsets, empty_value=np.nan)
+    mr_predictable = (stats['mR Count'] == 0) | (max_mR < parameters_df['URL'])
+    parameters_df['mR Characterization'] = np.where(mr_predictable, 'Predictable', 'Unpredictable')
+
+    # Record the work done when metrics are enabled
+    if _metrics.enabled:
+        _metrics.increment('improvement_series_processed_total', len(df_list), function='network_analysis')
+        _metrics.increment('improvement_points_processed_total', len(values), function='network_analysis')
+        _metrics.observe('improvement_compute_seconds', time.perf_counter() - compute_start, function='network_analysis')
+
+    if return_stats:
+        stats['Values'] = values
+        stats['Offsets'] = offsets
+        return parameters_df, stats
+
+    return parameters_df
+
+def _draw_network_panel(ax, data, mean, UPL, LPL, label, linestyle, color, xticks):
+
+    """
+    Draw the X-chart panel of a single DataFrame in a network analysis figure.
+    """
+
+    # Plot data
+    ax.plot(data, marker='o', ls=linestyle, color=color)
+
+    # Masking and plotting limits
+    ax.plot(np.ma.masked_where(data < UPL, data), marker='o', ls='none', color='red', markeredgecolor='black', markersize=9)
+    ax.plot(np.ma.masked_where(data > LPL, data), marker='o', ls='none', color='red', markeredgecolor='black', markersize=9)
+    
+    # Highlight points where the data is zero in red
+    zero_indices = (data == 0)
+    ax.plot(np.where(zero_indices)[0], data[zero_indices], marker='o', ls='none', color='red', markeredgecolor='black', markersize=9)
+
+    # Plotting lines for mean, UPL, and LPL
+    ax.axhline(mean, ls='--', color='black')
+    ax.axhline(UPL, ls='--', color='red')
+    ax.axhline(LPL, ls='--', color='red')
+    
+    # Styling axes
+    ax.grid(False)
+    ax.set_title(label, fontsize=12)
+    for spine in ['top', 'right', 'bottom']:
+        ax.spines[spine].set_visible(False)
+    ax.spines['left'].set_alpha(0.5)
+    ax.tick_params(axis='both', which='both', length=0)
+    
+    if not xticks:
+        ax.set_xticks([])
+
+def _network_payload_panels(df_list, condition, parameters_df, lines, upper, lower, color, x_labels=None, tickinterval=5):
+
+    """
+    Return one payload panel per DataFrame with the values outside the `upper` and `lower` columns of
+    `parameters_df` as signals and the given (column, color) lines.
+    """
+
+    panels = []
+    for idx, df in enumerate(df_list):
+        data = _column(df, condition)
+        row = parameters_df.iloc[idx]
+        panel = _payload_panel(str(row['Labels']), [_payload_series(condition, data, color=color[idx % len(color)])],
+                               signals=(data > row[upper]) | (data < row[lower]),
+                               lines=[(name, row[name], line_color) for name, line_color in lines], values=data)
+        if x_labels is not None:
+            panel['ticks'] = _payload_ticks(_series(df, x_labels), np.arange(0, len(data), tickinterval))
+        panels.append(panel)
+
+    return panels
+
+def _mr_payload_panels(parameters_df, moving_ranges, offsets, color):
+
+    """
+    Return one mR-chart payload panel per dataset from the concatenated moving ranges.
+    """
+
+    panels = []
+    for idx, (start, end) in enumerate(zip(offsets[:-1], offsets[1:])):
+        mRs = moving_ranges[start:end]
+        row = parameters_df.iloc[idx]
+        panels.append(_payload_panel(str(row['Labels']), [_payload_series('Moving Ranges', mRs, color=color[idx % len(color)])],
+                                     signals=mRs > row['URL'], lines=[('AmR', row['AmR'], 'black'), ('URL', row['URL'], 'red')],
+                                     y_label='Moving Ranges (mR)', values=mRs))
+
+    return panels
+
+# Improved network analysis function
+def network_analysis(df_list, condition, label_list, title='Network Analysis', rows=1, 
+                     cols=2, linestyle='-', xticks=False, hide_last='Off', color=None,
+                     round_value=3, figsize=(15,10), dpi=300, payload='Off', save_path=None,
+                     missing='skip', max_gap=1):
+    
+    """
+    Perform network analysis on a list of DataFrames, plotting control charts and returning statistical summaries.
+
+    Parameters:
+    -----------
+    df_list : list of pandas.DataFrame, pyarrow.Table or polars.DataFrame
+        List of DataFrames containing the data to be analyzed.
+    condition : str
+        Column name in the DataFrames to be used for analysis.
+    label_list : list of str
+        List of labels corresponding to each DataFrame for plot titles.
+    title : str, optional (default='Network Analysis')
+        Title for the overall figure.
     rows : int, optional (default=1)
         Number of rows in the subplot grid.
     cols : int, optional (default=2)
@@ -828,6 +3703,18 @@ def network_analysis(df_list, condition, label_list, title='Network Analysis', r
     dpi : int, optional (default=300)
         Dots per inch for the figure resolution.
 
+    payload : str, optional (default='Off')
+        If 'JSON', 'msgpack' or 'Dict', skip matplotlib and return the data needed to draw the panels on
+        the client (decimated series, signal positions and limit lines) instead of the results.
+    save_path : str, optional (default=None)
+        If given, also save the figure to this file with `export_chart`, which rasterizes dense data
+        layers of PDF/SVG exports while limits and text stay vector.
+    missing : str, optional (default='skip')
+        Policy for moving ranges that span missing values (see `xmr_signals`): 'skip' leaves them
+        missing, 'bridge' takes them across gaps of up to `max_gap` missing values. Missing values
+        never make a site unpredictable; only the valid values are compared with the limits.
+    max_gap : int, optional (default=1)
+        Longest run of missing values bridged with `missing='bridge'`.
     Returns:
     --------
     results_df : pandas.DataFrame
@@ -865,83 +3752,47 @@ def network_analysis(df_list, condition, label_list, title='Network Analysis', r
         color = (color * (len(df_list) // len(color) + 1))[:len(df_list)]
     
     # Validate inputs
-    if not all(condition in df.columns for df in df_list):
+    if not all(condition in _column_names(df) for df in df_list):
         raise ValueError("Condition must be a column in all dataframes.")
     if len(label_list) != len(df_list):
         raise ValueError("Label list must have the same length as the dataframe list.")
     
-    # Constants for control limits
-    C1 = 2.660
-    C2 = 3.268
-    
-    # Calculate statistics
-    stats = [
-        (
-            df[condition].mean(),
-            abs(df[condition].diff()).mean(),
-            max(df[condition].mean() + C1 * abs(df[condition].diff()).mean(),0),
-            max(df[condition].mean() - C1 * abs(df[condition].diff()).mean(),0),
-            C2 * abs(df[condition].diff()).mean()
-        )
-        for df in df_list
-    ]
-    
-    # Create results dataframe
-    parameters_df = pd.DataFrame(stats, columns=['Mean', 'AmR', 'UPL', 'LPL', 'URL'])
+    # Calculate statistics and characterization
+    parameters_df = _network_stats(df_list, condition, missing=missing, max_gap=max_gap)
     parameters_df['Labels'] = label_list
-    parameters_df['PLR'] = parameters_df['UPL'] - parameters_df['LPL']
-    parameters_df['data'] = [df[condition] for df in df_list]
-    parameters_df['mR'] = [df[condition].diff() for df in df_list]
     
-    # Determine characterization
-    parameters_df['Characterization'] = parameters_df.apply(
-        lambda row: 'Predictable' if all(row['LPL'] <= x <= row['UPL'] for x in row['data']) else 'Unpredictable',
-        axis=1
-    )
+    # Return the data to draw instead of the figure
+    payload_format = _payload_format(payload)
+    if payload_format is not None:
+        panels = _network_payload_panels(df_list, condition, parameters_df,
+                                         [('Mean', 'black'), ('UPL', 'red'), ('LPL', 'red')], 'UPL', 'LPL', color)
+        params = {column: parameters_df[column] for column in ['Labels', 'Mean', 'UPL', 'LPL', 'PLR', 'AmR', 'URL', 'Characterization']}
+        return _chart_payload('network_analysis', title, panels, params, payload_format=payload_format)
     
     # Plotting
+    render_start = time.perf_counter()
     fig, axes = plt.subplots(nrows=rows, ncols=cols, figsize=figsize, sharey=True, dpi=dpi)
     plt.subplots_adjust(wspace=0)
     plt.suptitle(title, fontsize=14, y=1.05)
 
     axes = axes.flatten() if isinstance(axes, np.ndarray) else [axes]
 
-    for idx, (data, UPL, LPL, label, ax) in enumerate(zip(
-            parameters_df['data'], parameters_df['UPL'], parameters_df['LPL'], parameters_df['Labels'], axes)):
-        
-        # Plot data
-        ax.plot(data, marker='o', ls=linestyle, color=color[idx % len(color)])
-
-        # Masking and plotting limits
-        ax.plot(np.ma.masked_where(data < UPL, data), marker='o', ls='none', color='red', markeredgecolor='black', markersize=9)
-        ax.plot(np.ma.masked_where(data > LPL, data), marker='o', ls='none', color='red', markeredgecolor='black', markersize=9)
-#         ax.plot(np.ma.masked_where(data == 0, data), marker='o', ls='none', color='red', markeredgecolor='black', markersize=9)
-        
-        # Highlight points where the data is zero in red
-        zero_indices = (data == 0)
-        ax.plot(np.where(zero_indices)[0], data[zero_indices], marker='o', ls='none', color='red', markeredgecolor='black', markersize=9)
-    
-        # Plotting lines for mean, UPL, and LPL
-        mean = np.mean(data)
-        ax.axhline(mean, ls='--', color='black')
-        ax.axhline(UPL, ls='--', color='red')
-        ax.axhline(LPL, ls='--', color='red')
-        
-        # Styling axes
-        ax.grid(False)
-        ax.set_title(label, fontsize=12)
-        for spine in ['top', 'right', 'bottom']:
-            ax.spines[spine].set_visible(False)
-        ax.spines['left'].set_alpha(0.5)
-        ax.tick_params(axis='both', which='both', length=0)
+    for idx, (df, mean, UPL, LPL, label, ax) in enumerate(zip(
+            df_list, parameters_df['Mean'], parameters_df['UPL'], parameters_df['LPL'], parameters_df['Labels'], axes)):
         
-        if not xticks:
-            ax.set_xticks([])
+        _draw_network_panel(ax, _series(df, condition), mean, UPL, LPL, label, linestyle, color[idx % len(color)], xticks)
 
     # Hide the last subplot by removing its axis
     if hide_last.lower() == 'on':
         axes[-1].axis('off')
     
+    # Record the render time before the plot is shown (plt.show() blocks on interactive backends)
+    _record_render('network_analysis', render_start)
+
+    # Optionally export the figure
+    if save_path is not None:
+        export_chart(save_path, fig, dpi=dpi, bbox_inches='tight')
+
     # Show figure 
     plt.show()
     
@@ -949,19 +3800,332 @@ def network_analysis(df_list, condition, label_list, title='Network Analysis', r
     new_order = ['Labels', 'Mean', 'UPL', 'LPL', 'PLR', 'AmR', 'URL', 'Characterization']
     results_df = parameters_df[new_order]
     
-    return results_df
+    return _to_format(results_df, _table_format(df_list[0]))
+
+# Incremental network analysis class
+class NetworkAnalysis:
+    
+    """
+    Stateful network analysis that recomputes and redraws only the sites that receive new data.
+
+    The object keeps running summaries (counts, sums, moving range sums, minimum and maximum)
+    for each site together with its rendered panel. Appending data to a site updates its
+    summary in time proportional to the new values only, and only the affected rows of the
+    results table and the affected subplots are recomputed and redrawn.
+
+    Parameters:
+    -----------
+    df_list : list of pandas.DataFrame, pyarrow.Table or polars.DataFrame
+        List of DataFrames containing the initial data of each site.
+    condition : str
+        Column name in the DataFrames to be used for analysis.
+    label_list : list of str
+        List of labels corresponding to each DataFrame for plot titles. Labels identify sites in `update`.
+    title : str, optional (default='Network Analysis')
+        Title for the overall figure.
+    rows : int, optional (default=1)
+        Number of rows in the subplot grid.
+    cols : int, optional (default=2)
+        Number of columns in the subplot grid.
+    linestyle : str, optional (default='-')
+        Line style for the data plots.
+    xticks : bool, optional (default=False)
+        Whether to display x-axis ticks.
+    hide_last : str, optional (default='Off')
+        Whether to hide the last subplot. Options are 'On' or 'Off'.
+    color : list of str, optional
+        List of colors for the data plots. If not provided, defaults to ['tab:blue'].
+    figsize : tuple, optional (default=(15, 10))
+        Size of the overall figure.
+    dpi : int, optional (default=300)
+        Dots per inch for the figure resolution.
+    missing : str, optional (default='skip')
+        Policy for moving ranges that span missing values, also across appended batches (see `xmr_signals`).
+    max_gap : int, optional (default=1)
+        Longest run of missing values bridged with `missing='bridge'`.
+
+    Attributes:
+    -----------
+    fig : matplotlib.figure.Figure or None
+        The network analysis figure, created on the first call to `render`.
+    report : dict
+        Cumulative counts of 'Rows Recomputed', 'Rows Reused', 'Panels Redrawn' and 'Panels Reused'.
+
+    Example:
+    --------
+    >>> network = NetworkAnalysis(df_list, 'Values', label_list, rows=3, cols=5)
+    >>> network.render()
+    >>> network.update({'Site 7': new_readings_df})
+    {'Recomputed': ['Site 7'], 'Points': 60}
+    >>> network.render()
+    {'Redrawn': ['Site 7']}
+    >>> network.results()
+    """
+    
+    _summary_keys = ['Count', 'Missing', 'Sum', 'Min', 'Max', 'mR Count', 'mR Sum']
+    
+    def __init__(self, df_list, condition, label_list, title='Network Analysis', rows=1, cols=2,
+                 linestyle='-', xticks=False, hide_last='Off', color=None, figsize=(15,10), dpi=300,
+                 missing='skip', max_gap=1):
+        
+        if color is None:
+            color = ['tab:blue']
+        
+        # Validate inputs
+        if not all(condition in _column_names(df) for df in df_list):
+            raise ValueError("Condition must be a column in all dataframes.")
+        if len(label_list) != len(df_list):
+            raise ValueError("Label list must have the same length as the dataframe list.")
+        if len(set(label_list)) != len(label_list):
+            raise ValueError("Labels must be unique.")
+        
+        self.condition = condition
+        self.labels = list(label_list)
+        self.title = title
+        self.rows = rows
+        self.cols = cols
+        self.linestyle = linestyle
+        self.xticks = xticks
+        self.hide_last = hide_last
+        self.color = color
+        self.figsize = figsize
+        self.dpi = dpi
+        self.max_gap = _max_gap(missing, max_gap)
+        self.fig = None
+        self.axes = None
+        self.report = {'Rows Recomputed': 0, 'Rows Reused': 0, 'Panels Redrawn': 0, 'Panels Reused': 0}
+        self._table_format = _table_format(df_list[0]) if df_list else 'pandas'
+        
+        # Store the values of each site as a list of chunks, joined only when a panel is drawn
+        self._positions = {label: idx for idx, label in enumerate(self.labels)}
+        data_list = [_column(df, condition) for df in df_list]
+        self._chunks = [[data] for data in data_list]
+        
+        # Calculate the running summaries of all sites in a single pass
+        values, offsets = _concatenate_segments(data_list)
+        stats = _xmr_segment_stats(values, offsets, self.max_gap)
+        self._summary = {key: stats[key].astype(float) for key in self._summary_keys}
+        _, _, self._summary['Last'], self._summary['Trailing'] = self._valid_ends(data_list)
+        
+        self._results = pd.DataFrame({'Labels': self.labels})
+        self._recompute(np.arange(len(self.labels)))
+        self._stale_panels = set(range(len(self.labels)))
+    
+    @staticmethod
+    def _valid_ends(data_list):
+        
+        # First and last valid value of each array with the number of missing values before and after them
+        first = np.full(len(data_list), np.nan)
+        last = np.full(len(data_list), np.nan)
+        leading = np.zeros(len(data_list))
+        trailing = np.zeros(len(data_list))
+        for position, data in enumerate(data_list):
+            valid = np.flatnonzero(~np.isnan(data))
+            if len(valid):
+                first[position], last[position] = data[valid[0]], data[valid[-1]]
+                leading[position], trailing[position] = valid[0], len(data) - 1 - valid[-1]
+            else:
+                leading[position] = trailing[position] = len(data)
+        
+        return first, leading, last, trailing
+    
+    def _site_data(self, position):
+        
+        # Join the chunks of a site into a single array and keep it for later renders
+        chunks = self._chunks[position]
+        if len(chunks) > 1:
+            chunks[:] = [np.concatenate(chunks)]
+        
+        return chunks[0]
+    
+    def _recompute(self, positions):
+        
+        # Constants for control limits
+        C1 = 2.660
+        C2 = 3.268
+        
+        summary = {key: array[positions] for key, array in self._summary.items()}
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = summary['Sum'] / summary['Count']
+            AmR = summary['mR Sum'] / summary['mR Count']
+        UPL = np.maximum(mean + C1 * AmR, 0)
+        LPL = np.maximum(mean - C1 * AmR, 0)
+        
+        # Determine characterization from the valid values
+        within_limits = (summary['Min'] >= LPL) & (summary['Max'] <= UPL)
+        predictable = (summary['Count'] == 0) | within_limits
+        
+        # Update only the affected rows of the results
+        rows = self._results.index[positions]
+        self._results.loc[rows, 'Mean'] = mean
+        self._results.loc[rows, 'UPL'] = UPL
+        self._results.loc[rows, 'LPL'] = LPL
+        self._results.loc[rows, 'PLR'] = UPL - LPL
+        self._results.loc[rows, 'AmR'] = AmR
+        self._results.loc[rows, 'URL'] = C2 * AmR
+        self._results.loc[rows, 'Characterization'] = np.where(predictable, 'Predictable', 'Unpredictable')
+        
+        self.report['Rows Recomputed'] += len(positions)
+    
+    def update(self, updates, mode='append'):
+        
+        """
+        Append or replace the data of one or more sites and recompute only their statistics.
+
+        Parameters:
+        -----------
+        updates : dict
+            Dictionary mapping site labels to DataFrames (or arrays) with the new values.
+        mode : str, optional (default='append')
+            'append' to add the new values to the end of each site's data, 'replace' to replace it.
+
+        Returns:
+        --------
+        dict
+            'Recomputed': labels of the sites whose statistics were recomputed.
+            'Points': number of new values processed.
+        """
+        
+        if mode not in ('append', 'replace'):
+            raise ValueError("Mode must be 'append' or 'replace'.")
+        unknown = [label for label in updates if label not in self._positions]
+        if unknown:
+            raise ValueError(f"Unknown site label(s): {unknown}")
+        
+        labels = list(updates)
+        positions = np.array([self._positions[label] for label in labels], dtype=np.int64)
+        new_data = [_column(updates[label], self.condition) if _is_table(updates[label]) else updates[label]
+                    for label in labels]
+        new_data = [np.asarray(data, dtype=float).ravel() for data in new_data]
+        
+        # Summarise the new values of all updated sites in a single pass
+        values, offsets = _concatenate_segments(new_data)
+        stats = _xmr_segment_stats(values, offsets, self.max_gap)
+        first, leading, last, trailing = self._valid_ends(new_data)
+        has_valid = ~np.isnan(last)
+        summary = self._summary
+        
+        if mode == 'append':
+            # Add the moving range between the old and new values when the gap between them may be bridged
+            bridge = np.abs(first - summary['Last'][positions])
+            has_bridge = ~np.isnan(bridge) & (summary['Trailing'][positions] + leading <= self.max_gap)
+            for key in ['Count', 'Missing', 'Sum', 'mR Count', 'mR Sum']:
+                summary[key][positions] += stats[key]
+            summary['Min'][positions] = np.fmin(summary['Min'][positions], stats['Min'])
+            summary['Max'][positions] = np.fmax(summary['Max'][positions], stats['Max'])
+            summary['mR Count'][positions] += has_bridge
+            summary['mR Sum'][positions] += np.where(has_bridge, bridge, 0.0)
+            summary['Trailing'][positions] = np.where(has_valid, trailing, summary['Trailing'][positions] + trailing)
+            summary['Last'][positions] = np.where(has_valid, last, summary['Last'][positions])
+            for position, data in zip(positions, new_data):
+                self._chunks[position].append(data)
+        else:
+            for key in self._summary_keys:
+                summary[key][positions] = stats[key]
+            summary['Last'][positions] = last
+            summary['Trailing'][positions] = trailing
+            for position, data in zip(positions, new_data):
+                self._chunks[position] = [data]
+        
+        # Recompute only the affected rows and mark their panels as stale
+        self._recompute(positions)
+        self.report['Rows Reused'] += len(self.labels) - len(positions)
+        self._stale_panels.update(positions.tolist())
+        _metrics.increment('improvement_cache_requests_total', len(self.labels) - len(positions), cache='network_rows', result='hit')
+        _metrics.increment('improvement_cache_requests_total', len(positions), cache='network_rows', result='miss')
+        
+        return {'Recomputed': labels, 'Points': len(values)}
+    
+    def results(self):
+        
+        """
+        Return the results table in the same format as `network_analysis`.
+
+        Returns:
+        --------
+        results_df : pandas.DataFrame
+            DataFrame containing the calculated statistics and predictability characterization for each site.
+        """
+        
+        new_order = ['Labels', 'Mean', 'UPL', 'LPL', 'PLR', 'AmR', 'URL', 'Characterization']
+        results_df = self._results[new_order].copy()
+        
+        return _to_format(results_df, self._table_format)
+    
+    def render(self, payload='Off'):
+        
+        """
+        Draw the network analysis figure, redrawing only the panels of sites that changed.
+
+        Parameters:
+        -----------
+        payload : str, optional (default='Off')
+            If 'JSON', 'msgpack' or 'Dict', skip matplotlib and return the data needed to draw the panels
+            of the sites that changed on the client (decimated series, signal positions and limit lines).
+
+        Returns:
+        --------
+        dict
+            'Redrawn': labels of the sites whose panels were redrawn. In payload mode the payload is returned.
+        """
+        
+        # Return the data to draw the changed panels instead of the figure
+        payload_format = _payload_format(payload)
+        if payload_format is not None:
+            positions = sorted(self._stale_panels)
+            results_df = self._results.iloc[positions]
+            panels = _network_payload_panels([{self.condition: self._site_data(position)} for position in positions],
+                                             self.condition, results_df, [('Mean', 'black'), ('UPL', 'red'), ('LPL', 'red')],
+                                             'UPL', 'LPL', [self.color[position % len(self.color)] for position in positions])
+            params = {column: results_df[column] for column in ['Labels', 'Mean', 'UPL', 'LPL', 'PLR', 'AmR', 'URL', 'Characterization']}
+            self._stale_panels.clear()
+            self.report['Panels Redrawn'] += len(positions)
+            self.report['Panels Reused'] += len(self.labels) - len(positions)
+            return _chart_payload('network_analysis', self.title, panels, params, payload_format=payload_format)
+        
+        # Create the figure on first use
+        render_start = time.perf_counter()
+        if self.fig is None:
+            self.fig, axes = plt.subplots(nrows=self.rows, ncols=self.cols, figsize=self.figsize, sharey=True, dpi=self.dpi)
+            self.fig.subplots_adjust(wspace=0)
+            self.fig.suptitle(self.title, fontsize=14, y=1.05)
+            self.axes = axes.flatten() if isinstance(axes, np.ndarray) else [axes]
+        
+        redrawn = sorted(position for position in self._stale_panels if position < len(self.axes))
+        for position in redrawn:
+            ax = self.axes[position]
+            ax.cla()
+            row = self._results.iloc[position]
+            _draw_network_panel(ax, pd.Series(self._site_data(position)), row['Mean'], row['UPL'], row['LPL'],
+                                row['Labels'], self.linestyle, self.color[position % len(self.color)], self.xticks)
+        
+        # Hide the last subplot by removing its axis
+        if self.hide_last.lower() == 'on':
+            self.axes[-1].axis('off')
+        
+        self.fig.canvas.draw_idle()
+        self._stale_panels.clear()
+        self.report['Panels Redrawn'] += len(redrawn)
+        self.report['Panels Reused'] += min(len(self.labels), len(self.axes)) - len(redrawn)
+        _metrics.increment('improvement_cache_requests_total', min(len(self.labels), len(self.axes)) - len(redrawn),
+                           cache='network_panels', result='hit')
+        _metrics.increment('improvement_cache_requests_total', len(redrawn), cache='network_panels', result='miss')
+        _record_render('NetworkAnalysis.render', render_start, self.fig)
+        
+        return {'Redrawn': [self.labels[position] for position in redrawn]}
 
 def network_analysis_limit_plot(df_list, condition, label_list, USL, LSL, Target,
                         title='Network Analysis', rows=1, cols=2, 
                         linestyle='-', xticks=False, hide_last='Off', color=None,
-                        round_value=3, figsize=(15,10), dpi=300):
+                        round_value=3, figsize=(15,10), dpi=300, payload='Off', save_path=None,
+                        missing='skip', max_gap=1):
     
     """
     Perform limit plot network analysis on a list of DataFrames, plotting control charts and returning statistical summaries.
 
     Parameters:
     -----------
-    df_list : list of pandas.DataFrame
+    df_list : list of pandas.DataFrame, pyarrow.Table or polars.DataFrame
         List of DataFrames containing the data to be analyzed.
     condition : str
         Column name in the DataFrames to be used for analysis.
@@ -992,6 +4156,18 @@ def network_analysis_limit_plot(df_list, condition, label_list, USL, LSL, Target
     dpi : int, optional (default=300)
         Dots per inch for the figure resolution.
 
+    payload : str, optional (default='Off')
+        If 'JSON', 'msgpack' or 'Dict', skip matplotlib and return the data needed to draw the panels on
+        the client (decimated series, signal positions and limit lines) instead of the results.
+    save_path : str, optional (default=None)
+        If given, also save the figure to this file with `export_chart`, which rasterizes dense data
+        layers of PDF/SVG exports while limits and text stay vector.
+    missing : str, optional (default='skip')
+        Policy for moving ranges that span missing values (see `xmr_signals`): 'skip' leaves them
+        missing, 'bridge' takes them across gaps of up to `max_gap` missing values. Missing values
+        never make a site unpredictable; only the valid values are compared with the limits.
+    max_gap : int, optional (default=1)
+        Longest run of missing values bridged with `missing='bridge'`.
     Returns:
     --------
     results_df : pandas.DataFrame
@@ -1029,33 +4205,14 @@ def network_analysis_limit_plot(df_list, condition, label_list, USL, LSL, Target
         color = (color * (len(df_list) // len(color) + 1))[:len(df_list)]
     
     # Validate inputs
-    if not all(condition in df.columns for df in df_list):
+    if not all(condition in _column_names(df) for df in df_list):
         raise ValueError("Condition must be a column in all dataframes.")
     if len(label_list) != len(df_list):
         raise ValueError("Label list must have the same length as the dataframe list.")
     
-    # Constants for control limits
-    C1 = 2.660
-    C2 = 3.268
-    
     # Calculate statistics
-    stats = [
-        (
-            df[condition].mean(),
-            abs(df[condition].diff()).mean(),
-            max(df[condition].mean() + C1 * abs(df[condition].diff()).mean(),0),
-            max(df[condition].mean() - C1 * abs(df[condition].diff()).mean(),0),
-            C2 * abs(df[condition].diff()).mean()
-        )
-        for df in df_list
-    ]
-    
-    # Create results dataframe
-    parameters_df = pd.DataFrame(stats, columns=['Mean', 'AmR', 'UPL', 'LPL', 'URL'])
+    parameters_df = _network_stats(df_list, condition, missing=missing, max_gap=max_gap)
     parameters_df['Labels'] = label_list
-    parameters_df['PLR'] = parameters_df['UPL'] - parameters_df['LPL']
-    parameters_df['data'] = [df[condition] for df in df_list]
-    parameters_df['mR'] = [df[condition].diff() for df in df_list]
     parameters_df['USL'] = USL
     parameters_df['LSL'] = LSL
     parameters_df['Tolerance'] = USL-LSL
@@ -1063,70 +4220,435 @@ def network_analysis_limit_plot(df_list, condition, label_list, USL, LSL, Target
     parameters_df['Centering Distance'] = parameters_df['Mean']-Target
     parameters_df['Tolerance Delta'] = parameters_df['PLR']-parameters_df['Tolerance']
     
+    # Return the data to draw instead of the figure
+    payload_format = _payload_format(payload)
+    if payload_format is not None:
+        panels = _network_payload_panels(df_list, condition, parameters_df,
+                                         [('Mean', 'black'), ('Target', 'green'), ('USL', 'gray'), ('LSL', 'gray')],
+                                         'USL', 'LSL', color)
+        params = {column: parameters_df[column] for column in ['Labels', 'Mean', 'UPL', 'LPL', 'PLR', 'Target', 'USL', 'LSL',
+                                                                'Tolerance', 'Centering Distance', 'Tolerance Delta']}
+        return _chart_payload('network_analysis_limit_plot', title, panels, params, payload_format=payload_format)
+    
     # Plotting
+    render_start = time.perf_counter()
     fig, axes = plt.subplots(nrows=rows, ncols=cols, figsize=figsize, sharey=True, dpi=dpi)
     plt.subplots_adjust(wspace=0)
     plt.suptitle(title, fontsize=14, y=1.05)
 
-    axes = axes.flatten() if isinstance(axes, np.ndarray) else [axes]
+    axes = axes.flatten() if isinstance(axes, np.ndarray) else [axes]
+
+    for idx, (df, mean, label, ax) in enumerate(zip(
+            df_list, parameters_df['Mean'], parameters_df['Labels'], axes)):
+        
+        data = _series(df, condition)
+        
+        # Plot data
+        ax.plot(data, marker='o', ls=linestyle, color=color[idx % len(color)])
+
+        # Masking and plotting limits
+        ax.plot(np.ma.masked_where(data < USL, data), marker='o', ls='none', color='red', markeredgecolor='black', markersize=9)
+        ax.plot(np.ma.masked_where(data > LSL, data), marker='o', ls='none', color='red', markeredgecolor='black', markersize=9)
+        
+        # Highlight points where the data is zero in red
+        zero_indices = (data == 0)
+        ax.plot(np.where(zero_indices)[0], data[zero_indices], marker='o', ls='none', color='red', markeredgecolor='black', markersize=9)
+    
+        # Plotting lines for mean, UPL, and LPL
+        ax.axhline(mean, ls='--', color='black')
+        ax.axhline(Target, ls='--', color='green')
+        ax.axhline(USL, ls='--', color='gray')
+        ax.axhline(LSL, ls='--', color='gray')
+        
+        # Styling axes
+        ax.grid(False)
+        ax.set_title(label, fontsize=12)
+        for spine in ['top', 'right', 'bottom']:
+            ax.spines[spine].set_visible(False)
+        ax.spines['left'].set_alpha(0.5)
+        ax.tick_params(axis='both', which='both', length=0)
+        
+        if not xticks:
+            ax.set_xticks([])
+
+    # Hide the last subplot by removing its axis
+    if hide_last.lower() == 'on':
+        axes[-1].axis('off')
+    
+    # Record the render time before the plot is shown (plt.show() blocks on interactive backends)
+    _record_render('network_analysis_limit_plot', render_start)
+
+    # Optionally export the figure
+    if save_path is not None:
+        export_chart(save_path, fig, dpi=dpi, bbox_inches='tight')
+
+    # Show figure 
+    plt.show()
+    
+    # Reorder and return the results dataframe
+    new_order = ['Labels', 'Mean', 'UPL', 'LPL', 'PLR', 'Target', 'USL', 'LSL',
+                 'Tolerance','Centering Distance','Tolerance Delta']
+    results_df = parameters_df[new_order]
+    
+    return _to_format(results_df, _table_format(df_list[0]))
+
+# Signal matrix function
+def signal_matrix(data, values=None, stream=None, time=None, include_mr='Off'):
+
+    """
+    Build a sparse time x stream matrix of the assignable cause signals of many streams.
+
+    The limits of every stream are calculated with `xmr_signals` in a single vectorized pass and
+    only the positions of the signals are kept, as coordinate (COO) arrays of time and stream
+    indices, so the matrix is never materialized densely.
+
+    Parameters:
+    -----------
+    data : numpy.ndarray, pandas.DataFrame, pyarrow.Table or polars.DataFrame
+        Either a values matrix (times x streams, NaN where a stream has no value) given as a 2D array
+        or wide table, or a long-format table when `values` and `stream` are specified.
+    values : str, optional
+        Column name in a long-format `data` containing the values.
+    stream : str, optional
+        Column name in a long-format `data` identifying the stream of each value.
+    time : str, optional
+        Column name in a long-format `data` with the time of each value. Values of different streams
+        with the same time are aligned. Default is None (the position of each value in its stream).
+    include_mr : str, optional
+        If 'On', moving ranges above the URL also count as signals. Default is 'Off' (X-chart signals only).
+
+    Returns:
+    --------
+    dict
+        - 'Times', 'Streams': Time and stream index of every signal, sorted by time.
+        - 'Time Labels', 'Stream Labels': The time and stream of each index.
+        - 'Shape': The (times, streams) shape of the matrix.
+    """
+
+    # Arrange the values as consecutive segments, one per stream, with a time index per value
+    if values is not None and stream is not None:
+        codes, stream_labels = pd.factorize(_column(data, stream, dtype=None))
+        valid = codes >= 0
+        if time is not None:
+            time_codes, time_labels = pd.factorize(_column(data, time, dtype=None), sort=True)
+            valid &= time_codes >= 0
+            rows = np.flatnonzero(valid)
+            order = rows[np.lexsort((time_codes[rows], codes[rows]))]
+        else:
+            order = np.flatnonzero(valid)[np.argsort(codes[valid], kind='stable')]
+        series = _column(data, values)[order]
+        lengths = np.bincount(codes[order], minlength=len(stream_labels))
+        offsets = np.concatenate(([0], np.cumsum(lengths)))
+        if time is not None:
+            time_index = time_codes[order]
+        else:
+            time_index = np.arange(len(series)) - np.repeat(offsets[:-1], lengths)
+            time_labels = np.arange(lengths.max() if len(lengths) else 0)
+    else:
+        if _is_table(data):
+            stream_labels = pd.Index(_column_names(data))
+            matrix = np.column_stack([_column(data, name) for name in stream_labels])
+            time_labels = data.index if _table_format(data) == 'pandas' else np.arange(len(matrix))
+        else:
+            matrix = np.asarray(data, dtype=float)
+            if matrix.ndim == 1:
+                matrix = matrix[:, np.newaxis]
+            stream_labels = pd.RangeIndex(matrix.shape[1])
+            time_labels = np.arange(len(matrix))
+        series = matrix.ravel(order='F')
+        offsets = np.arange(matrix.shape[1] + 1, dtype=np.int64) * matrix.shape[0]
+        time_index = None
+
+    # Keep only the positions of the signals
+    xmr = xmr_signals(series, offsets)
+    signals = xmr['X-Chart Signals']
+    if include_mr.lower() == 'on':
+        signals = signals | xmr['mR-Chart Signals']
+    positions = np.flatnonzero(signals)
+    streams = np.searchsorted(offsets, positions, side='right') - 1
+    times = time_index[positions] if time_index is not None else positions - offsets[streams]
+    order = np.argsort(times, kind='stable')
+
+    return {'Times': times[order], 'Streams': streams[order],
+            'Time Labels': time_labels, 'Stream Labels': pd.Index(stream_labels),
+            'Shape': (len(time_labels), len(stream_labels))}
+
+def _pair_counts(times, streams, num_streams, lag, chunk_size):
+
+    """
+    Count the pairs of signals of stream A at time t and stream B at time t + lag with a sorted self-join.
+
+    `times` must be sorted. Returns the unique pair keys (A * num_streams + B) and their counts. At lag
+    0 each unordered pair is counted once with A < B. The signals are joined in chunks that expand to at
+    most `chunk_size` pairs (or the pairs of a single signal), so memory stays bounded even when many
+    streams signal at the same time.
+    """
+
+    # Find the range of signals at time t + lag for every signal; at lag 0 only the later signals of
+    # the same time, so that every unordered pair is generated once
+    upper = np.searchsorted(times, times + lag, side='right')
+    if lag == 0:
+        lower = np.arange(1, len(times) + 1)
+    else:
+        lower = np.searchsorted(times, times + lag, side='left')
+    matches = np.maximum(upper - lower, 0)
+    ends = np.cumsum(matches)
+
+    keys = []
+    counts = []
+    start = 0
+    while start < len(times):
+        # Take the signals that expand to at most chunk_size pairs (at least one signal)
+        stop = max(int(np.searchsorted(ends, ends[start] - matches[start] + chunk_size, side='right')), start + 1)
+        left = np.arange(start, stop)
+        chunk_matches = matches[left]
+        start = stop
+
+        # Expand the ranges into pairs of signal positions
+        first = np.repeat(left, chunk_matches)
+        offsets = np.repeat(np.cumsum(chunk_matches) - chunk_matches, chunk_matches)
+        second = np.arange(len(first)) - offsets + np.repeat(lower[left], chunk_matches)
+        stream_a = streams[first]
+        stream_b = streams[second]
+        if lag == 0:
+            stream_a, stream_b = np.minimum(stream_a, stream_b), np.maximum(stream_a, stream_b)
+        else:
+            keep = stream_a != stream_b
+            stream_a, stream_b = stream_a[keep], stream_b[keep]
+        chunk_keys, chunk_counts = np.unique(stream_a * num_streams + stream_b, return_counts=True)
+        keys.append(chunk_keys)
+        counts.append(chunk_counts)
+
+    # Combine the counts of the chunks
+    keys = np.concatenate(keys) if keys else np.empty(0, dtype=np.int64)
+    counts = np.concatenate(counts) if counts else np.empty(0, dtype=np.int64)
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+
+    return unique_keys, np.bincount(inverse, weights=counts, minlength=len(unique_keys)).astype(np.int64)
+
+# Co-signal analysis function
+def cosignal_analysis(data, values=None, stream=None, time=None, max_lag=0, min_count=1, top_n=None,
+                      include_mr='Off', chunk_size=1_000_000):
+
+    """
+    Find streams that signal at the same times, which points to common upstream causes.
+
+    The assignable cause signals of every stream are collected in a sparse time x stream matrix
+    (see `signal_matrix`). Co-occurrences are counted with a sorted self-join on the signal times
+    instead of a dense matrix product, so the cost grows with the number of signals rather than
+    with streams x times. With `max_lag`, signals of one stream that are followed by signals of
+    another stream up to `max_lag` periods later are counted as well.
+
+    Parameters:
+    -----------
+    data : numpy.ndarray, pandas.DataFrame, pyarrow.Table or polars.DataFrame
+        A values matrix (times x streams) or a long-format table, see `signal_matrix`.
+    values, stream, time : str, optional
+        Columns of a long-format `data`, see `signal_matrix`.
+    max_lag : int, optional
+        Largest lag (in periods) between the signals of the two streams, default is 0 (same time only).
+    min_count : int, optional
+        Smallest number of co-signals for a pair to be returned, default is 1.
+    top_n : int, optional
+        Number of pairs to return. Default is None (all pairs).
+    include_mr : str, optional
+        If 'On', moving ranges above the URL also count as signals. Default is 'Off'.
+    chunk_size : int, optional
+        Largest number of signal pairs expanded per chunk, to bound memory. Default is 1,000,000.
+
+    Returns:
+    --------
+    pandas.DataFrame
+        One row per stream pair and lag, ranked by 'Co-Signals', with 'Stream A', 'Stream B', 'Lag'
+        (stream B signals `Lag` periods after stream A; at lag 0 the order is arbitrary), 'Co-Signals',
+        'Signals A', 'Signals B', 'Jaccard' (co-signals over the signals of either stream) and 'Lift'
+        (co-signals over the number expected if the streams signalled independently).
+
+    Example:
+    --------
+    >>> cosignal_analysis(readings_df, values='Value', stream='Site', time='Date', max_lag=2, top_n=20)
+    """
+
+    # `time` is a column name here, so the clock is imported under another name
+    compute_start = _perf_counter()
+
+    matrix = signal_matrix(data, values, stream, time, include_mr)
+    times, streams = matrix['Times'], matrix['Streams']
+    num_times, num_streams = matrix['Shape']
+    signal_counts = np.bincount(streams, minlength=num_streams)
+
+    # Count the co-signals of every pair at every lag
+    frames = []
+    for lag in range(max_lag + 1):
+        keys, counts = _pair_counts(times, streams, num_streams, lag, chunk_size)
+        keep = counts >= min_count
+        frames.append(pd.DataFrame({'A': keys[keep] // num_streams, 'B': keys[keep] % num_streams,
+                                    'Lag': lag, 'Co-Signals': counts[keep]}))
+    pairs = pd.concat(frames, ignore_index=True)
+
+    # Rank the pairs and add the association measures
+    signals_a = signal_counts[pairs['A'].to_numpy()]
+    signals_b = signal_counts[pairs['B'].to_numpy()]
+    co_signals = pairs['Co-Signals'].to_numpy()
+    results_df = pd.DataFrame({
+        'Stream A': matrix['Stream Labels'][pairs['A'].to_numpy()],
+        'Stream B': matrix['Stream Labels'][pairs['B'].to_numpy()],
+        'Lag': pairs['Lag'].to_numpy(),
+        'Co-Signals': co_signals,
+        'Signals A': signals_a,
+        'Signals B': signals_b,
+        'Jaccard': co_signals / (signals_a + signals_b - co_signals),
+        'Lift': co_signals * num_times / (signals_a * signals_b).astype(float)
+    })
+    results_df = results_df.sort_values(['Co-Signals', 'Jaccard'], ascending=False, kind='stable').reset_index(drop=True)
+    if top_n is not None:
+        results_df = results_df.head(top_n)
+
+    if _metrics.enabled:
+        _metrics.increment('improvement_series_processed_total', num_streams, function='cosignal_analysis')
+        _metrics.observe('improvement_compute_seconds', _perf_counter() - compute_start, function='cosignal_analysis')
+
+    return results_df
+
+def _comparison_axes(num_charts, rows, cols, figsize, dpi, title, chart_rows=1):
+
+    """
+    Create the subplot grid for a comparison figure with `chart_rows` stacked charts per dataset.
+
+    Returns a list with one array of axes per stacked chart (each in dataset order). Unused
+    grid cells are hidden and axes of the same chart type share their y-axis.
+    """
+
+    # Default to a single row with one column per dataset
+    if cols is None:
+        cols = int(np.ceil(num_charts / rows))
+    if rows * cols < num_charts:
+        raise ValueError("The grid must have at least one subplot per dataframe.")
+
+    fig, axes = plt.subplots(nrows=rows * chart_rows, ncols=cols, figsize=figsize, dpi=dpi, squeeze=False)
+    plt.subplots_adjust(wspace=0)
+    plt.suptitle(title, fontsize=14, y=1.05)
+
+    # Split the grid into one set of axes per chart type
+    chart_axes = []
+    for chart in range(chart_rows):
+        chart_grid = axes[chart::chart_rows].flatten()
+        for ax in chart_grid[1:]:
+            ax.sharey(chart_grid[0])
+        for ax in chart_grid[num_charts:]:
+            ax.axis('off')
+        chart_axes.append(chart_grid[:num_charts])
+    if chart_rows > 1:
+        plt.subplots_adjust(hspace=0.4)
+
+    return chart_axes
+
+def _draw_xchart_comparison(axes, df_list, condition, x_labels, parameters_df, linestyle, y_label,
+                            tickinterval, color, rotate_labels, cols):
+
+    """
+    Draw the X-chart panels of a comparison figure from precomputed statistics.
+    """
 
-    for idx, (data, label, ax) in enumerate(zip(
-            parameters_df['data'], parameters_df['Labels'], axes)):
+    for idx, (df, mean, UPL, LPL, label, ax) in enumerate(zip(
+        df_list, 
+        parameters_df['Mean'], 
+        parameters_df['UPL'], 
+        parameters_df['LPL'], 
+        parameters_df['Labels'], 
+        axes)):
         
+        data = _series(df, condition)
+        labels = _series(df, x_labels)
+    
         # Plot data
         ax.plot(data, marker='o', ls=linestyle, color=color[idx % len(color)])
 
         # Masking and plotting limits
-        ax.plot(np.ma.masked_where(data < USL, data), marker='o', ls='none', color='red', markeredgecolor='black', markersize=9)
-        ax.plot(np.ma.masked_where(data > LSL, data), marker='o', ls='none', color='red', markeredgecolor='black', markersize=9)
-        
-        # Highlight points where the data is zero in red
-        zero_indices = (data == 0)
-        ax.plot(np.where(zero_indices)[0], data[zero_indices], marker='o', ls='none', color='red', markeredgecolor='black', markersize=9)
-    
+        ax.plot(np.ma.masked_where(data < UPL, data), marker='o', ls='none', color='red', markeredgecolor='black', markersize=9)
+        ax.plot(np.ma.masked_where(data > LPL, data), marker='o', ls='none', color='red', markeredgecolor='black', markersize=9)
+
         # Plotting lines for mean, UPL, and LPL
-        mean = np.mean(data)
         ax.axhline(mean, ls='--', color='black')
-        ax.axhline(Target, ls='--', color='green')
-        ax.axhline(USL, ls='--', color='gray')
-        ax.axhline(LSL, ls='--', color='gray')
-        
+        ax.axhline(UPL, ls='--', color='red')
+        ax.axhline(LPL, ls='--', color='red')
+
         # Styling axes
         ax.grid(False)
         ax.set_title(label, fontsize=12)
-        for spine in ['top', 'right', 'bottom']:
-            ax.spines[spine].set_visible(False)
-        ax.spines['left'].set_alpha(0.5)
-        ax.tick_params(axis='both', which='both', length=0)
+        # Despine plot
+        sns.despine()
+        ax.tick_params(axis='y', which='both', length=0)
+        ax.tick_params(axis='x', which='both')
+
+        # Add y-label only to the first plot of each row
+        if idx % cols == 0:
+            ax.set_ylabel(y_label, fontsize=12)
+        else:
+            ax.tick_params(axis='y', labelleft=False)
+
+        # Set the x-tick labels with increased intervals
+        tick_positions = np.arange(0, len(data), tickinterval)
+        ax.set_xticks(tick_positions)
+        ax.set_xticklabels(labels[tick_positions], rotation=rotate_labels, ha='center')
+
+def _draw_mrchart_comparison(axes, df_list, parameters_df, moving_ranges, offsets, linestyle, color, cols):
+
+    """
+    Draw the mR-chart panels of a comparison figure from precomputed moving ranges and statistics.
+    """
+
+    for idx, (df, start, end, AmR, URL, label, ax) in enumerate(zip(
+            df_list,
+            offsets[:-1],
+            offsets[1:],
+            parameters_df['AmR'],
+            parameters_df['URL'], 
+            parameters_df['Labels'], 
+            axes)):
         
-        if not xticks:
-            ax.set_xticks([])
+        mRs = pd.Series(moving_ranges[start:end], index=df.index if _table_format(df) == 'pandas' else None)
+        
+        # Plot data
+        ax.plot(mRs, marker='o', ls=linestyle, color=color[idx % len(color)])
 
-    # Hide the last subplot by removing its axis
-    if hide_last.lower() == 'on':
-        axes[-1].axis('off')
-    
-    # Show figure 
-    plt.show()
-    
-    # Reorder and return the results dataframe
-    new_order = ['Labels', 'Mean', 'UPL', 'LPL', 'PLR', 'Target', 'USL', 'LSL',
-                 'Tolerance','Centering Distance','Tolerance Delta']
-    results_df = parameters_df[new_order]
-    
-    return results_df
+        # Masking and plotting limits correctly
+        ax.plot(np.ma.masked_where(mRs < URL, mRs), marker='o', ls='none', color='red', markeredgecolor='black', markersize=9)
+        
+        # Plotting lines for average moving range and URL 
+        ax.axhline(AmR, ls='--', color='black')
+        ax.axhline(URL, ls='--', color='red')
+        
+        # Styling axes
+        ax.grid(False)
+        # Set title
+        ax.set_title(label, fontsize=12)
+
+        # Despine plot
+        sns.despine()
+        
+        ax.tick_params(axis='y', which='both', length=0)
+        ax.tick_params(axis='x', which='both')
+        
+        # Add y-label only to the first plot of each row
+        if idx % cols == 0:
+            ax.set_ylabel('Moving Range (mR)', fontsize=12)
+        else:
+            ax.tick_params(axis='y', labelleft=False)
+        # Remove xticks 
+        ax.set_xticks([])
 
 def xchart_comparison(df_list, condition, x_labels, list_of_plot_labels, title='',
                       linestyle='-', y_label='Individual Values (X)', tickinterval=5,
                       colors=['tab:blue','tab:blue'], figsize=(12,4), rotate_labels=0,
-                      dpi=300):
+                      dpi=300, rows=1, cols=None, payload='Off', missing='skip', max_gap=1):
     
     """
     Compare X-charts for multiple datasets and plot the results with specified x-axis labels.
 
     Parameters:
     -----------
-    df_list : list of pandas.DataFrame
+    df_list : list of pandas.DataFrame, pyarrow.Table or polars.DataFrame
         A list of DataFrames containing the data to be plotted. Each DataFrame represents a different dataset.
         
     condition : str
@@ -1163,6 +4685,21 @@ def xchart_comparison(df_list, condition, x_labels, list_of_plot_labels, title='
     dpi : int, optional
         The resolution of the figure in dots per inch. Default is 300.
 
+    rows : int, optional
+        Number of rows in the subplot grid. Default is 1.
+
+    cols : int, optional
+        Number of columns in the subplot grid. Default is None (enough columns to fit all datasets in `rows`).
+
+
+    payload : str, optional
+        If 'JSON', 'msgpack' or 'Dict', skip matplotlib and return the data needed to draw the panels on
+        the client (decimated series, signal positions, limit lines and ticks) instead of the results. Default is 'Off'.
+    missing : str, optional
+        Policy for moving ranges that span missing values (see `xmr_signals`): 'skip' leaves them
+        missing, 'bridge' takes them across gaps of up to `max_gap` missing values. Default is 'skip'.
+    max_gap : int, optional
+        Longest run of missing values bridged with `missing='bridge'`, default is 1.
     Returns:
     --------
     pandas.DataFrame
@@ -1174,6 +4711,8 @@ def xchart_comparison(df_list, condition, x_labels, list_of_plot_labels, title='
     ------
     - This function generates X-charts (control charts) for each DataFrame in df_list, 
       displaying individual values with their respective control limits.
+    - The statistics of all DataFrames are calculated in a single vectorized pass. Both process
+      limits are floored at zero, as in `network_analysis`.
     - The function automatically determines whether the process is predictable or unpredictable 
       based on whether all data points fall within the control limits.
     - The x-ticks are customized based on the provided tick interval, which controls the spacing between ticks.
@@ -1190,85 +4729,28 @@ def xchart_comparison(df_list, condition, x_labels, list_of_plot_labels, title='
     )
     """
     
-    # Constants for control limits
-    C1 = 2.660
-    C2 = 3.268
-    
     color = colors
     
     # Calculate statistics
-    stats = [
-        (
-            df[condition].mean(),
-            abs(df[condition].diff()).mean(),
-            df[condition].mean() + C1 * abs(df[condition].diff()).mean(),
-            max(df[condition].mean() - C1 * abs(df[condition].diff()).mean(),0),
-            C2 * abs(df[condition].diff()).mean()
-        )
-        for df in df_list
-    ]
-    
-    # Isolate column to be used for x_labels
-    x_labels_for_plots = [df[x_labels] for df in df_list]
-    
-    # Create results dataframe
-    parameters_df = pd.DataFrame(stats, columns=['Mean', 'AmR', 'UPL', 'LPL', 'URL'])
+    parameters_df, stats = _network_stats(df_list, condition, return_stats=True, missing=missing, max_gap=max_gap)
     parameters_df['Labels'] = list_of_plot_labels
-    parameters_df['PLR'] = parameters_df['UPL'] - parameters_df['LPL']
-    parameters_df['data'] = [df[condition] for df in df_list]
-    parameters_df['mR'] = [abs(df[condition].diff()) for df in df_list]
     
-    # Determine predictability
-    parameters_df['Characterization'] = parameters_df.apply(
-        lambda row: 'Predictable' if all(row['LPL'] <= x <= row['UPL'] for x in row['data']) else 'Unpredictable',
-        axis=1
-    )
+    # Return the data to draw instead of the figure
+    payload_format = _payload_format(payload)
+    if payload_format is not None:
+        panels = _network_payload_panels(df_list, condition, parameters_df, [('Mean', 'black'), ('UPL', 'red'), ('LPL', 'red')],
+                                         'UPL', 'LPL', color, x_labels, tickinterval)
+        params = {column: parameters_df[column] for column in ['Labels', 'Mean', 'UPL', 'LPL', 'PLR', 'AmR', 'URL', 'Characterization']}
+        return _chart_payload('xchart_comparison', title, panels, params, payload_format=payload_format)
     
     # Plotting
-    fig, axes = plt.subplots(nrows=1, ncols=2, figsize=figsize, sharey=True, dpi=dpi)
-    plt.subplots_adjust(wspace=0)
-    plt.suptitle(title, fontsize=14, y=1.05)
-
-    axes = axes.flatten() if isinstance(axes, np.ndarray) else [axes]
+    render_start = time.perf_counter()
+    [axes] = _comparison_axes(len(df_list), rows, cols, figsize, dpi, title)
+    _draw_xchart_comparison(axes, df_list, condition, x_labels, parameters_df, linestyle, y_label,
+                            tickinterval, color, rotate_labels, cols or int(np.ceil(len(df_list) / rows)))
 
-    for idx, (data, UPL, LPL, label, ax, x_labels) in enumerate(zip(
-        parameters_df['data'], 
-        parameters_df['UPL'], 
-        parameters_df['LPL'], 
-        parameters_df['Labels'], 
-        axes,
-        x_labels_for_plots)):
-    
-        # Plot data
-        ax.plot(data, marker='o', ls=linestyle, color=color[idx % len(color)])
-
-        # Masking and plotting limits
-        ax.plot(np.ma.masked_where(data < UPL, data), marker='o', ls='none', color='red', markeredgecolor='black', markersize=9)
-        ax.plot(np.ma.masked_where(data > LPL, data), marker='o', ls='none', color='red', markeredgecolor='black', markersize=9)
-
-        # Plotting lines for mean, UPL, and LPL
-        mean = np.mean(data)
-        ax.axhline(mean, ls='--', color='black')
-        ax.axhline(UPL, ls='--', color='red')
-        ax.axhline(LPL, ls='--', color='red')
-
-        # Styling axes
-        ax.grid(False)
-        ax.set_title(label, fontsize=12)
-        # Despine plot
-        sns.despine()
-        ax.tick_params(axis='y', which='both', length=0)
-        ax.tick_params(axis='x', which='both')
-
-        # Add y-label only to the first plot
-        if idx == 0:
-            ax.set_ylabel(y_label, fontsize=12)
-
-        # Set the x-tick labels with increased intervals
-        tick_interval = tickinterval  # Increase this value to increase the spacing between ticks
-        tick_positions = np.arange(0, len(data), tick_interval)
-        ax.set_xticks(tick_positions)
-        ax.set_xticklabels(x_labels[tick_positions], rotation=rotate_labels, ha='center')
+    # Record the render time before the plot is shown (plt.show() blocks on interactive backends)
+    _record_render('xchart_comparison', render_start)
 
     # Show figure 
     plt.show()
@@ -1277,12 +4759,12 @@ def xchart_comparison(df_list, condition, x_labels, list_of_plot_labels, title='
     new_order = ['Labels', 'Mean', 'UPL', 'LPL', 'PLR', 'AmR', 'URL', 'Characterization']
     results_df = parameters_df[new_order]
     
-    return results_df
+    return _to_format(results_df, _table_format(df_list[0]))
 
 def mrchart_comparison(df_list, condition, x_labels, list_of_plot_labels, 
                        title='', linestyle='-', tickinterval=5, round_value=2,
                        colors=['tab:blue','tab:blue'], figsize=(15,3), 
-                       dpi=300):
+                       dpi=300, rows=1, cols=None, payload='Off', missing='skip', max_gap=1):
     '''
     Generate moving range charts for a list of DataFrames and compare their statistics.
 
@@ -1293,7 +4775,7 @@ def mrchart_comparison(df_list, condition, x_labels, list_of_plot_labels,
 
     Parameters:
     ----------
-    df_list : list of pandas.DataFrame
+    df_list : list of pandas.DataFrame, pyarrow.Table or polars.DataFrame
         A list containing DataFrames from which the moving ranges will be calculated.
     condition : str
         A column name in each DataFrame to be used for calculating moving ranges.
@@ -1315,7 +4797,19 @@ def mrchart_comparison(df_list, condition, x_labels, list_of_plot_labels,
         Figure size for the plots (default is (15, 3)).
     dpi : int, optional
         Dots per inch for the figure (default is 300).
+    rows : int, optional
+        Number of rows in the subplot grid (default is 1).
+    cols : int, optional
+        Number of columns in the subplot grid (default is None, enough columns to fit all datasets in `rows`).
 
+    payload : str, optional
+        If 'JSON', 'msgpack' or 'Dict', skip matplotlib and return the data needed to draw the panels on
+        the client (decimated series, signal positions, limit lines and ticks) instead of the results. Default is 'Off'.
+    missing : str, optional
+        Policy for moving ranges that span missing values (see `xmr_signals`): 'skip' leaves them
+        missing, 'bridge' takes them across gaps of up to `max_gap` missing values. Default is 'skip'.
+    max_gap : int, optional
+        Longest run of missing values bridged with `missing='bridge'`, default is 1.
     Returns:
     -------
     pandas.DataFrame
@@ -1324,90 +4818,143 @@ def mrchart_comparison(df_list, condition, x_labels, list_of_plot_labels,
     
     Notes:
     -----
-    The function creates two subplots for the moving ranges and masks values below the URL in the plots.
+    The function creates one subplot per DataFrame for the moving ranges and masks values below the URL in the plots.
     It uses constant values C1 and C2 to calculate control limits.
     '''
-    # Constants for control limits
-    C1 = 2.660
-    C2 = 3.268
     
     # Specify color 
     color = colors
     
-    # Isolate column to be used for x_labels
-    x_labels_for_plots = [df[x_labels] for df in df_list]
-    
-    stats= []
-    for df in df_list:
-        values = df[condition]
-        mR = abs(df[condition].diff())
-        # Calculate stats
-        mean = values.mean()
-        AmR = mR.mean()
-        URL = C2*AmR
-        
-        # Check if all value in mR are less than URL
-        characterization = 'Predictable' if all(m < URL for m in mR.dropna()) else 'Unpredictable'
-        
-        # Append results to stats list
-        stats.append([mean, AmR, URL, characterization])
-    
-    # Create results dataframe
-    parameters = pd.DataFrame(stats, columns=['Mean', 'AmR', 'URL', 'Characterization'])
+    # Calculate statistics
+    parameters, stats = _network_stats(df_list, condition, return_stats=True, missing=missing, max_gap=max_gap)
     parameters['Labels'] = list_of_plot_labels
-    parameters['mRs'] = [abs(df[condition].diff()) for df in df_list]
-    # Specify parameters_df order
+    parameters['Characterization'] = parameters['mR Characterization']
+    
+    # Return the data to draw instead of the figure
+    payload_format = _payload_format(payload)
+    if payload_format is not None:
+        panels = _mr_payload_panels(parameters, stats['Moving Ranges'], stats['Offsets'], color)
+        params = {column: parameters[column] for column in ['Labels', 'AmR', 'URL', 'Characterization']}
+        return _chart_payload('mrchart_comparison', title, panels, params, payload_format=payload_format)
     
     # Plotting
-    fig, axes = plt.subplots(nrows=1, ncols=2, figsize=figsize, sharey=True, dpi=dpi)
-    plt.subplots_adjust(wspace=0)
-    plt.suptitle(title, fontsize=14, y=1.05)
+    render_start = time.perf_counter()
+    [axes] = _comparison_axes(len(df_list), rows, cols, figsize, dpi, title)
+    _draw_mrchart_comparison(axes, df_list, parameters, stats['Moving Ranges'], stats['Offsets'], linestyle,
+                             color, cols or int(np.ceil(len(df_list) / rows)))
+            
+    # Record the render time before the plot is shown (plt.show() blocks on interactive backends)
+    _record_render('mrchart_comparison', render_start)
 
-    axes = axes.flatten() if isinstance(axes, np.ndarray) else [axes]
+    # Show figure 
+    plt.show()
+    
+    # Reorder and return the results dataframe
+    new_order = ['Labels', 'AmR', 'URL', 'Characterization']
+    results_df = round(parameters[new_order],round_value)
+    
+    return _to_format(results_df, _table_format(df_list[0]))
 
-    for idx, (mRs, URL, label, ax, x_labels) in enumerate(zip(
-            parameters['mRs'], 
-            parameters['URL'], 
-            parameters['Labels'], 
-            axes,
-            x_labels_for_plots)):
-        
-        # Plot data
-        ax.plot(mRs, marker='o', ls=linestyle, color=color[idx % len(color)])
+def xmrchart_comparison(df_list, condition, x_labels, list_of_plot_labels, title='',
+                        linestyle='-', y_label='Individual Values (X)', tickinterval=5, round_value=2,
+                        colors=['tab:blue','tab:blue'], figsize=(15,6), rotate_labels=0,
+                        dpi=300, rows=1, cols=None, payload='Off', missing='skip', max_gap=1):
+    
+    """
+    Compare XmR charts (X-chart above mR-chart) for multiple datasets in a single figure.
 
-        # Masking and plotting limits correctly
-        ax.plot(np.ma.masked_where(mRs < URL, mRs), marker='o', ls='none', color='red', markeredgecolor='black', markersize=9)
-        
-        # Plotting lines for average moving range and URL 
-        AmR = np.mean(mRs)
-        ax.axhline(AmR, ls='--', color='black')
-        ax.axhline(URL, ls='--', color='red')
-        
-        # Styling axes
-        ax.grid(False)
-        # Set title
-        ax.set_title(label, fontsize=12)
+    The X and mR statistics of every DataFrame are calculated once, in a single vectorized
+    pass, and feed both the X-chart and mR-chart panels.
+
+    Parameters:
+    -----------
+    df_list : list of pandas.DataFrame, pyarrow.Table or polars.DataFrame
+        A list of DataFrames containing the data to be plotted. Each DataFrame represents a different dataset.
+    condition : str
+        The column name in each DataFrame to be analyzed and plotted.
+    x_labels : str
+        The column name in each DataFrame to be used for x-axis labels of the X-charts.
+    list_of_plot_labels : list of str
+        A list of labels for each dataset, used as titles for the subplots.
+    title : str, optional
+        The overall title of the entire plot. Default is an empty string.
+    linestyle : str, optional
+        The line style for the plot lines. Default is '-' (solid line).
+    y_label : str, optional
+        The label for the y-axis of the X-charts. Default is 'Individual Values (X)'.
+    tickinterval : int, optional
+        The interval at which x-ticks are placed on the X-charts. Default is 5.
+    round_value : int, optional
+        The number of decimal places to round the output DataFrame. Default is 2.
+    colors : list of str, optional
+        A list of colors for the plot lines. Default is ['tab:blue', 'tab:blue'].
+    figsize : tuple of int, optional
+        The size of the figure in inches. Default is (15, 6).
+    rotate_labels : int, optional
+        Specify the rotation for the xlabels.
+    dpi : int, optional
+        The resolution of the figure in dots per inch. Default is 300.
+    rows : int, optional
+        Number of rows of datasets in the grid. Each row holds an X-chart row and an mR-chart row. Default is 1.
+    cols : int, optional
+        Number of columns in the grid. Default is None (enough columns to fit all datasets in `rows`).
+
+    payload : str, optional
+        If 'JSON', 'msgpack' or 'Dict', skip matplotlib and return the data needed to draw the panels on
+        the client (decimated series, signal positions, limit lines and ticks) instead of the results. Default is 'Off'.
+    missing : str, optional
+        Policy for moving ranges that span missing values (see `xmr_signals`): 'skip' leaves them
+        missing, 'bridge' takes them across gaps of up to `max_gap` missing values. Default is 'skip'.
+    max_gap : int, optional
+        Longest run of missing values bridged with `missing='bridge'`, default is 1.
+    Returns:
+    --------
+    pandas.DataFrame
+        A DataFrame with 'Labels', 'Mean', 'UPL', 'LPL', 'PLR', 'AmR', 'URL', 'X Characterization'
+        and 'mR Characterization' for each dataset.
+
+    Example:
+    --------
+    >>> xmrchart_comparison([before_df, after_df], 'Widths', 'Date', ['Before', 'After'])
+    """
+    
+    color = colors
+    cols = cols or int(np.ceil(len(df_list) / rows))
+    
+    # Calculate statistics once for both charts
+    parameters_df, stats = _network_stats(df_list, condition, return_stats=True, missing=missing, max_gap=max_gap)
+    parameters_df['Labels'] = list_of_plot_labels
+    parameters_df['X Characterization'] = parameters_df['Characterization']
+    
+    # Return the data to draw instead of the figure
+    payload_format = _payload_format(payload)
+    if payload_format is not None:
+        panels = _network_payload_panels(df_list, condition, parameters_df, [('Mean', 'black'), ('UPL', 'red'), ('LPL', 'red')],
+                                         'UPL', 'LPL', color, x_labels, tickinterval)
+        panels += _mr_payload_panels(parameters_df, stats['Moving Ranges'], stats['Offsets'], color)
+        params = {column: parameters_df[column] for column in ['Labels', 'Mean', 'UPL', 'LPL', 'PLR', 'AmR', 'URL',
+                                                                'X Characterization', 'mR Characterization']}
+        return _chart_payload('xmrchart_comparison', title, panels, params, payload_format=payload_format)
+    
+    # Plotting
+    render_start = time.perf_counter()
+    xchart_axes, mrchart_axes = _comparison_axes(len(df_list), rows, cols, figsize, dpi, title, chart_rows=2)
+    _draw_xchart_comparison(xchart_axes, df_list, condition, x_labels, parameters_df, linestyle, y_label,
+                            tickinterval, color, rotate_labels, cols)
+    _draw_mrchart_comparison(mrchart_axes, df_list, parameters_df, stats['Moving Ranges'], stats['Offsets'],
+                             linestyle, color, cols)
+    
+    # Record the render time before the plot is shown (plt.show() blocks on interactive backends)
+    _record_render('xmrchart_comparison', render_start)
 
-        # Despine plot
-        sns.despine()
-        
-        ax.tick_params(axis='y', which='both', length=0)
-        ax.tick_params(axis='x', which='both')#, length=1)
-        
-        # Add y-label only to the first plot
-        if idx == 0:
-            ax.set_ylabel('Moving Range (mR)', fontsize=12)
-        # Remove xticks 
-        ax.set_xticks([])
-            
     # Show figure 
     plt.show()
     
     # Reorder and return the results dataframe
-    new_order = ['Labels', 'AmR', 'URL', 'Characterization']
-    results_df = round(parameters[new_order],round_value)
+    new_order = ['Labels', 'Mean', 'UPL', 'LPL', 'PLR', 'AmR', 'URL', 'X Characterization', 'mR Characterization']
+    results_df = round(parameters_df[new_order], round_value)
     
-    return results_df
+    return _to_format(results_df, _table_format(df_list[0]))
                          
 # Function for calculating box plot features (5-number summary and outliers)
 def boxplotfeatures(df, column, round_value=2):
@@ -1477,3 +5024,145 @@ def boxplotfeatures(df, column, round_value=2):
         return results_df, "No outliers"
     else:
         return results_df, outliers
+
+# Function for calculating box plot features for many columns and groups at once
+def boxplotfeatures_batch(df, columns, by=None, round_value=2):
+    
+    """
+    Calculate key features of a box plot for several columns and/or groups in a single call.
+
+    Batch counterpart of `boxplotfeatures`. Each column is sorted once (grouped by `by`),
+    and the median, Q1, Q3, bounds and outlier counts of every group are read directly
+    from the sorted values. Outliers are identified with a single vectorized mask per
+    column instead of copying the outlying rows.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        The DataFrame containing the data.
+        
+    columns : str or list of str
+        The name(s) of the column(s) in `df` for which to calculate the box plot features.
+        
+    by : str or list of str, optional (default=None)
+        Column name(s) in `df` to group by. If None, each column is treated as a single group.
+        Rows with a missing group key are ignored.
+        
+    round_value : int, optional (default=2)
+        The number of decimal places to round the calculated values to.
+
+    Returns:
+    --------
+    results_df : pandas.DataFrame
+        A tidy DataFrame with one row per group and column containing:
+        - the group key column(s) (only when `by` is specified)
+        - 'Column': The name of the column.
+        - 'Median', 'Q1', 'Q3', 'IQR', 'Lower bound', 'Upper bound': As in `boxplotfeatures`.
+        - '# Outliers': The number of values below the lower bound or above the upper bound.
+        Groups without any values in a column (e.g. an all-NaN column) get NaN features.
+    
+    outliers : pandas.DataFrame
+        A compact index of the outliers with the group key column(s), 'Column' and 'Index'
+        (the index label of the outlying row in `df`). Empty if there are no outliers.
+
+    Example:
+    --------
+    >>> features, outliers = boxplotfeatures_batch(df, ['Width', 'Length'], by='Machine')
+    >>> df.loc[outliers.loc[outliers['Column'] == 'Width', 'Index']]
+    """
+
+    compute_start = time.perf_counter()
+    
+    # Specify multiplier to 1.5
+    multiplier = 1.5
+    
+    if isinstance(columns, str):
+        columns = [columns]
+    
+    # Assign an integer code to each group (-1 for rows with a missing group key)
+    if by is None:
+        group_by = []
+        codes = np.zeros(len(df), dtype=np.int64)
+        group_keys = pd.DataFrame(index=range(1))
+    else:
+        group_by = [by] if isinstance(by, str) else list(by)
+        grouped = df.groupby(group_by, sort=True)
+        codes = grouped.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+        group_keys = grouped.size().index.to_frame(index=False)
+    num_groups = len(group_keys)
+    
+    feature_frames = []
+    outlier_frames = []
+    for column in columns:
+        values = df[column].to_numpy(dtype=float)
+        
+        # Sort the valid values of every group in one pass
+        valid = np.flatnonzero(~np.isnan(values) & (codes >= 0))
+        order = valid[np.lexsort((values[valid], codes[valid]))]
+        sorted_values = values[order]
+        sorted_codes = codes[order]
+        
+        # Locate the start of each group within the sorted values
+        counts = np.bincount(sorted_codes, minlength=num_groups)
+        starts = np.cumsum(counts) - counts
+        non_empty = counts > 0
+        first = np.where(non_empty, starts, 0)
+        last = np.where(non_empty, starts + counts - 1, 0)
+        
+        # Gather from a NaN placeholder when the column has no valid values at all
+        gather_values = sorted_values if len(sorted_values) else np.full(1, np.nan)
+        
+        # Calculate quantiles with linear interpolation (same as pandas.Series.quantile)
+        def quantile(q):
+            position = starts + q * (counts - 1)
+            lower_index = np.clip(np.floor(position).astype(np.int64), first, last)
+            upper_index = np.minimum(lower_index + 1, last)
+            fraction = position - lower_index
+            result = gather_values[lower_index] + (gather_values[upper_index] - gather_values[lower_index]) * fraction
+            return np.where(non_empty, result, np.nan)
+        
+        median = quantile(0.5)
+        Q1 = quantile(0.25)
+        Q3 = quantile(0.75)
+        
+        # Calculate the IQR
+        IQR = Q3 - Q1
+        
+        # Calculate the upper and lower bounds
+        lower_bound = np.maximum(Q1 - multiplier * IQR, gather_values[first])
+        below_fence = sorted_values < (Q3 + multiplier * IQR)[sorted_codes]
+        num_below_fence = np.bincount(sorted_codes, weights=below_fence, minlength=num_groups).astype(np.int64)
+        upper_bound = np.where(num_below_fence > 0, gather_values[np.maximum(starts + num_below_fence - 1, 0)], np.nan)
+        
+        # Identify outliers
+        is_outlier = (sorted_values < lower_bound[sorted_codes]) | (sorted_values > upper_bound[sorted_codes])
+        outlier_rows = np.sort(order[is_outlier])
+        
+        # Collect features for the column
+        features = group_keys.copy()
+        features['Column'] = column
+        features['Median'] = median
+        features['Q1'] = Q1
+        features['Q3'] = Q3
+        features['IQR'] = IQR
+        features['Lower bound'] = lower_bound
+        features['Upper bound'] = upper_bound
+        features['# Outliers'] = np.bincount(sorted_codes[is_outlier], minlength=num_groups)
+        feature_frames.append(features)
+        
+        # Collect outlier index for the column
+        column_outliers = group_keys.iloc[codes[outlier_rows]].reset_index(drop=True)
+        column_outliers['Column'] = column
+        column_outliers['Index'] = df.index[outlier_rows]
+        outlier_frames.append(column_outliers)
+    
+    # Create results DataFrame
+    results_df = pd.concat(feature_frames, ignore_index=True).round(round_value)
+    outliers = pd.concat(outlier_frames, ignore_index=True)
+    
+    if _metrics.enabled:
+        _metrics.increment('improvement_series_processed_total', len(columns), function='boxplotfeatures_batch')
+        _metrics.increment('improvement_points_processed_total', len(df) * len(columns), function='boxplotfeatures_batch')
+        _metrics.observe('improvement_compute_seconds', time.perf_counter() - compute_start, function='boxplotfeatures_batch')
+
+    return results_df, outliers
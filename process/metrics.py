@@ -0,0 +1,196 @@
+# Improvement Python Library/metrics.py
+# Optional counters and histograms of compute and render activity in Prometheus text format
+
+import bisect
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Metrics are disabled by default; every recording function returns immediately until `enable` is called
+enabled = False
+
+# Upper bounds (in seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_descriptions = {
+    'improvement_series_processed_total': ('counter', 'Series processed by the compute functions.'),
+    'improvement_points_processed_total': ('counter', 'Values processed by the compute functions.'),
+    'improvement_signals_total': ('counter', 'Assignable cause signals found, by rule.'),
+    'improvement_cache_requests_total': ('counter', 'Cache lookups of incremental objects, by cache and result (hit or miss).'),
+    'improvement_compute_seconds': ('histogram', 'Latency of the compute step of each function.'),
+    'improvement_render_seconds': ('histogram', 'Latency of the render step of each function.'),
+}
+_counters = {}
+_histograms = {}
+_lock = threading.Lock()
+
+def enable():
+
+    """
+    Start recording metrics.
+
+    Render latency is measured by drawing each figure once before it is shown or returned, so while
+    metrics are enabled every chart is rendered an extra time (roughly doubling the render cost of
+    figures that are later shown or saved).
+    """
+
+    global enabled
+    enabled = True
+
+def disable():
+
+    """
+    Stop recording metrics. Recorded values are kept until `reset` is called.
+    """
+
+    global enabled
+    enabled = False
+
+def reset():
+
+    """
+    Remove all recorded values.
+    """
+
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+def increment(name, value=1, **labels):
+
+    """
+    Add `value` to the counter `name` with the given labels.
+
+    Example:
+    --------
+    >>> increment('improvement_signals_total', 3, rule='x_chart')
+    """
+
+    if not enabled:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+def observe(name, value, **labels):
+
+    """
+    Record `value` in the histogram `name` with the given labels.
+    """
+
+    if not enabled:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = {'Buckets': [0] * len(LATENCY_BUCKETS), 'Count': 0, 'Sum': 0.0}
+        position = bisect.bisect_left(LATENCY_BUCKETS, value)
+        if position < len(LATENCY_BUCKETS):
+            histogram['Buckets'][position] += 1
+        histogram['Count'] += 1
+        histogram['Sum'] += value
+
+def _format_labels(labels, extra=()):
+
+    # Format labels as {name="value",...}, escaping backslashes, quotes and newlines
+    items = list(labels) + list(extra)
+    if not items:
+        return ''
+    escaped = [(name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')) for name, value in items]
+
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+def to_prometheus():
+
+    """
+    Return the recorded metrics in the Prometheus text exposition format (version 0.0.4).
+    """
+
+    with _lock:
+        counters = dict(_counters)
+        histograms = {key: {'Buckets': list(value['Buckets']), 'Count': value['Count'], 'Sum': value['Sum']}
+                      for key, value in _histograms.items()}
+
+    lines = []
+    counter_names = {name for name, _ in counters}
+    for name in sorted(counter_names | {name for name, _ in histograms}):
+        kind, description = _descriptions.get(name, ('counter' if name in counter_names else 'histogram', name))
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {kind}')
+        for (metric, labels), value in sorted(counters.items()):
+            if metric == name:
+                lines.append(f'{name}{_format_labels(labels)} {value}')
+        for (metric, labels), histogram in sorted(histograms.items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, histogram['Buckets']):
+                cumulative += count
+                lines.append(f'{name}_bucket{_format_labels(labels, [("le", repr(bound))])} {cumulative}')
+            lines.append(f'{name}_bucket{_format_labels(labels, [("le", "+Inf")])} {histogram["Count"]}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {histogram["Sum"]!r}')
+            lines.append(f'{name}_count{_format_labels(labels)} {histogram["Count"]}')
+
+    return '\n'.join(lines) + '\n'
+
+def write_metrics(path):
+
+    """
+    Write the recorded metrics to a file in Prometheus text format, e.g. for the node exporter's
+    textfile collector. The file is replaced atomically.
+    """
+
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        f.write(to_prometheus())
+    os.replace(path + '.tmp', path)
+
+class MetricsHandler(BaseHTTPRequestHandler):
+
+    """
+    HTTP request handler that serves the recorded metrics at every path.
+    """
+
+    def do_GET(self):
+
+        body = to_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+
+        # Keep scrapes out of the worker's output
+        pass
+
+def serve_metrics(port=9464, host='127.0.0.1'):
+
+    """
+    Serve the recorded metrics over HTTP from a background thread.
+
+    Parameters:
+    -----------
+    port : int, optional
+        Port to listen on, default is 9464.
+    host : str, optional
+        Address to bind, default is '127.0.0.1' (local scrapes only).
+
+    Returns:
+    --------
+    http.server.ThreadingHTTPServer
+        The running server. Call `shutdown()` on it to stop serving.
+
+    Example:
+    --------
+    >>> from process import metrics
+    >>> metrics.enable()
+    >>> server = metrics.serve_metrics(port=9464)
+    """
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name='improvement-metrics', daemon=True)
+    thread.start()
+
+    return server
@@ -0,0 +1,173 @@
+# Improvement Python Library/parallel.py
+# Shared-memory parallel execution of the XmR calculations over many series
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+
+from process.improvement import xmr_signals
+
+# Arrays shared with the worker processes, attached once per worker
+_shared_arrays = {}
+_param_names = ['Mean', 'UPL', 'LPL', 'PLR', 'AmR', 'URL', 'Missing', 'mR Bridged']
+
+def _create_shared(shape, dtype):
+
+    """
+    Create a shared memory block and a NumPy array backed by it.
+    """
+
+    dtype = np.dtype(dtype)
+    size = max(int(np.prod(shape)) * dtype.itemsize, 1)
+    block = shared_memory.SharedMemory(create=True, size=size)
+
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+def _attach_shared(specs):
+
+    """
+    Attach the shared memory blocks in a worker process. Used as the pool initializer.
+
+    `specs` maps each array name to the (block name, shape, dtype) of its shared memory block.
+    """
+
+    for key, (name, shape, dtype) in specs.items():
+        # The creating process owns the block; workers share its resource tracker, so before
+        # Python 3.13 (no `track` argument) attaching only registers the name a second time
+        try:
+            block = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            block = shared_memory.SharedMemory(name=name)
+        _shared_arrays[key] = (block, np.ndarray(shape, dtype=dtype, buffer=block.buf))
+
+def _xmr_worker(first, last, missing, max_gap):
+
+    """
+    Calculate the XmR limits and signals of series `first` to `last` (exclusive) in a worker process.
+
+    Reads the values from and writes the results to the shared arrays; only the two series
+    positions are sent to the worker and only the number of series is returned.
+    """
+
+    values = _shared_arrays['values'][1]
+    offsets = _shared_arrays['offsets'][1]
+    start, end = offsets[first], offsets[last]
+
+    result = xmr_signals(values[start:end], offsets[first:last + 1] - start, missing=missing, max_gap=max_gap)
+
+    # Write the results into the shared output buffers
+    params = _shared_arrays['params'][1]
+    for column, param in enumerate(_param_names):
+        params[first:last, column] = result[param]
+    _shared_arrays['moving_ranges'][1][start:end] = result['Moving Ranges']
+    _shared_arrays['x_signals'][1][start:end] = result['X-Chart Signals']
+    _shared_arrays['mr_signals'][1][start:end] = result['mR-Chart Signals']
+
+    return last - first
+
+def _balanced_batches(offsets, num_batches):
+
+    """
+    Split the series into up to `num_batches` consecutive batches with about the same number of values.
+
+    Returns:
+    --------
+    numpy.ndarray
+        The first series of every batch followed by the number of series.
+    """
+
+    num_series = len(offsets) - 1
+    targets = np.linspace(0, offsets[-1], num_batches + 1)[1:-1]
+    bounds = np.searchsorted(offsets, targets, side='left')
+
+    return np.unique(np.concatenate(([0], np.clip(bounds, 0, num_series), [num_series])))
+
+# Parallel XmR limits and signals function
+def parallel_xmr_signals(values, offsets=None, jobs=None, tasks_per_job=4, missing='skip', max_gap=1,
+                         min_values=5_000_000):
+
+    """
+    Calculate `xmr_signals` for many series across worker processes without pickling the data.
+
+    The values and series offsets are copied once into `multiprocessing.shared_memory` blocks,
+    together with output buffers for the limits, moving ranges and signals. Workers attach to the
+    blocks once when the pool starts, receive only the first and last series of each batch, and
+    write their results directly into the output buffers. Batches are balanced by the number of
+    values rather than the number of series, so a few long series do not hold up the pool.
+
+    Parameters:
+    -----------
+    values : array-like
+        Individual values of all series concatenated.
+    offsets : array-like, optional
+        Start position of each series in `values` followed by the total length. Default is None
+        (a single series, which is calculated in the calling process).
+    jobs : int, optional
+        Number of worker processes. Default is None (the number of CPUs).
+    tasks_per_job : int, optional
+        Number of batches per worker, default is 4. More batches balance the load better at the cost
+        of more scheduling.
+    missing, max_gap : optional
+        Missing data policy, see `xmr_signals`. Defaults are 'skip' and 1.
+    min_values : int, optional
+        Smallest total number of values worth starting a pool, default is 5,000,000. Smaller inputs
+        are calculated in the calling process, where they finish faster than the pool starts.
+
+    Returns:
+    --------
+    dict
+        The same result as `xmr_signals(values, offsets, missing=missing, max_gap=max_gap)`.
+
+    Example:
+    --------
+    >>> from process.parallel import parallel_xmr_signals
+    >>> result = parallel_xmr_signals(values, offsets, jobs=32)
+    """
+
+    values = np.ascontiguousarray(values, dtype=float)
+    if offsets is None:
+        offsets = np.array([0, len(values)], dtype=np.int64)
+    offsets = np.ascontiguousarray(offsets, dtype=np.int64)
+    num_series = len(offsets) - 1
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+
+    # Small inputs are not worth starting a pool
+    batches = _balanced_batches(offsets, jobs * tasks_per_job)
+    if jobs == 1 or len(batches) <= 2 or len(values) < min_values:
+        return xmr_signals(values, offsets, missing=missing, max_gap=max_gap)
+
+    # Place the inputs and output buffers in shared memory
+    blocks = {}
+    arrays = {}
+    try:
+        for key, shape, dtype in [('values', values.shape, np.float64), ('offsets', offsets.shape, np.int64),
+                                  ('params', (num_series, len(_param_names)), np.float64),
+                                  ('moving_ranges', values.shape, np.float64),
+                                  ('x_signals', values.shape, np.bool_), ('mr_signals', values.shape, np.bool_)]:
+            blocks[key], arrays[key] = _create_shared(shape, dtype)
+        arrays['values'][:] = values
+        arrays['offsets'][:] = offsets
+        specs = {key: (blocks[key].name, array.shape, array.dtype.str) for key, array in arrays.items()}
+
+        # Fan the batches out across the worker pool
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_attach_shared, initargs=(specs,)) as executor:
+            num_batches = len(batches) - 1
+            list(executor.map(_xmr_worker, batches[:-1], batches[1:], [missing] * num_batches, [max_gap] * num_batches))
+
+        # Copy the results out of shared memory
+        result = {param: arrays['params'][:, column].copy() for column, param in enumerate(_param_names)}
+        result['Missing'] = result['Missing'].astype(np.int64)
+        result['mR Bridged'] = result['mR Bridged'].astype(np.int64)
+        result['Moving Ranges'] = arrays['moving_ranges'].copy()
+        result['X-Chart Signals'] = arrays['x_signals'].copy()
+        result['mR-Chart Signals'] = arrays['mr_signals'].copy()
+    finally:
+        # Release the arrays before closing and removing the blocks
+        arrays.clear()
+        for block in blocks.values():
+            block.close()
+            block.unlink()
+
+    return result
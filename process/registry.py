@@ -0,0 +1,289 @@
+# Improvement Python Library/registry.py
+# Persistent registry of frozen process limits backed by SQLite
+
+import sqlite3
+import time
+import numpy as np
+import pandas as pd
+
+class LimitsRegistry:
+
+    """
+    Store agreed process limits per stream and phase, and judge new data against them.
+
+    Every call to `freeze` stores a new version of the limits of a stream; earlier versions are
+    kept for auditing. A version may hold several phases (e.g. the output of `pbc_phases`).
+    Lookups return the latest version unless a version is requested, and the current limits of
+    a stream are those of the last phase of its latest version.
+
+    Classification is vectorized: the limits of all streams in a batch are fetched with a single
+    query, broadcast over the readings, and compared in NumPy, so hundreds of thousands of
+    readings per second can be evaluated.
+
+    Parameters:
+    -----------
+    path : str
+        Path of the SQLite file. Created if it does not exist. Use ':memory:' for a temporary registry.
+
+    Example:
+    --------
+    >>> registry = LimitsRegistry('limits.sqlite')
+    >>> registry.freeze('Line 3 Diameter', xmr_signals(df['Diameter']), note='2024 baseline')
+    1
+    >>> registry.classify(new_df['Stream'], new_df['Diameter'])
+    """
+
+    _param_names = ['Mean', 'UPL', 'LPL', 'PLR', 'AmR', 'URL']
+
+    def __init__(self, path):
+
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS limits (
+                stream TEXT NOT NULL,
+                version INTEGER NOT NULL,
+                phase INTEGER NOT NULL,
+                mean REAL, upl REAL, lpl REAL, plr REAL, amr REAL, url REAL,
+                created REAL NOT NULL,
+                note TEXT,
+                PRIMARY KEY (stream, version, phase)
+            )""")
+        self.connection.commit()
+
+    def close(self):
+
+        """
+        Close the connection to the SQLite file.
+        """
+
+        self.connection.close()
+
+    def _limits_rows(self, limits):
+
+        # Convert a dict of limits, an `xmr_signals` result or a 'PBC Params' DataFrame into
+        # (phase, Mean, UPL, LPL, PLR, AmR, URL) rows
+        if isinstance(limits, dict) and any(np.ndim(value) > 0 for value in limits.values()):
+            limits = pd.DataFrame({param: np.atleast_1d(limits[param]) for param in self._param_names if param in limits})
+        elif isinstance(limits, dict):
+            limits = pd.DataFrame([limits])
+        elif 'PBC Params' in limits.columns:
+            phase = limits['Phase'] if 'Phase' in limits.columns else 1
+            limits = limits.assign(Phase=phase).pivot(index='Phase', columns='PBC Params', values='Param Values').reset_index()
+        if 'Phase' not in limits.columns:
+            limits = limits.assign(Phase=np.arange(1, len(limits) + 1))
+        if 'PLR' not in limits.columns:
+            limits = limits.assign(PLR=limits['UPL'] - limits['LPL'])
+        missing = [param for param in ['Mean', 'UPL', 'LPL', 'AmR', 'URL'] if param not in limits.columns]
+        if missing:
+            raise ValueError(f"Limits are missing the parameter(s): {missing}")
+
+        return [(int(row[0]),) + tuple(float(value) for value in row[1:])
+                for row in limits[['Phase'] + self._param_names].itertuples(index=False)]
+
+    def freeze(self, stream, limits, note=''):
+
+        """
+        Store a new version of the limits of a stream.
+
+        Parameters:
+        -----------
+        stream : str
+            Name of the stream (e.g. characteristic or machine).
+        limits : dict or pandas.DataFrame
+            A dict with 'Mean', 'UPL', 'LPL', 'AmR' and 'URL' (e.g. from `SeriesStore.limits`), the result
+            of `xmr_signals` (one phase per series), the 'PBC Params' DataFrame returned by `pbc` or
+            `pbc_phases`, or a DataFrame with one row per phase and a column per parameter (and optionally
+            'Phase'). The 'PBC Params' of `pbc` are rounded to its `round_value` (2 decimals by default), and
+            the rounded limits are what is stored and used by `classify`; pass the unrounded result of
+            `xmr_signals` (or call `pbc` with a larger `round_value`) to freeze the exact limits.
+        note : str, optional
+            Free text stored with the version, e.g. the reason for the change.
+
+        Returns:
+        --------
+        int
+            The new version number of the stream.
+        """
+
+        rows = self._limits_rows(limits)
+        with self.connection:
+            (version,) = self.connection.execute(
+                "SELECT COALESCE(MAX(version), 0) + 1 FROM limits WHERE stream = ?", (stream,)).fetchone()
+            created = time.time()
+            self.connection.executemany(
+                "INSERT INTO limits VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(stream, version) + row + (created, note) for row in rows])
+
+        return version
+
+    def freeze_many(self, limits_df, stream='Labels', note=''):
+
+        """
+        Store a new version of the limits of many streams in a single transaction.
+
+        Parameters:
+        -----------
+        limits_df : pandas.DataFrame
+            One row per stream (and phase, if a 'Phase' column is present) with the columns 'Mean', 'UPL',
+            'LPL', 'AmR' and 'URL', such as the results of `network_analysis` or `NetworkAnalysis.results`.
+        stream : str, optional (default='Labels')
+            Column identifying the stream of each row.
+        note : str, optional
+            Free text stored with every version.
+
+        Returns:
+        --------
+        dict
+            The new version number of each stream.
+        """
+
+        if 'Phase' not in limits_df.columns:
+            limits_df = limits_df.assign(Phase=1)
+        names = limits_df[stream].astype(str).tolist()
+        rows = self._limits_rows(limits_df)
+        with self.connection:
+            # Fetch the latest version of every stream with a single query
+            latest = dict(self.connection.execute("SELECT stream, MAX(version) FROM limits GROUP BY stream").fetchall())
+            versions = {name: latest.get(name, 0) + 1 for name in names}
+            created = time.time()
+            self.connection.executemany("INSERT INTO limits VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                        [(name, versions[name]) + row + (created, note) for name, row in zip(names, rows)])
+
+        return versions
+
+    def lookup(self, streams=None, version=None):
+
+        """
+        Return the limits of many streams with a single query.
+
+        Parameters:
+        -----------
+        streams : list of str, optional
+            Streams to look up. Default is None (all streams).
+        version : int, optional
+            Version to return. Default is None (the latest version of each stream).
+
+        Returns:
+        --------
+        pandas.DataFrame
+            One row per stream and phase with 'Stream', 'Version', 'Phase', 'Mean', 'UPL', 'LPL', 'PLR',
+            'AmR', 'URL', 'Created' and 'Note'. Streams that are not in the registry are omitted.
+        """
+
+        query = "SELECT l.* FROM limits l"
+        params = []
+        if version is None:
+            query += """ JOIN (SELECT stream, MAX(version) AS version FROM limits GROUP BY stream) latest
+                         ON l.stream = latest.stream AND l.version = latest.version"""
+        conditions = []
+        if version is not None:
+            conditions.append("l.version = ?")
+            params.append(int(version))
+        if streams is not None:
+            streams = list(dict.fromkeys(str(stream) for stream in streams))
+            # Filter large stream lists after the query to stay below SQLite's variable limit
+            if len(streams) <= 900:
+                conditions.append(f"l.stream IN ({', '.join('?' * len(streams))})")
+                params.extend(streams)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY l.stream, l.version, l.phase"
+
+        limits_df = pd.DataFrame(self.connection.execute(query, params).fetchall(),
+                                 columns=['Stream', 'Version', 'Phase'] + self._param_names + ['Created', 'Note'])
+        if streams is not None and len(streams) > 900:
+            limits_df = limits_df[limits_df['Stream'].isin(streams)].reset_index(drop=True)
+
+        return limits_df
+
+    def history(self, stream):
+
+        """
+        Return every stored version of the limits of a stream.
+        """
+
+        rows = self.connection.execute(
+            "SELECT * FROM limits WHERE stream = ? ORDER BY version, phase", (stream,)).fetchall()
+
+        return pd.DataFrame(rows, columns=['Stream', 'Version', 'Phase'] + self._param_names + ['Created', 'Note'])
+
+    def classify(self, streams, values, phases=None, version=None):
+
+        """
+        Classify new readings of many streams against their stored limits.
+
+        Moving ranges are calculated between consecutive readings of the same stream within the batch,
+        in the order given.
+
+        Parameters:
+        -----------
+        streams : array-like
+            Stream of each reading.
+        values : array-like
+            Value of each reading.
+        phases : array-like or int, optional
+            Phase of each reading. Default is None (the last phase of the stored version).
+        version : int, optional
+            Version of the limits to use. Default is None (the latest version of each stream).
+
+        Returns:
+        --------
+        pandas.DataFrame
+            One row per reading with 'Stream', 'Value', 'Version', 'Phase', 'Moving Ranges',
+            'X-Chart Variation' and 'mR-Chart Variation'. Readings of streams without stored limits
+            are labelled 'No Limits'.
+        """
+
+        streams = pd.Series(np.asarray(streams)).astype(str).to_numpy()
+        values = np.asarray(values, dtype=float)
+        codes, names = pd.factorize(streams)
+
+        # Fetch the limits of every stream in the batch at once
+        limits_df = self.lookup(names, version=version)
+        if phases is None:
+            limits_df = limits_df.drop_duplicates('Stream', keep='last')
+            keys = pd.Index(limits_df['Stream'])
+            rows = keys.get_indexer(names)[codes]
+            reading_phases = None
+        else:
+            reading_phases = np.broadcast_to(np.asarray(phases, dtype=np.int64), values.shape)
+            keys = pd.MultiIndex.from_arrays([limits_df['Stream'], limits_df['Phase']])
+            rows = keys.get_indexer(pd.MultiIndex.from_arrays([streams, reading_phases]))
+        has_limits = rows >= 0
+        lookup_rows = np.where(has_limits, rows, 0)
+
+        def broadcast(column):
+            # Broadcast a limits column over the readings (NaN where there are no limits)
+            array = limits_df[column].to_numpy(dtype=float)
+            if len(array) == 0:
+                return np.full(len(values), np.nan)
+            return np.where(has_limits, array[lookup_rows], np.nan)
+
+        UPL = broadcast('UPL')
+        LPL = broadcast('LPL')
+        URL = broadcast('URL')
+
+        # Calculate the moving ranges between consecutive readings of each stream
+        order = np.argsort(codes, kind='stable')
+        moving_ranges = np.full(len(values), np.nan)
+        same_stream = codes[order][1:] == codes[order][:-1]
+        moving_ranges[order[1:][same_stream]] = np.abs(np.diff(values[order]))[same_stream]
+
+        # Label types of variation
+        x_variation = np.where((values > UPL) | (values < LPL), 'Assignable Cause', 'Common Cause')
+        mr_variation = np.where(moving_ranges > URL, 'Assignable Cause', 'Common Cause')
+        x_variation[~has_limits] = 'No Limits'
+        mr_variation[~has_limits] = 'No Limits'
+
+        results_df = pd.DataFrame({
+            'Stream': streams,
+            'Value': values,
+            'Version': broadcast('Version'),
+            'Phase': broadcast('Phase') if reading_phases is None else np.where(has_limits, reading_phases, np.nan),
+            'Moving Ranges': moving_ranges,
+            'X-Chart Variation': x_variation,
+            'mR-Chart Variation': mr_variation
+        })
+
+        return results_df
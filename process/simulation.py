@@ -0,0 +1,212 @@
+# Improvement Python Library/simulation.py
+# Monte Carlo average run length (ARL) simulation for chart configurations
+
+from concurrent.futures import ProcessPoolExecutor
+import math
+from statistics import NormalDist
+import numpy as np
+import pandas as pd
+
+from process.improvement import xmr_signals, ewma_statistics, cusum_statistics
+
+# Define the bias correction constant for sigma
+d2 = 1.128
+
+_charts = ('XmR', 'X', 'EWMA', 'CUSUM')
+
+def _simulate_chunk(chart, replicates, baseline, max_length, shift, mean, sigma, lam, L, k, h, seed_sequence):
+
+    """
+    Simulate the run lengths of a chunk of replicates. Runs in a worker process.
+
+    Every replicate is a column of a (baseline + max_length) x replicates matrix of normal values.
+    The limits of each replicate are calculated from its first `baseline` values and the remaining
+    values, shifted by `shift` sigma, are monitored against them.
+    """
+
+    rng = np.random.default_rng(seed_sequence)
+    matrix = rng.normal(mean, sigma, size=(baseline + max_length, replicates))
+    monitor = matrix[baseline:]
+    monitor += shift * sigma
+
+    # Calculate the baseline limits of every replicate in one pass
+    offsets = np.arange(replicates + 1, dtype=np.int64) * baseline
+    limits = xmr_signals(matrix[:baseline].ravel(order='F'), offsets)
+
+    # Flag the monitored values with the same logic as the charts
+    if chart in ('XmR', 'X'):
+        signals = (monitor > limits['UPL']) | (monitor < limits['LPL'])
+        if chart == 'XmR':
+            moving_ranges = np.abs(np.diff(matrix[baseline - 1:], axis=0))
+            signals |= moving_ranges > limits['URL']
+    elif chart == 'EWMA':
+        signals = ewma_statistics(monitor, lam=lam, L=L, center=limits['Mean'], sigma=limits['AmR'] / d2)['Signals']
+    else:
+        signals = cusum_statistics(monitor, k=k, h=h, center=limits['Mean'], sigma=limits['AmR'] / d2)['Signals']
+
+    # The run length is the position of the first signal (censored at max_length)
+    signalled = signals.any(axis=0)
+    run_lengths = np.where(signalled, signals.argmax(axis=0) + 1, max_length)
+
+    return run_lengths, signalled
+
+# Run length simulation function
+def simulate_run_lengths(chart='XmR', replicates=10000, baseline=20, max_length=2000, shift=0.0, mean=10.0, sigma=1.0,
+                         lam=0.2, L=3.0, k=0.5, h=5.0, seed=None, jobs=1, chunk_size=1000):
+
+    """
+    Simulate the run lengths of a chart configuration.
+
+    Each replicate is a synthetic normal series: a baseline of `baseline` values from which the
+    limits are calculated as in `pbc` (or `ewmachart` / `cusumchart`, with sigma = AmR / 1.128),
+    followed by up to `max_length` monitored values. The run length is the number of monitored
+    values up to and including the first signal. Replicates are simulated as columns of a 2D array
+    in chunks of `chunk_size`, and the chunks are spread across `jobs` worker processes.
+
+    Each chunk draws from its own child of `np.random.SeedSequence(seed)`, so the results for a given
+    seed do not depend on `jobs`.
+
+    Parameters:
+    -----------
+    chart : str, optional
+        'XmR' (a value outside the X-chart limits or a moving range above the URL), 'X' (X-chart
+        only), 'EWMA' or 'CUSUM'. Default is 'XmR'.
+    replicates : int, optional
+        Number of simulated series, default is 10000.
+    baseline : int, optional
+        Number of values used to calculate the limits, default is 20.
+    max_length : int, optional
+        Number of monitored values. Replicates without a signal are censored at this length. Default is 2000.
+    shift : float, optional
+        Shift of the mean of the monitored values in multiples of sigma, default is 0.0 (in control).
+    mean : float, optional
+        Mean of the simulated process, default is 10.0. The LPL is floored at zero as in `pbc`, so the
+        mean should be far enough from zero for the lower limit to apply.
+    sigma : float, optional
+        Standard deviation of the simulated process, default is 1.0.
+    lam, L : float, optional
+        EWMA weight and limit width, defaults are 0.2 and 3.0.
+    k, h : float, optional
+        CUSUM reference value and decision interval in multiples of sigma, defaults are 0.5 and 5.0.
+    seed : int, optional
+        Seed for reproducible results. Default is None.
+    jobs : int, optional
+        Number of worker processes, default is 1 (simulate in the calling process).
+    chunk_size : int, optional
+        Replicates per chunk, default is 1000. Memory use is about 8 * (baseline + max_length) * chunk_size bytes per job.
+
+    Returns:
+    --------
+    dict
+        'Run Lengths': the run length of every replicate, and 'Signalled': boolean array, False where
+        the replicate was censored.
+    """
+
+    if chart not in _charts:
+        raise ValueError(f"Chart must be one of {list(_charts)}.")
+    if baseline < 2:
+        raise ValueError("The baseline must have at least two values.")
+
+    # Split the replicates into chunks with independent random streams
+    sizes = [min(chunk_size, replicates - start) for start in range(0, replicates, chunk_size)]
+    seed_sequences = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(chart, size, baseline, max_length, shift, mean, sigma, lam, L, k, h, seed_sequence)
+             for size, seed_sequence in zip(sizes, seed_sequences)]
+
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            chunks = list(executor.map(_simulate_chunk, *zip(*tasks)))
+    else:
+        chunks = [_simulate_chunk(*task) for task in tasks]
+
+    return {'Run Lengths': np.concatenate([run_lengths for run_lengths, _ in chunks]),
+            'Signalled': np.concatenate([signalled for _, signalled in chunks])}
+
+# Average run length function
+def average_run_length(chart='XmR', replicates=10000, baseline=20, max_length=2000, shift=0.0, confidence=0.95,
+                       **kwargs):
+
+    """
+    Estimate the average run length (ARL) and alarm rate of a chart configuration by simulation.
+
+    Parameters:
+    -----------
+    chart, replicates, baseline, max_length, shift :
+        See `simulate_run_lengths`.
+    confidence : float, optional
+        Confidence level of the intervals, default is 0.95.
+    **kwargs
+        Passed to `simulate_run_lengths` (e.g. `lam`, `k`, `h`, `seed`, `jobs`).
+
+    Returns:
+    --------
+    dict
+        - 'ARL', 'ARL Lower', 'ARL Upper': Average run length and its normal-approximation confidence interval.
+        - 'SDRL', 'Median RL': Standard deviation and median of the run lengths.
+        - 'Alarm Rate', 'Alarm Rate Lower', 'Alarm Rate Upper': Signals per monitored value (the false
+          alarm rate when `shift` is 0) and its confidence interval.
+        - 'Censored': Fraction of replicates without a signal within `max_length`. When it is not small,
+          the ARL is underestimated and `max_length` should be increased.
+
+    Example:
+    --------
+    >>> average_run_length('XmR', baseline=20, seed=1)['ARL']
+    >>> average_run_length('EWMA', shift=1.0, lam=0.1, seed=1, jobs=8)
+    """
+
+    simulation = simulate_run_lengths(chart, replicates, baseline, max_length, shift, **kwargs)
+    run_lengths = simulation['Run Lengths']
+    num_signals = int(simulation['Signalled'].sum())
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+    # Calculate the ARL and its confidence interval
+    ARL = float(run_lengths.mean())
+    SDRL = float(run_lengths.std(ddof=1)) if len(run_lengths) > 1 else np.nan
+    ARL_margin = z * SDRL / math.sqrt(len(run_lengths))
+
+    # Calculate the alarm rate per monitored value and its confidence interval
+    num_values = int(run_lengths.sum())
+    alarm_rate = num_signals / num_values
+    alarm_margin = z * math.sqrt(num_signals) / num_values
+
+    return {'Chart': chart, 'Baseline': baseline, 'Shift': shift, 'Replicates': len(run_lengths),
+            'ARL': ARL, 'ARL Lower': ARL - ARL_margin, 'ARL Upper': ARL + ARL_margin,
+            'SDRL': SDRL, 'Median RL': float(np.median(run_lengths)),
+            'Alarm Rate': alarm_rate, 'Alarm Rate Lower': max(alarm_rate - alarm_margin, 0.0),
+            'Alarm Rate Upper': alarm_rate + alarm_margin,
+            'Censored': 1 - num_signals / len(run_lengths)}
+
+# ARL table function
+def arl_table(charts=('XmR',), shifts=(0.0, 0.5, 1.0, 2.0), baselines=(20,), **kwargs):
+
+    """
+    Compare the average run lengths of several chart configurations.
+
+    Every configuration is simulated with the same seed (common random numbers), so differences
+    between rows reflect the configurations rather than simulation noise.
+
+    Parameters:
+    -----------
+    charts : list of str, optional
+        Charts to compare, default is ('XmR',).
+    shifts : list of float, optional
+        Mean shifts in multiples of sigma, default is (0.0, 0.5, 1.0, 2.0).
+    baselines : list of int, optional
+        Baseline lengths, default is (20,).
+    **kwargs
+        Passed to `average_run_length`.
+
+    Returns:
+    --------
+    pandas.DataFrame
+        One row per chart, baseline and shift with the results of `average_run_length`.
+
+    Example:
+    --------
+    >>> arl_table(charts=['XmR', 'EWMA', 'CUSUM'], baselines=[20, 50], seed=1, jobs=8)
+    """
+
+    rows = [average_run_length(chart, baseline=baseline, shift=shift, **kwargs)
+            for chart in charts for baseline in baselines for shift in shifts]
+
+    return pd.DataFrame(rows)
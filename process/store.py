@@ -0,0 +1,218 @@
+# Improvement Python Library/store.py
+# Append-only, memory-mapped columnar store for long process histories
+
+import json
+import os
+import numpy as np
+
+# Define the value of C1 and C2 used for the process limits
+C1 = 2.660
+C2 = 3.268
+
+class SeriesStore:
+
+    """
+    On-disk store of value series (streams) that avoids reloading long histories from CSV.
+
+    Each stream is a directory holding two append-only files of little-endian float64 values,
+    'values.f8' and 'moving_ranges.f8', and a small 'index.json' with the running aggregates
+    (count, sum, minimum, maximum, moving range count and sum, and the last value). The moving
+    ranges are calculated once when values are appended, including the moving range that bridges
+    the previous and the new values. Process limits are therefore available in O(1) from the
+    index, and the values and moving ranges are read as memory-mapped slices.
+
+    The index is replaced atomically after the data files have been written. The index count is
+    authoritative, so data left behind by an interrupted append is discarded on the next append.
+
+    Parameters:
+    -----------
+    path : str
+        Directory of the store. Created if it does not exist.
+
+    Example:
+    --------
+    >>> store = SeriesStore('histories')
+    >>> store.append('Line 3 Diameter', df['Diameter'])
+    >>> store.limits('Line 3 Diameter')
+    {'Mean': 10.01, 'UPL': 10.42, 'LPL': 9.6, 'PLR': 0.82, 'AmR': 0.15, 'URL': 0.5}
+    >>> pbc(store.read('Line 3 Diameter', start=-500), 'Values', 'Observation')
+    """
+
+    _index_keys = ['Count', 'Missing', 'Sum', 'Min', 'Max', 'mR Count', 'mR Sum', 'Last']
+
+    def __init__(self, path):
+
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def _stream_path(self, stream, name=''):
+
+        # Stream names are used as directory names
+        if not stream or stream in ('.', '..') or '/' in stream or os.sep in stream:
+            raise ValueError(f"Invalid stream name: {stream!r}")
+
+        return os.path.join(self.path, stream, name)
+
+    def streams(self):
+
+        """
+        Return the names of the streams in the store.
+        """
+
+        return sorted(name for name in os.listdir(self.path)
+                      if os.path.isfile(os.path.join(self.path, name, 'index.json')))
+
+    def summary(self, stream):
+
+        """
+        Return the running aggregates of a stream.
+
+        Returns:
+        --------
+        dict
+            'Count', 'Missing', 'Sum', 'Min', 'Max', 'mR Count', 'mR Sum' and 'Last'. 'Count' is the
+            number of stored values including missing values.
+        """
+
+        index_path = self._stream_path(stream, 'index.json')
+        if not os.path.isfile(index_path):
+            raise KeyError(f"Unknown stream: {stream!r}")
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+
+        # JSON has no NaN, so missing aggregates are stored as None
+        return {key: np.nan if index[key] is None else index[key] for key in self._index_keys}
+
+    def append(self, stream, values):
+
+        """
+        Append values to a stream, creating the stream if it does not exist.
+
+        Parameters:
+        -----------
+        stream : str
+            Name of the stream.
+        values : array-like
+            New values in time order. Missing values (NaN) are stored and skipped by the aggregates.
+
+        Returns:
+        --------
+        dict
+            The updated running aggregates of the stream.
+        """
+
+        values = np.asarray(values, dtype='<f8').ravel()
+        os.makedirs(self._stream_path(stream), exist_ok=True)
+        try:
+            index = self.summary(stream)
+        except KeyError:
+            index = {'Count': 0, 'Missing': 0, 'Sum': 0.0, 'Min': np.nan, 'Max': np.nan,
+                     'mR Count': 0, 'mR Sum': 0.0, 'Last': np.nan}
+
+        # Calculate the moving ranges, bridging the last stored value and the first new value
+        moving_ranges = np.abs(np.diff(np.concatenate(([index['Last']], values))))
+        valid = ~np.isnan(values)
+        valid_mR = ~np.isnan(moving_ranges)
+
+        # Write the data files, discarding data from an interrupted append
+        for name, array in [('values.f8', values), ('moving_ranges.f8', moving_ranges)]:
+            with open(self._stream_path(stream, name), 'ab') as f:
+                f.truncate(index['Count'] * 8)
+                f.write(array.tobytes())
+
+        # Update the running aggregates
+        if len(values):
+            index['Count'] += len(values)
+            index['Missing'] += int(len(values) - valid.sum())
+            index['Sum'] += float(values[valid].sum())
+            if valid.any():
+                index['Min'] = float(np.fmin(index['Min'], values[valid].min()))
+                index['Max'] = float(np.fmax(index['Max'], values[valid].max()))
+            index['mR Count'] += int(valid_mR.sum())
+            index['mR Sum'] += float(moving_ranges[valid_mR].sum())
+            index['Last'] = float(values[-1])
+
+        # Replace the index atomically
+        index_path = self._stream_path(stream, 'index.json')
+        with open(index_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({key: None if isinstance(value, float) and np.isnan(value) else value
+                       for key, value in index.items()}, f)
+        os.replace(index_path + '.tmp', index_path)
+
+        return index
+
+    def limits(self, stream):
+
+        """
+        Return the XmR process limits of a stream in O(1) from its running aggregates.
+
+        Returns:
+        --------
+        dict
+            'Mean', 'UPL', 'LPL', 'PLR', 'AmR' and 'URL', calculated as in `pbc`.
+        """
+
+        index = self.summary(stream)
+        num_valid = index['Count'] - index['Missing']
+
+        # Calculate the mean and average moving range
+        mean = index['Sum'] / num_valid if num_valid else np.nan
+        AmR = index['mR Sum'] / index['mR Count'] if index['mR Count'] else np.nan
+
+        # Calculate the process limits
+        UPL = mean + (C1*AmR)
+        LPL = mean - (C1*AmR)
+        # Calculate process limit range (PLR)
+        PLR = UPL - LPL
+        # Conditionally determine LPL if LPL is less than zero
+        LPL = max(LPL,0)
+        # Calculate the Upper Range Limit
+        URL = C2*AmR
+
+        return {'Mean': mean, 'UPL': UPL, 'LPL': LPL, 'PLR': PLR, 'AmR': AmR, 'URL': URL}
+
+    def _memmap(self, stream, name, start, stop):
+
+        # Map the stored part of a data file and slice it
+        count = self.summary(stream)['Count']
+        start, stop, _ = slice(start, stop).indices(count)
+        if stop <= start:
+            return np.empty(0, dtype='<f8')
+
+        return np.memmap(self._stream_path(stream, name), dtype='<f8', mode='r', shape=(count,))[start:stop]
+
+    def values(self, stream, start=None, stop=None):
+
+        """
+        Return a memory-mapped slice of the values of a stream. Negative positions count from the end.
+        """
+
+        return self._memmap(stream, 'values.f8', start, stop)
+
+    def moving_ranges(self, stream, start=None, stop=None):
+
+        """
+        Return a memory-mapped slice of the moving ranges of a stream. Negative positions count from the end.
+        """
+
+        return self._memmap(stream, 'moving_ranges.f8', start, stop)
+
+    def read(self, stream, start=None, stop=None):
+
+        """
+        Return a slice of a stream as a table that can be passed to the chart functions.
+
+        Returns:
+        --------
+        dict
+            'Observation' (position in the stream), 'Values' and 'Moving Ranges'. The values and moving
+            ranges are memory-mapped. The moving range of the first value of the slice bridges the
+            previous value, unlike the moving ranges calculated by `pbc` for the slice on its own.
+        """
+
+        count = self.summary(stream)['Count']
+        start, stop, _ = slice(start, stop).indices(count)
+
+        return {'Observation': np.arange(start, max(stop, start)),
+                'Values': self.values(stream, start, stop),
+                'Moving Ranges': self.moving_ranges(stream, start, stop)}
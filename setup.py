@@ -30,5 +30,9 @@ setup(
         'pandas', 
         'numpy', 
         'matplotlib',
-        'seaborn']
+        'seaborn'],
+    extras_require={
+        'numba': ['numba']},
+    entry_points={
+        'console_scripts': ['improvement=process.cli:main']}
     )
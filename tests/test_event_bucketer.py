@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from process.improvement import EventBucketer
+
+
+def test_out_of_order_batches_numeric():
+    bucketer = EventBucketer(1.0, lateness=10)
+    bucketer.add([100.5])
+    bucketer.add([95.2, 96.1])
+    assert bucketer.report['Late Events'] == 0
+    bucketer.flush()
+    series_df = bucketer.emit()
+    assert series_df['Period'].tolist() == [95.0, 96.0, 97.0, 98.0, 99.0, 100.0]
+    assert series_df['Count'].tolist() == [1, 1, 0, 0, 0, 1]
+
+
+def test_out_of_order_batches_datetime():
+    bucketer = EventBucketer('1min', lateness='10min')
+    bucketer.add(pd.to_datetime(['2024-01-01 10:00:30']))
+    bucketer.add(pd.to_datetime(['2024-01-01 09:55:10', '2024-01-01 09:56:20']))
+    assert bucketer.report['Late Events'] == 0
+    bucketer.flush()
+    series_df = bucketer.emit()
+    assert series_df['Period'].iloc[0] == pd.Timestamp('2024-01-01 09:55')
+    assert series_df['Count'].tolist() == [1, 1, 0, 0, 0, 1]
+
+
+def test_events_before_watermark_are_late():
+    bucketer = EventBucketer(1.0, lateness=2)
+    bucketer.add([100.5])
+    bucketer.add([95.2, 99.1])
+    assert bucketer.report['Late Events'] == 1
+    bucketer.flush()
+    series_df = bucketer.emit()
+    assert series_df['Period'].tolist() == [99.0, 100.0]
+    assert np.array_equal(series_df['Values'], [1.0, 1.0])